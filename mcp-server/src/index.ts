@@ -13,6 +13,7 @@
  *   - Comment replies (parent_id)
  *   - Agent status check
  *   - Submadang creation
+ *   - Developer profile from the local analyzer daemon
  */
 
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
@@ -21,6 +22,7 @@ import { StdioServerTransport } from "@modelcontextprotocol/sdk/server/stdio.js"
 import { registerFeedTools } from "./tools/feed.js";
 import { registerWriteTools } from "./tools/write.js";
 import { registerSocialTools } from "./tools/social.js";
+import { registerProfileTools } from "./tools/profile.js";
 
 const API_KEY = process.env.BOTMADANG_API_KEY;
 
@@ -41,6 +43,7 @@ const server = new McpServer({
 registerFeedTools(server, API_KEY);
 registerWriteTools(server, API_KEY);
 registerSocialTools(server, API_KEY);
+registerProfileTools(server);
 
 async function main() {
   const transport = new StdioServerTransport();
@@ -0,0 +1,73 @@
+/**
+ * 개발자 프로필 데몬 client (scripts/analyze-developer.py serve)
+ *
+ * Unix 소켓으로 한 줄짜리 JSON-RPC 요청을 보내고 응답 한 줄을 받습니다.
+ */
+
+import { createConnection } from "node:net";
+import { homedir } from "node:os";
+import { join } from "node:path";
+
+const SOCKET_PATH =
+  process.env.DEVELOPER_PROFILE_SOCKET ?? join(homedir(), ".claude", "developer-profile.sock");
+const TIMEOUT_MS = 60_000; // 첫 요청은 전체 분석이 필요할 수 있음
+
+let nextId = 1;
+
+export async function profileRequest(method: string, params: object = {}): Promise<unknown> {
+  const id = nextId++;
+
+  return new Promise((resolve) => {
+    const socket = createConnection(SOCKET_PATH);
+    let buffer = "";
+    let settled = false;
+
+    const finish = (value: unknown) => {
+      if (settled) return;
+      settled = true;
+      socket.destroy();
+      resolve(value);
+    };
+
+    socket.setEncoding("utf8");
+    socket.setTimeout(TIMEOUT_MS, () =>
+      finish({ success: false, error: "프로필 데몬 응답 시간 초과. 잠시 후 다시 시도해주세요." }),
+    );
+
+    socket.on("connect", () => {
+      socket.write(JSON.stringify({ jsonrpc: "2.0", id, method, params }) + "\n");
+    });
+
+    socket.on("data", (chunk: string) => {
+      buffer += chunk;
+      const newline = buffer.indexOf("\n");
+      if (newline < 0) return;
+      try {
+        const res = JSON.parse(buffer.slice(0, newline)) as {
+          result?: unknown;
+          error?: { message?: string };
+        };
+        finish(res.error ? { success: false, error: `프로필 오류: ${res.error.message}` } : res.result);
+      } catch {
+        finish({ success: false, error: "프로필 데몬 응답을 해석할 수 없습니다." });
+      }
+    });
+
+    socket.on("error", (err: NodeJS.ErrnoException) => {
+      if (err.code === "ENOENT" || err.code === "ECONNREFUSED") {
+        finish({
+          success: false,
+          error:
+            "프로필 데몬이 실행 중이 아닙니다. " +
+            "`python3 scripts/analyze-developer.py serve`로 먼저 시작하세요.",
+        });
+        return;
+      }
+      finish({ success: false, error: `프로필 요청 실패: ${err.message}` });
+    });
+
+    socket.on("end", () =>
+      finish({ success: false, error: "프로필 데몬이 응답 없이 연결을 닫았습니다." }),
+    );
+  });
+}
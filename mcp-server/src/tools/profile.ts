@@ -0,0 +1,36 @@
+/**
+ * Profile tools: developer_profile
+ */
+
+import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
+import { z } from "zod";
+import { profileRequest } from "../profile.js";
+
+const text = (v: unknown) => ({
+  content: [{ type: "text" as const, text: JSON.stringify(v, null, 2) }],
+});
+
+export function registerProfileTools(server: McpServer): void {
+  server.tool(
+    "developer_profile",
+    "로컬 Claude Code 대화 기록으로 분석한 개발자 프로필을 조회합니다. (analyze-developer.py serve 실행 필요)",
+    {
+      format: z.enum(["summary", "json"]).optional().default("summary").describe("요약 텍스트 또는 전체 JSON (기본값: summary)"),
+      since: z.string().optional().describe("이 시점 이후만 분석 (예: 30d, 2w, 2025-01-01)"),
+      until: z.string().optional().describe("이 시점까지만 분석 (예: 2025-01-31)"),
+      count_occurrences: z.boolean().optional().default(false).describe("키워드를 실제 등장 횟수로 집계 (기본값: false)"),
+    },
+    async ({ format, since, until, count_occurrences }) => {
+      const params = { since, until, count_occurrences };
+      if (format === "json") {
+        return text(await profileRequest("profile", params));
+      }
+
+      const result = (await profileRequest("summary", params)) as { summary?: string };
+      if (typeof result?.summary !== "string") {
+        return text(result);
+      }
+      return { content: [{ type: "text" as const, text: result.summary }] };
+    },
+  );
+}
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+개발자 프로필 분석기 벤치마크
+합성 대화 기록(generate-corpus.py)으로 developer_profile 모듈의 단계별 처리량,
+최대 메모리(RSS), 규모별 확장 곡선을 측정하고, 키워드 매칭 백엔드들의 결과가 같은지 확인합니다.
+"""
+
+import importlib.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def _load_script(filename: str):
+    """하이픈이 들어간 스크립트를 모듈로 로드"""
+    name = filename.removesuffix(".py").replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _rss_mb(maxrss: int) -> float:
+    # ru_maxrss 단위: Linux는 KB, macOS는 바이트
+    return maxrss / (1 << 20) if sys.platform == "darwin" else maxrss / 1024
+
+
+def _row(stage: str, seconds: float, items: int = 0, nbytes: int = 0) -> dict:
+    seconds = max(seconds, 1e-9)
+    return {
+        "stage": stage,
+        "seconds": round(seconds, 4),
+        "items": items,
+        "items_per_sec": round(items / seconds, 1),
+        "mb_per_sec": round(nbytes / 1e6 / seconds, 2),
+    }
+
+
+def bench_stages(analyzer, root: Path, sample_sessions: int, jobs: int) -> list[dict]:
+    """로드/추출/분석기/전체 실행을 단계별로 측정"""
+    rows = []
+
+    paths = []
+    for project_dir in sorted(root.iterdir()):
+        if project_dir.is_dir():
+            paths.extend(Path(s.get("fullPath", "")) for s in analyzer.load_sessions_index(project_dir))
+    total_bytes = sum(p.stat().st_size for p in paths if p.is_file())
+
+    # 1. load_session_messages: 전체 파일 디코딩
+    started = time.perf_counter()
+    count = sum(1 for p in paths for _ in analyzer.load_session_messages(p))
+    rows.append(_row("load_session_messages", time.perf_counter() - started, count, total_bytes))
+
+    # 표본 세션의 엔트리를 메모리에 올려 추출기/분석기만 따로 측정
+    sample = paths[:sample_sessions]
+    entries = [e for p in sample for e in analyzer.SessionReader(p, 0, analyzer.routed_types())]
+
+    started = time.perf_counter()
+    events = list(analyzer.route_entries(entries))
+    rows.append(_row("route_entries", time.perf_counter() - started, len(entries)))
+
+    started = time.perf_counter()
+    texts = list(analyzer.extract_user_messages(entries))
+    rows.append(_row("extract_user_messages", time.perf_counter() - started, len(entries)))
+
+    started = time.perf_counter()
+    files = list(analyzer.extract_file_changes(entries))
+    rows.append(_row("extract_file_changes", time.perf_counter() - started, len(entries)))
+
+    started = time.perf_counter()
+    keyword_events = [("keywords", ("text", analyzer.match_keywords(t))) for t in texts]
+    keyword_events += [("keywords", ("file", analyzer.match_keywords(f))) for f in files]
+    rows.append(_row("match_keywords", time.perf_counter() - started, len(texts) + len(files)))
+
+    # 2. 분석기별 consume + finalize
+    events += keyword_events
+    events += [("session", {"created": "2025-01-01T09:00:00Z", "modified": "2025-01-01T10:00:00Z",
+                            "messageCount": 1})] * len(sample)
+    for name, cls in analyzer.ANALYZERS.items():
+        mine = [(k, v) for k, v in events if k in cls.kinds]
+        instance = cls()
+        started = time.perf_counter()
+        for kind, value in mine:
+            instance.consume(kind, value)
+        instance.finalize({})
+        rows.append(_row(f"analyzer:{name}", time.perf_counter() - started, len(mine)))
+    del events, keyword_events, entries
+
+    # 3. generate_profile 전체 실행
+    for n in sorted({1, jobs}):
+        started = time.perf_counter()
+        analyzer.generate_profile(jobs=n, root=root)
+        rows.append(_row(f"generate_profile(jobs={n})", time.perf_counter() - started, len(paths), total_bytes))
+
+    return rows
+
+
+def bench_scaling(corpus, scales: list[int], base: dict, jobs: int) -> list[dict]:
+    """규모를 바꿔가며 전체 실행을 별도 프로세스로 측정 (시간, 최대 RSS)"""
+    rows = []
+    script = SCRIPTS_DIR / "analyze-developer.py"
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix="devprofile-bench-") as tmp:
+            root = Path(tmp) / "projects"
+            info = corpus.generate_corpus(root, **{**base, "sessions": base["sessions"] * scale})
+            started = time.perf_counter()
+            proc = subprocess.Popen(
+                [sys.executable, str(script), "--json", "-j", str(jobs), "--root", str(root)],
+                stdout=subprocess.DEVNULL,
+            )
+            _, status, usage = os.wait4(proc.pid, 0)
+            elapsed = time.perf_counter() - started
+            if status != 0:
+                raise RuntimeError(f"analyze-developer.py 실패 (scale={scale}, status={status})")
+            rows.append({
+                "scale": scale,
+                "sessions": info["sessions"],
+                "mb": round(info["bytes"] / 1e6, 1),
+                "seconds": round(elapsed, 3),
+                "mb_per_sec": round(info["bytes"] / 1e6 / elapsed, 2),
+                "peak_rss_mb": round(_rss_mb(usage.ru_maxrss), 1),
+            })
+    return rows
+
+
+def check_keyword_backends(analyzer, texts: list[str]) -> list[str]:
+    """사용 가능한 키워드 매칭 백엔드들이 같은 등장 횟수를 내는지 확인 (겹치는 키워드 포함)"""
+    backends = [b for b in analyzer.KeywordMatcher.BACKENDS if b != "ahocorasick" or analyzer.HAS_AHOCORASICK]
+    # 내장 키워드 중 자기 자신과 겹칠 수 있는 것(test, pip 등)과 서로 겹치는 짧은 키워드를 함께 검사
+    keywords = [*analyzer.KEYWORD_MATCHER.keywords, "aa", "aaa", "abab"]
+    matchers = {b: analyzer.KeywordMatcher(keywords, b) for b in backends}
+    mismatches = []
+    for text in ["aaaa abababab testestest pipipip golangolang", *texts]:
+        lowered = text.lower() + " "
+        results = {b: m.count(lowered) for b, m in matchers.items()}
+        results.update({f"{b}.finditer": Counter(m.finditer(lowered)) for b, m in matchers.items()})
+        expected = results[backends[0]]
+        for name, result in results.items():
+            if result != expected:
+                mismatches.append(f"{name} ≠ {backends[0]}: {text[:40]!r} ({dict(result - expected)} / {dict(expected - result)})")
+    return mismatches
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """기준 결과 대비 처리량이 tolerance 이상 떨어진 단계 목록"""
+    regressions = []
+    before = {r["stage"]: r for r in baseline.get("stages", [])}
+    for row in results["stages"]:
+        old = before.get(row["stage"])
+        if not old or not old["items_per_sec"]:
+            continue
+        ratio = row["items_per_sec"] / old["items_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append(f"{row['stage']}: {old['items_per_sec']:,.0f} → {row['items_per_sec']:,.0f}/초 ({ratio:.0%})")
+    return regressions
+
+
+def print_table(rows: list[dict]) -> None:
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in columns))
+    print()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="개발자 프로필 분석기 벤치마크")
+    parser.add_argument("--corpus", help="기존 projects 디렉토리 사용 (없으면 합성 기록 생성)")
+    parser.add_argument("--projects", type=int, default=5, help="합성 프로젝트 수 (기본: 5)")
+    parser.add_argument("--sessions", type=int, default=20, help="프로젝트당 세션 수 (기본: 20)")
+    parser.add_argument("--messages", type=int, default=200, help="세션당 평균 엔트리 수 (기본: 200)")
+    parser.add_argument("--tool-result-size", type=int, default=2000, help="도구 결과 평균 바이트 (기본: 2000)")
+    parser.add_argument("--korean-ratio", type=float, default=0.5, help="한국어 사용자 메시지 비율 (기본: 0.5)")
+    parser.add_argument("--sample-sessions", type=int, default=20, help="추출기/분석기 측정에 쓸 세션 수 (기본: 20)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="병렬 측정 프로세스 수")
+    parser.add_argument("--scales", default="1,2,4", help="확장 곡선 배율 목록 (기본: 1,2,4, 빈 값이면 생략)")
+    parser.add_argument("--json-out", help="결과를 JSON으로 저장")
+    parser.add_argument("--compare", help="이전 --json-out 결과와 비교하여 회귀 시 종료 코드 1")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀로 볼 처리량 감소 비율 (기본: 0.25)")
+    args = parser.parse_args()
+
+    import developer_profile as analyzer
+    corpus = _load_script("generate-corpus.py")
+    base = {
+        "projects": args.projects,
+        "sessions": args.sessions,
+        "messages": args.messages,
+        "tool_result_size": args.tool_result_size,
+        "korean_ratio": args.korean_ratio,
+    }
+
+    prompts = [t.format(file=f) for t in corpus.ENGLISH_PROMPTS + corpus.KOREAN_PROMPTS for f in corpus.FILE_NAMES]
+    mismatches = check_keyword_backends(analyzer, prompts)
+    if mismatches:
+        print("키워드 매칭 백엔드 결과 불일치:")
+        for line in mismatches:
+            print(f"  - {line}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix="devprofile-bench-") as tmp:
+        if args.corpus:
+            root = Path(args.corpus).expanduser()
+        else:
+            root = Path(tmp) / "projects"
+            info = corpus.generate_corpus(root, **base)
+            print(f"합성 기록: 세션 {info['sessions']}개, {info['bytes'] / 1e6:.1f}MB\n")
+        stages = bench_stages(analyzer, root, args.sample_sessions, args.jobs)
+
+    print(f"## 단계별 처리량 (JSON 백엔드: {analyzer.JSON_BACKEND})")
+    print_table(stages)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    scaling = bench_scaling(corpus, scales, base, args.jobs) if scales else []
+    if scaling:
+        print(f"## 확장 곡선 (jobs={args.jobs})")
+        print_table(scaling)
+
+    results = {
+        "json_backend": analyzer.JSON_BACKEND,
+        "peak_rss_mb": round(_rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss), 1),
+        "stages": stages,
+        "scaling": scaling,
+    }
+    print(f"벤치마크 프로세스 최대 RSS: {results['peak_rss_mb']}MB")
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"저장됨: {args.json_out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n성능 회귀 감지:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
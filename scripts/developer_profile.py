@@ -0,0 +1,4672 @@
+#!/usr/bin/env python3
+"""
+개발자 프로필 분석기
+~/.claude/projects/ 디렉토리의 대화 기록을 분석하여 개발자 프로필을 생성합니다.
+라이브러리로 쓸 때는 iter_profile_sessions()로 세션별 결과를 받아 fold_sessions()와 finalize_profile()로 합칩니다.
+"""
+
+import array
+import base64
+import bisect
+import contextlib
+import functools
+import hashlib
+import heapq
+import importlib.util
+import io
+import itertools
+import json
+import math
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+# 라이브러리로 import할 때 비용을 줄이기 위해 프로세스 풀, tar, SQLite, 소켓 모듈은 쓰는 곳에서 import
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# C 구현 Aho-Corasick은 선택적 의존성
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# .jsonl.zst 보관 파일은 선택적 의존성 (.gz는 표준 zlib, 설치 여부만 확인하고 .zst를 읽을 때 import)
+HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+
+# 시각화는 선택적 의존성 (시작 시간을 줄이기 위해 설치 여부만 확인하고 --visualize일 때 import)
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
+
+# 메시지 테이블의 벡터 연산과 .npz 저장은 선택적 의존성 (없으면 array 모듈로 계산, 쓸 때 import)
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+CLAUDE_PROJECTS_DIR = Path.home() / ".claude" / "projects"
+
+# 기술 스택 키워드 매핑
+TECH_KEYWORDS = {
+    "languages": {
+        "python": ["python", ".py", "pip", "pytest", "django", "flask", "fastapi"],
+        "typescript": ["typescript", ".ts", ".tsx", "tsc"],
+        "javascript": ["javascript", ".js", ".jsx", "node", "npm", "yarn"],
+        "rust": ["rust", ".rs", "cargo", "rustc"],
+        "go": ["golang", ".go", "go build", "go run"],
+        "java": ["java", ".java", "maven", "gradle", "spring"],
+        "kotlin": [".kt", "kotlin"],
+        "swift": [".swift", "swiftui", "xcode"],
+        "c++": [".cpp", ".hpp", "cmake"],
+        "c#": [".cs", "dotnet", "csharp"],
+    },
+    "frameworks": {
+        "react": ["react", "jsx", "tsx", "next.js", "nextjs"],
+        "vue": ["vue", "vuex", "nuxt"],
+        "angular": ["angular", "ng "],
+        "express": ["express", "expressjs"],
+        "fastapi": ["fastapi"],
+        "django": ["django"],
+        "flask": ["flask"],
+        "spring": ["spring", "springboot"],
+    },
+    "tools": {
+        "git": ["git ", "commit", "push", "pull", "branch", "merge"],
+        "docker": ["docker", "dockerfile", "container"],
+        "kubernetes": ["kubernetes", "k8s", "kubectl", "helm"],
+        "aws": ["aws", "s3", "ec2", "lambda", "cloudformation"],
+        "terraform": ["terraform", ".tf"],
+        "github_actions": ["github actions", ".github/workflows"],
+    },
+    "databases": {
+        "postgresql": ["postgres", "postgresql", "psql"],
+        "mysql": ["mysql", "mariadb"],
+        "mongodb": ["mongodb", "mongo"],
+        "redis": ["redis"],
+        "sqlite": ["sqlite"],
+    },
+}
+
+# 작업 유형 키워드
+TASK_PATTERNS = {
+    "debugging": ["fix", "bug", "error", "issue", "broken", "not working", "debug", "왜 안", "에러", "버그"],
+    "new_feature": ["add", "create", "implement", "new", "build", "만들어", "추가", "구현"],
+    "refactoring": ["refactor", "clean", "improve", "optimize", "리팩토링", "개선", "정리"],
+    "learning": ["how to", "what is", "explain", "어떻게", "뭐야", "설명", "알려줘"],
+    "review": ["review", "check", "look at", "리뷰", "확인", "검토"],
+    "testing": ["test", "spec", "테스트", "검증"],
+    "documentation": ["document", "readme", "comment", "문서", "주석"],
+}
+
+
+def load_sessions_index(project_dir: Path) -> list[dict]:
+    """세션 인덱스 파일 로드 (압축 보관된 세션은 fullPath를 압축 파일로 바꿈)"""
+    index_file = project_dir / "sessions-index.json"
+    if not index_file.exists():
+        return []
+
+    with open(index_file) as f:
+        data = json.load(f)
+    entries = data.get("entries", [])
+    for i, entry in enumerate(entries):
+        full_path = entry.get("fullPath")
+        if full_path and not os.path.exists(full_path):
+            archived = _archived_path(full_path)
+            if archived:
+                entries[i] = {**entry, "fullPath": archived}
+    return entries
+
+
+def _archived_path(full_path: str) -> str | None:
+    """사라진 세션 파일 대신 같은 자리에 있는 압축 파일 경로"""
+    for suffix, compression in COMPRESSED_SUFFIXES.items():
+        if os.path.exists(full_path + suffix):
+            if compression == "zst" and not HAS_ZSTD:
+                _warn_no_zstd()
+                continue
+            return full_path + suffix
+    return None
+
+
+@functools.cache
+def _warn_no_zstd() -> None:
+    print("zstandard가 설치되지 않아 .zst 보관 파일을 건너뜁니다 (pip install zstandard)", file=sys.stderr)
+
+
+# JSON 디코더 백엔드 (orjson > simdjson > 표준 json)
+try:
+    import orjson
+    JSON_BACKEND = "orjson"
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import simdjson
+        JSON_BACKEND = "simdjson"
+        _json_loads = simdjson.loads
+    except ImportError:
+        JSON_BACKEND = "json"
+        _json_loads = json.loads
+
+MESSAGE_TYPES = ("user", "assistant")
+READ_BUFFER_SIZE = 1 << 20
+
+
+@functools.lru_cache(maxsize=None)
+def _type_filter(types: tuple[str, ...]) -> re.Pattern:
+    """원시 바이트에서 "type" 값을 찾는 정규식 (전체 파싱 전 사전 필터)"""
+    names = b"|".join(re.escape(t.encode()) for t in types)
+    return re.compile(rb'"type"\s*:\s*"(?:' + names + rb')"')
+
+
+# 압축 보관된 세션: <세션>.jsonl.gz / .jsonl.zst 파일과 프로젝트 디렉토리의 tar 묶음
+COMPRESSED_SUFFIXES = {".gz": "gz", ".zst": "zst"}
+ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.zst")
+DECOMPRESS_CHUNK_SIZE = 1 << 18  # CPU 캐시에 머무는 크기가 줄 분리까지 빠름
+
+
+def _compression(path: Path) -> str | None:
+    """파일 이름으로 본 압축 형식 ("gz", "zst" 또는 None)"""
+    return COMPRESSED_SUFFIXES.get(path.suffix)
+
+
+def _is_archive(name: str) -> bool:
+    return name.endswith(ARCHIVE_SUFFIXES)
+
+
+def session_stem(path: Path) -> str:
+    """세션 파일 이름에서 확장자를 뺀 세션 ID (압축 확장자 포함)"""
+    name = path.name
+    for suffix in COMPRESSED_SUFFIXES:
+        name = name.removesuffix(suffix)
+    return name.removesuffix(".jsonl")
+
+
+def _decompress_chunks(f, compression: str) -> Iterator[bytes]:
+    """압축 파일 객체를 풀어 DECOMPRESS_CHUNK_SIZE 이하 조각으로 생성
+
+    gzip은 여러 멤버를 이어 붙인 파일도 처리하며, 기록 중이라 잘린 파일은
+    풀린 데까지만 내보냅니다 (마지막 미완성 줄은 SessionReader가 건너뜀).
+    """
+    if compression == "zst":
+        if not HAS_ZSTD:
+            raise RuntimeError("zstandard가 설치되지 않아 .zst 파일을 읽을 수 없습니다 (pip install zstandard)")
+        import zstandard
+        with zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+            while chunk := reader.read(DECOMPRESS_CHUNK_SIZE):
+                yield chunk
+        return
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    while raw := f.read(DECOMPRESS_CHUNK_SIZE):
+        data = raw
+        while data:
+            chunk = decompressor.decompress(data, DECOMPRESS_CHUNK_SIZE)
+            if chunk:
+                yield chunk
+            if decompressor.eof:
+                # 다음 gzip 멤버 (뒤에 붙은 0 패딩은 무시)
+                data = decompressor.unused_data.lstrip(b"\0")
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            else:
+                data = decompressor.unconsumed_tail
+
+
+class DecompressedStream(io.RawIOBase):
+    """압축 파일을 백그라운드 스레드에서 풀며 읽는 스트림
+
+    zlib/zstd는 압축 해제 중에 GIL을 놓으므로, 스레드가 다음 조각을 푸는 동안
+    호출한 쪽은 앞 조각의 JSON을 파싱할 수 있습니다. 풀린 조각은 최대 depth개까지만
+    쌓아 메모리를 제한합니다. io.BufferedReader로 감싸 줄 단위로 읽습니다.
+    """
+
+    def __init__(self, path: Path, compression: str, depth: int = 4):
+        self._queue: queue.Queue = queue.Queue(depth)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._produce, args=(path, compression), daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, path: Path, compression: str) -> None:
+        try:
+            with open(path, "rb") as f:
+                for chunk in _decompress_chunks(f, compression):
+                    if not self._put(chunk):
+                        return
+        except Exception as e:
+            self._put(e)
+            return
+        self._put(None)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+                return 0
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            self._chunk = memoryview(item)
+        n = min(len(buffer), len(self._chunk))
+        buffer[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self) -> None:
+        # 다 읽지 않고 닫으면 생산 스레드가 막히지 않도록 멈추고 큐를 비움
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        super().close()
+
+
+def open_session_file(path: Path):
+    """세션 파일을 바이너리로 열기 (압축 파일은 백그라운드에서 풀며 읽는 스트림)"""
+    compression = _compression(path)
+    if compression is None:
+        return open(path, "rb", buffering=READ_BUFFER_SIZE)
+    return io.BufferedReader(DecompressedStream(path, compression), READ_BUFFER_SIZE)
+
+
+class DecodeStats:
+    """JSONL 디코딩 처리량 통계"""
+
+    FIELDS = ("lines", "bytes", "parsed", "skipped", "errors", "seconds")
+
+    def __init__(self):
+        self.lines = 0
+        self.bytes = 0
+        self.parsed = 0
+        self.skipped = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def merge(self, other: "DecodeStats") -> None:
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DecodeStats":
+        stats = cls()
+        for field in cls.FIELDS:
+            setattr(stats, field, data.get(field, 0))
+        return stats
+
+    def report(self) -> str:
+        seconds = self.seconds or 1e-9
+        return (
+            f"디코더({JSON_BACKEND}): {self.lines}줄, {self.bytes / 1e6:.1f}MB, "
+            f"파싱 {self.parsed} / 건너뜀 {self.skipped} / 오류 {self.errors}, "
+            f"{self.lines / seconds:,.0f}줄/초, {self.bytes / 1e6 / seconds:.1f}MB/초"
+        )
+
+
+class RunStats:
+    """--stats 계측: 단계별 wall/CPU 시간, 처리량, 가장 느린 세션 파일
+
+    모든 측정은 RunStats가 주어졌을 때만 수행되므로, 계측을 끄면(None)
+    스캔 경로에 추가 비용이 없습니다.
+    """
+
+    def __init__(self, slowest: int = 10):
+        self.stages: dict[str, dict] = {}
+        self.decode = DecodeStats()
+        self.sessions = 0
+        self.cached = 0
+        self.scanned = 0
+        self.file_seconds = 0.0
+        self.match_seconds = 0.0
+        self.worker_cpu = 0.0
+        self.slowest_limit = slowest
+        self._slowest: list[tuple[float, str, int]] = []  # 최소 힙
+        self.extra: dict[str, Any] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """with 블록의 wall/CPU 시간을 name 단계에 누적"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+            stage["wall"] += time.perf_counter() - wall
+            stage["cpu"] += time.process_time() - cpu
+            stage["calls"] += 1
+
+    def add_file(self, path: str, job_stats: dict) -> None:
+        """세션 파일 하나의 스캔 결과(_scan_job 통계) 반영"""
+        self.scanned += 1
+        self.decode.merge(DecodeStats.from_dict(job_stats["decode"]))
+        self.file_seconds += job_stats["seconds"]
+        self.match_seconds += job_stats["match"]
+        self.worker_cpu += job_stats["cpu"]
+        item = (job_stats["seconds"], path, job_stats["decode"]["bytes"])
+        if len(self._slowest) < self.slowest_limit:
+            heapq.heappush(self._slowest, item)
+        else:
+            heapq.heappushpop(self._slowest, item)
+
+    def to_dict(self) -> dict:
+        decode = self.decode
+        analyze = max(self.file_seconds - decode.seconds - self.match_seconds, 0.0)
+        return {
+            "json_backend": JSON_BACKEND,
+            "stages": {
+                name: {"wall": round(s["wall"], 4), "cpu": round(s["cpu"], 4), "calls": s["calls"]}
+                for name, s in self.stages.items()
+            },
+            # 세션 파일 스캔 시간의 내역 (워커 합산)
+            "scan_breakdown": {
+                "decode": round(decode.seconds, 4),
+                "keyword_match": round(self.match_seconds, 4),
+                "analyze": round(analyze, 4),
+                "total": round(self.file_seconds, 4),
+                "worker_cpu": round(self.worker_cpu, 4),
+            },
+            "sessions": {"total": self.sessions, "cached": self.cached, "scanned": self.scanned},
+            "decode": {
+                **decode.to_dict(),
+                "lines_per_sec": round(decode.lines / decode.seconds, 1) if decode.seconds else 0,
+                "mb_per_sec": round(decode.bytes / 1e6 / decode.seconds, 2) if decode.seconds else 0,
+            },
+            "slowest_files": [
+                {"path": path, "seconds": round(seconds, 4), "bytes": nbytes}
+                for seconds, path, nbytes in sorted(self._slowest, reverse=True)
+            ],
+            **self.extra,
+        }
+
+
+def _stage(stats: RunStats | None, name: str):
+    """stats가 없으면 아무것도 하지 않는 단계 측정 컨텍스트"""
+    return stats.stage(name) if stats is not None else contextlib.nullcontext()
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    """ISO 8601 타임스탬프 파싱 (시간대가 없으면 UTC로 간주)"""
+    if not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class TimeWindow:
+    """--since/--until 분석 기간 (양끝 포함, 한쪽이 None이면 그쪽은 열려 있음)"""
+
+    RELATIVE_UNITS = {"h": timedelta(hours=1), "d": timedelta(days=1), "w": timedelta(weeks=1)}
+
+    def __init__(self, since: datetime | None = None, until: datetime | None = None):
+        self.since = since
+        self.until = until
+
+    @classmethod
+    def parse(cls, since: str | None = None, until: str | None = None, now: datetime | None = None) -> "TimeWindow":
+        """CLI 값 파싱: 날짜(2025-01-31), ISO 시각, 또는 상대 기간(30d, 12h, 2w)
+
+        날짜만 준 --until은 그날 끝까지 포함합니다.
+        """
+        now = now or datetime.now(timezone.utc)
+
+        def parse_one(value: str, end_of_day: bool) -> datetime:
+            value = value.strip()
+            unit = cls.RELATIVE_UNITS.get(value[-1:].lower())
+            if unit is not None and value[:-1].isdigit():
+                return now - int(value[:-1]) * unit
+            dt = _parse_time(value)
+            if dt is None:
+                raise ValueError(f"날짜 형식을 알 수 없습니다: {value}")
+            if end_of_day and len(value) == 10:
+                dt += timedelta(days=1, microseconds=-1)
+            return dt
+
+        window = cls(
+            parse_one(since, False) if since else None,
+            parse_one(until, True) if until else None,
+        )
+        if window.since and window.until and window.since > window.until:
+            raise ValueError("--since가 --until보다 늦습니다")
+        return window
+
+    def contains(self, ts: datetime) -> bool:
+        return (self.since is None or ts >= self.since) and (self.until is None or ts <= self.until)
+
+    def to_dict(self) -> dict:
+        return {
+            "since": self.since.isoformat() if self.since else None,
+            "until": self.until.isoformat() if self.until else None,
+        }
+
+
+class SessionReader:
+    """세션 JSONL을 바이너리로 읽어 엔트리를 스트리밍하는 리더
+
+    offset 위치부터 큰 버퍼로 읽기 시작하며, 완결된 줄(개행으로 끝나는 줄)만
+    처리합니다. 순회가 끝나면 ``offset``은 마지막으로 처리한 줄의 끝을 가리키므로
+    다음 실행에서 이어 읽을 수 있습니다.
+
+    types가 주어지면 원시 바이트에서 "type" 값을 먼저 확인하여, 해당 타입이
+    없는 줄(도구 결과, 스냅샷 등)은 전체 파싱 없이 건너뜁니다.
+    stats가 주어지면 디코딩에 쓴 시간과 처리량을 기록합니다.
+
+    window가 주어지면 기간 밖의 엔트리는 내보내지 않습니다. 엔트리는 시간순으로
+    기록되므로 since 이전 부분은 이분 탐색으로 건너뛰고, until 이후의 엔트리를
+    만나면 나머지는 읽지 않습니다.
+
+    압축 파일(.jsonl.gz/.jsonl.zst)은 백그라운드 스레드에서 풀며 읽고, stream이
+    주어지면 (tar 묶음의 멤버 등) 파일 대신 그 스트림을 읽습니다. 이 경우 offset은
+    풀린 바이트 기준이며 앞부분을 읽어서 건너뜁니다 (이분 탐색 없음).
+
+    drop이 주어지면 중복 판별 키(message_key())가 drop에 있는 줄은 파싱하지 않고
+    건너뛰며, 건너뛴 줄 수를 ``duplicates``에 셉니다.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Path,
+        offset: int = 0,
+        types: tuple[str, ...] | None = None,
+        stats: DecodeStats | None = None,
+        window: TimeWindow | None = None,
+        stream=None,
+        drop: set[int] | None = None,
+    ):
+        self.path = jsonl_path
+        self.offset = offset
+        self.types = types
+        self.stats = stats
+        self.window = window
+        self.stream = stream
+        self.drop = drop
+        self.duplicates = 0
+
+    def __iter__(self) -> Iterator[dict]:
+        if self.stream is None and not self.path.is_file():
+            return
+
+        prefilter = _type_filter(self.types).search if self.types else None
+        stats = self.stats
+        window = self.window
+        drop = self.drop
+        if stats is not None:
+            started = time.perf_counter()
+
+        seekable = self.stream is None and _compression(self.path) is None
+        opened = open_session_file(self.path) if self.stream is None else contextlib.nullcontext(self.stream)
+        with opened as f:
+            if seekable:
+                if window is not None and window.since is not None and self.offset == 0:
+                    self.offset = _seek_since(f, window.since)
+                f.seek(self.offset)
+            else:
+                _skip_bytes(f, self.offset)
+            for line in f:
+                # 기록 중인 마지막 줄은 다음 실행으로 미룸
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                if stats is not None:
+                    stats.lines += 1
+                    stats.bytes += len(line)
+
+                if prefilter is not None and not prefilter(line):
+                    if stats is not None:
+                        stats.skipped += 1
+                    continue
+                if drop and message_key(line) in drop:
+                    self.duplicates += 1
+                    if stats is not None:
+                        stats.skipped += 1
+                    continue
+                try:
+                    entry = _json_loads(line)
+                except ValueError:
+                    if stats is not None:
+                        stats.errors += 1
+                    continue
+                # 중첩 객체의 "type"에 걸린 경우는 여기서 걸러짐
+                if self.types and (not isinstance(entry, dict) or entry.get("type") not in self.types):
+                    continue
+                if window is not None:
+                    ts = _parse_time(_entry_time(entry))
+                    if ts is not None:
+                        if window.until is not None and ts > window.until:
+                            break
+                        if window.since is not None and ts < window.since:
+                            continue
+
+                if stats is None:
+                    yield entry
+                else:
+                    stats.parsed += 1
+                    stats.seconds += time.perf_counter() - started
+                    yield entry
+                    started = time.perf_counter()
+
+        if stats is not None:
+            stats.seconds += time.perf_counter() - started
+
+
+def _skip_bytes(f, count: int) -> None:
+    """탐색할 수 없는 스트림의 앞부분 count바이트를 읽어서 건너뜀"""
+    while count > 0 and (skipped := len(f.read(min(count, READ_BUFFER_SIZE)))):
+        count -= skipped
+
+
+def load_session_messages(jsonl_path: Path, offset: int = 0) -> Iterator[dict]:
+    """JSONL 파일에서 메시지를 한 줄씩 읽어 스트리밍"""
+    yield from SessionReader(jsonl_path, offset, MESSAGE_TYPES)
+
+
+def _entry_time(entry: dict) -> str | None:
+    """엔트리의 타임스탬프 (스냅샷은 snapshot.timestamp)"""
+    snapshot = entry.get("snapshot")
+    return entry.get("timestamp") or (snapshot.get("timestamp") if isinstance(snapshot, dict) else None)
+
+
+def _entry_timestamp(line: bytes) -> str | None:
+    """JSONL 한 줄에서 타임스탬프 추출"""
+    try:
+        entry = _json_loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict):
+        return None
+    return _entry_time(entry)
+
+
+def _seek_since(f, since: datetime, min_span: int = 1 << 16) -> int:
+    """since 이전의 앞부분을 이분 탐색으로 건너뛴 offset 반환
+
+    엔트리가 시간순으로 기록된다고 가정하며, 반환값은 항상 줄의 시작입니다.
+    남은 구간이 min_span보다 작아지면 멈추고 나머지는 줄 단위 필터에 맡깁니다.
+    """
+    lo, hi = 0, f.seek(0, os.SEEK_END)
+    while hi - lo > min_span:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        f.readline()  # 중간에 걸린 줄은 버림
+        ts = None
+        while ts is None and f.tell() < hi:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            ts = _parse_time(_entry_timestamp(line))
+        if ts is not None and ts < since:
+            lo = f.tell()
+        else:
+            hi = mid
+    return lo
+
+
+def session_overlap(session: dict, window: TimeWindow) -> str:
+    """세션이 기간에 걸치는 정도: "outside" / "inside" / "partial"
+
+    파일은 열지 않고 인덱스의 created/modified와 파일 mtime(stat)만 봅니다.
+    인덱스가 낡았을 수 있으므로 마지막 활동 시각은 modified와 mtime 중 늦은 쪽입니다.
+    """
+    created = _parse_time(session.get("created"))
+    modified = _parse_time(session.get("modified"))
+    try:
+        mtime = datetime.fromtimestamp(Path(session.get("fullPath", "")).stat().st_mtime, timezone.utc)
+    except OSError:
+        mtime = None
+    last = max((t for t in (modified, mtime) if t is not None), default=None)
+
+    if window.since is not None and last is not None and last < window.since:
+        return "outside"
+    if window.until is not None and created is not None and created > window.until:
+        return "outside"
+    starts_inside = window.since is None or (created is not None and created >= window.since)
+    ends_inside = window.until is None or (last is not None and last <= window.until)
+    return "inside" if starts_inside and ends_inside else "partial"
+
+
+def first_entry_time(jsonl_path: Path, window: TimeWindow) -> str | None:
+    """기간 안의 첫 엔트리 시각 (기간 시작에 걸친 세션의 작업 시간대를 기간 안의 활동으로 셈)"""
+    entries = iter(SessionReader(jsonl_path, 0, routed_types(), window=window))
+    with contextlib.closing(entries):
+        for entry in entries:
+            ts = _entry_time(entry)
+            if ts:
+                return ts
+    return None
+
+
+def _starts_before(session: dict, window: TimeWindow) -> bool:
+    """세션 생성 시각이 기간 시작보다 앞선지 (모르면 참)"""
+    if window.since is None:
+        return False
+    created = _parse_time(session.get("created"))
+    return created is None or created < window.since
+
+
+def read_edge_timestamps(jsonl_path: Path, max_lines: int = 5, block_size: int = 1 << 16) -> tuple[str | None, str | None]:
+    """파일의 앞/뒤 몇 줄만 읽어 (첫 타임스탬프, 마지막 타임스탬프) 반환
+
+    파일 크기와 무관하게 앞쪽 max_lines줄과 끝쪽 블록만 읽습니다.
+    압축 파일은 끝으로 건너뛸 수 없으므로 전체를 풀며 줄을 훑습니다.
+    """
+    first = last = None
+    if _compression(jsonl_path) is not None:
+        with open_session_file(jsonl_path) as f:
+            for line in f:
+                if line.endswith(b"\n") and b'"timestamp"' in line:
+                    ts = _entry_timestamp(line)
+                    first = first or ts
+                    last = ts or last
+        return first, last
+
+    with open(jsonl_path, "rb") as f:
+        for _ in range(max_lines):
+            line = f.readline()
+            if not line:
+                break
+            first = _entry_timestamp(line)
+            if first:
+                break
+
+        # 끝에서부터 블록 단위로 읽어 완결된 줄을 찾음
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        pos = end
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail.split(b"\n")
+            complete = lines[1:-1] if pos > 0 else lines[:-1]
+            for line in reversed(complete[-max_lines:]):
+                last = _entry_timestamp(line)
+                if last:
+                    return first, last
+            if len(complete) >= max_lines:
+                break
+    return first, last
+
+
+
+# 이어하기/포크한 세션은 원래 세션의 엔트리를 처음부터 uuid는 그대로, sessionId만 바꿔
+# 새 파일에 다시 기록함 → 첫 엔트리가 같은 파일들끼리만 엔트리 단위로 중복을 비교
+UUID_MARKER = b'"uuid":"'
+
+
+def _hash_key(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _uuid_key(uuid: bytes) -> int:
+    """uuid 값의 64비트 키 (표준 형식이면 무작위 부분인 뒤 64비트, 아니면 해시)"""
+    if len(uuid) == 36:
+        try:
+            return int(uuid[19:23] + uuid[24:36], 16)
+        except ValueError:
+            pass
+    return _hash_key(uuid)
+
+
+def message_key(line: bytes) -> int:
+    """엔트리 중복 판별용 64비트 키 (최상위 uuid가 있으면 uuid, 없으면 줄 내용의 해시)
+
+    보통은 JSON 파싱 없이 원시 바이트에서 찾고, "uuid"가 두 번 이상 나오는 줄(도구 결과 등에
+    중첩된 uuid)만 전체 파싱해 최상위 uuid를 씁니다.
+    """
+    start = line.find(UUID_MARKER)
+    if start < 0:
+        return _hash_key(line)
+    start += len(UUID_MARKER)
+    if line.find(UUID_MARKER, start) < 0:
+        return _uuid_key(line[start:line.find(b'"', start)])
+    try:
+        entry = _json_loads(line)
+    except ValueError:
+        entry = None
+    uuid = entry.get("uuid") if isinstance(entry, dict) else None
+    if isinstance(uuid, str):
+        return _uuid_key(uuid.encode())
+    return _hash_key(line)
+
+
+def read_head_key(jsonl_path: Path, types: tuple[str, ...] | None = None, max_lines: int = 64) -> int | None:
+    """세션 파일 첫 엔트리의 중복 판별 키 (앞쪽 max_lines줄 안에 없으면 None)"""
+    prefilter = _type_filter(types).search if types else None
+    try:
+        opened = open(jsonl_path, "rb") if _compression(jsonl_path) is None else open_session_file(jsonl_path)
+    except OSError:
+        return None
+    with opened as f:
+        for line in itertools.islice(f, max_lines):
+            if not line.endswith(b"\n"):
+                break
+            if prefilter is None or prefilter(line):
+                return message_key(line)
+    return None
+
+
+def scan_message_keys(
+    jsonl_path: Path, offset: int = 0, types: tuple[str, ...] | None = None,
+) -> tuple[array.array, array.array, int]:
+    """offset부터 완결된 줄의 중복 판별 키를 파싱 없이 읽어 (키, 줄마다 끝 offset, 다음 offset) 반환
+
+    types가 주어지면 SessionReader와 같은 사전 필터를 통과한 줄만 셉니다.
+    """
+    keys, ends = array.array("Q"), array.array("Q")
+    if not jsonl_path.is_file():
+        return keys, ends, offset
+    prefilter = _type_filter(types).search if types else None
+    with open_session_file(jsonl_path) as f:
+        if _compression(jsonl_path) is None:
+            f.seek(offset)
+        else:
+            _skip_bytes(f, offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if prefilter is not None and not prefilter(line):
+                continue
+            keys.append(message_key(line))
+            ends.append(offset)
+    return keys, ends, offset
+
+
+def _drop_digest(drop: Iterable[int]) -> str:
+    """건너뛴 키 집합의 지문 (없으면 "") — 캐시된 부분 집계가 같은 중복 판정으로 만들어졌는지 확인용"""
+    drop = sorted(drop)
+    return hashlib.sha1(array.array("Q", drop).tobytes()).hexdigest() if drop else ""
+
+def discover_sessions(
+    project_dir: Path, index_entries: list[dict], discovery: Counter | None = None
+) -> list[dict]:
+    """디렉토리를 직접 탐색해 인덱스와 교차 검증한 세션 목록 반환
+
+    - os.scandir로 *.jsonl을 열거 (파일 내용은 읽지 않음)
+    - fullPath가 사라진 인덱스 항목은 프로젝트 디렉토리의 <sessionId>.jsonl로 복구,
+      그래도 없으면 제외
+    - 인덱스의 fileMtime보다 파일이 새로우면(낡은 인덱스) 마지막 줄로 modified를 갱신하고
+      메시지 수는 파일에서 다시 셈
+    - 인덱스에 없는 파일은 첫/마지막 줄의 타임스탬프로 항목을 만들어 추가
+
+    첫/마지막 줄은 필요한 파일에서만 읽으므로 시작 비용은 파일 크기가 아니라
+    파일 개수에 비례합니다. discovery 카운터에 항목별 처리 결과를 기록합니다.
+    """
+    discovery = discovery if discovery is not None else Counter()
+    # 압축 보관 파일(<세션>.jsonl.gz/.zst)도 <세션>.jsonl 이름으로 모음 (원본이 있으면 원본 우선)
+    on_disk: dict[str, os.DirEntry] = {}
+    with os.scandir(project_dir) as it:
+        for dir_entry in it:
+            stem, ext = os.path.splitext(dir_entry.name)
+            compression = COMPRESSED_SUFFIXES.get(ext)
+            name = stem if compression else dir_entry.name
+            if not name.endswith(".jsonl") or not dir_entry.is_file():
+                continue
+            if compression == "zst" and not HAS_ZSTD:
+                _warn_no_zstd()
+                continue
+            if compression is None or name not in on_disk:
+                on_disk[name] = dir_entry
+
+    sessions = []
+    claimed = set()
+    for entry in index_entries:
+        full_path = Path(entry.get("fullPath", ""))
+        name = f"{session_stem(full_path)}.jsonl"
+        if name in on_disk and full_path.parent == project_dir:
+            dir_entry = on_disk[name]
+        elif full_path.is_file():
+            # 프로젝트 밖의 경로를 가리키는 항목: 같은 이름의 파일은 중복 집계하지 않음
+            claimed.add(name)
+            sessions.append(entry)
+            discovery["indexed"] += 1
+            continue
+        elif f"{entry.get('sessionId')}.jsonl" in on_disk:
+            name = f"{entry['sessionId']}.jsonl"
+            dir_entry = on_disk[name]
+            entry = {**entry, "fullPath": dir_entry.path}
+            discovery["relocated"] += 1
+        else:
+            discovery["missing"] += 1
+            continue
+
+        claimed.add(name)
+        file_mtime = entry.get("fileMtime")
+        if file_mtime and dir_entry.stat().st_mtime * 1000 > file_mtime + 1000:
+            _, last = read_edge_timestamps(Path(dir_entry.path))
+            entry = {**entry, "modified": last or entry.get("modified"), "messageCount": None}
+            discovery["stale"] += 1
+        sessions.append(entry)
+        discovery["indexed"] += 1
+
+    for name in sorted(set(on_disk) - claimed):
+        path = Path(on_disk[name].path)
+        try:
+            first, last = read_edge_timestamps(path)
+        except OSError:
+            continue
+        sessions.append({
+            "sessionId": session_stem(path),
+            "fullPath": str(path),
+            "created": first,
+            "modified": last,
+            "messageCount": None,
+        })
+        discovery["discovered"] += 1
+
+    return sessions
+
+
+# 엔트리 타입별 핸들러 레지스트리: 타입 → [엔트리 하나에서 (종류, 값) 이벤트를 만드는 함수]
+ENTRY_HANDLERS: dict[str, list[Callable[[dict], Iterable[tuple[str, Any]]]]] = defaultdict(list)
+
+
+def entry_handler(entry_type: str):
+    """JSONL 엔트리 타입에 대한 이벤트 핸들러 등록 데코레이터
+
+    등록된 타입은 SessionReader의 사전 필터에도 자동으로 포함되므로,
+    새 추출기를 추가해도 파일을 다시 읽을 필요가 없습니다.
+    """
+    def register(func):
+        ENTRY_HANDLERS[entry_type].append(func)
+        return func
+    return register
+
+
+@entry_handler("user")
+def _user_events(entry: dict) -> Iterator[tuple[str, Any]]:
+    """사용자 메시지("message"), 텍스트("text"), 도구 결과("tool_result") 이벤트"""
+    yield "message", entry
+    content = entry.get("message", {}).get("content", "")
+    if isinstance(content, str):
+        yield "text", content
+    elif isinstance(content, list):
+        for item in content:
+            if not isinstance(item, dict):
+                continue
+            if item.get("type") == "text":
+                yield "text", item.get("text", "")
+            elif item.get("type") == "tool_result":
+                yield "tool_result", item
+
+
+@entry_handler("assistant")
+def _assistant_events(entry: dict) -> Iterator[tuple[str, Any]]:
+    """어시스턴트 메시지("message"), 응답("assistant"), 도구 호출("tool_use") 이벤트"""
+    yield "message", entry
+    message = entry.get("message", {})
+    yield "assistant", message
+    content = message.get("content")
+    if isinstance(content, list):
+        for item in content:
+            if isinstance(item, dict) and item.get("type") == "tool_use":
+                yield "tool_use", item
+
+
+@entry_handler("file-history-snapshot")
+def _snapshot_events(entry: dict) -> Iterator[tuple[str, Any]]:
+    """스냅샷에 기록된 파일 경로("file") 이벤트"""
+    snapshot = entry.get("snapshot", {})
+    for path in snapshot.get("trackedFileBackups", {}):
+        yield "file", path
+
+
+def routed_types() -> tuple[str, ...]:
+    """핸들러가 등록된 엔트리 타입 목록"""
+    return tuple(ENTRY_HANDLERS)
+
+
+def route_entries(entries: Iterable[dict]) -> Iterator[tuple[str, Any]]:
+    """엔트리 스트림을 한 번만 순회하며 타입별 핸들러로 분배해 이벤트를 생성"""
+    handlers = ENTRY_HANDLERS
+    for entry in entries:
+        for handler in handlers.get(entry.get("type"), ()):
+            yield from handler(entry)
+
+
+def extract_user_messages(messages: Iterable[dict]) -> Iterator[str]:
+    """사용자 메시지만 추출"""
+    for kind, value in route_entries(messages):
+        if kind == "text":
+            yield value
+
+
+def extract_file_changes(messages: Iterable[dict]) -> Iterator[str]:
+    """파일 변경 내역 추출"""
+    for kind, value in route_entries(messages):
+        if kind == "file":
+            yield value
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """키워드 목록을 접두사 trie 형태의 정규식으로 변환
+
+    각 분기가 서로 다른 문자로 시작하므로 위치마다 한 분기만 따라가며,
+    키워드 끝 노드는 탐욕적 선택 그룹이 되어 가장 긴 키워드가 우선 매치됩니다.
+    """
+    trie: dict = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """여러 키워드를 텍스트 한 번 훑기로 모두 찾는 다중 패턴 매처 (Aho-Corasick 방식)
+
+    백엔드는 키워드 수에 따라 고릅니다 (backend로 직접 지정 가능).
+    - "ahocorasick": pyahocorasick이 설치되어 있으면 C 구현 Aho-Corasick 오토마톤
+    - "scan": 키워드가 SCAN_THRESHOLD개 이하면 C 수준 부분 문자열 검색 (작은 표에서는 이쪽이 빠름)
+    - "trie": 그보다 많으면 키워드 trie를 컴파일한 정규식으로 한 번만 훑음. 전방탐색으로
+      위치마다 가장 긴 키워드를 찾고, 같은 위치에서 시작하는 더 짧은 키워드는
+      모두 그 접두사이므로 미리 계산한 접두사 목록으로 함께 보고합니다.
+
+    어느 백엔드든 겹치는 등장도 모두 셉니다 ("aa"는 "aaa"에서 두 번).
+    """
+
+    SCAN_THRESHOLD = 256
+    BACKENDS = ("ahocorasick", "scan", "trie")
+
+    def __init__(self, keywords: Iterable[str], backend: str | None = None):
+        self.keywords = sorted({kw.lower() for kw in keywords if kw})
+        self._automaton = None
+        self._pattern = None
+        if backend is None:
+            if HAS_AHOCORASICK:
+                backend = "ahocorasick"
+            else:
+                backend = "trie" if len(self.keywords) > self.SCAN_THRESHOLD else "scan"
+        elif backend not in self.BACKENDS:
+            raise ValueError(f"알 수 없는 키워드 매칭 백엔드입니다: {backend}")
+        elif backend == "ahocorasick" and not HAS_AHOCORASICK:
+            raise ValueError("ahocorasick 백엔드는 pyahocorasick이 필요합니다 (pip install pyahocorasick)")
+        self.backend = backend
+
+        if backend == "ahocorasick":
+            self._automaton = ahocorasick.Automaton()
+            for kw in self.keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+        elif backend == "trie":
+            self._prefixes = {
+                kw: [p for p in self.keywords if kw.startswith(p)] for kw in self.keywords
+            }
+            self._pattern = re.compile(f"(?=({_trie_pattern(self.keywords)}))")
+        else:
+            # str.count()는 겹치는 등장을 건너뛰므로, 자기 자신과 겹칠 수 있는 키워드만 find()로 셈
+            self._overlapping = {
+                kw for kw in self.keywords if any(kw.startswith(kw[i:]) for i in range(1, len(kw)))
+            }
+
+    def _occurrences(self, lowered: str, kw: str) -> int:
+        if kw not in self._overlapping:
+            return lowered.count(kw)
+        count, i = 0, lowered.find(kw)
+        while i >= 0:
+            count += 1
+            i = lowered.find(kw, i + 1)
+        return count
+
+    def finditer(self, lowered: str) -> Iterator[str]:
+        """소문자 텍스트에 등장하는 모든 키워드를 등장할 때마다 생성"""
+        if self._automaton is not None:
+            for _, kw in self._automaton.iter(lowered):
+                yield kw
+        elif self._pattern is not None:
+            prefixes = self._prefixes
+            for match in self._pattern.finditer(lowered):
+                yield from prefixes[match.group(1)]
+        else:
+            for kw in self.keywords:
+                if kw in lowered:
+                    for _ in range(self._occurrences(lowered, kw)):
+                        yield kw
+
+    def count(self, lowered: str) -> Counter:
+        """키워드별 등장 횟수"""
+        if self._automaton is None and self._pattern is None:
+            return Counter({kw: self._occurrences(lowered, kw) for kw in self.keywords if kw in lowered})
+        return Counter(self.finditer(lowered))
+
+
+def _table_keywords(*tables: dict[str, list[str]]) -> Iterator[str]:
+    for table in tables:
+        for keywords in table.values():
+            yield from keywords
+
+
+KEYWORD_MATCHER = KeywordMatcher(
+    _table_keywords(TASK_PATTERNS, *TECH_KEYWORDS.values())
+)
+
+
+def match_keywords(text: str) -> Counter:
+    """텍스트 하나에서 기술/작업 키워드 등장 횟수 계산"""
+    # 원래 " ".join() 결합과 같이 텍스트 경계를 공백으로 취급
+    return KEYWORD_MATCHER.count(text.lower() + " ")
+
+
+class KeywordCounter:
+    """키워드 테이블에 대해 키워드별 등장 횟수를 누적
+
+    텍스트를 보관하지 않고 키워드별 카운터만 유지하므로,
+    코퍼스 크기와 무관하게 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, table: dict[str, list[str]]):
+        self.table = table
+        self.keywords = {kw.lower() for kws in table.values() for kw in kws}
+        self.hits = Counter()
+
+    def add(self, hits: Counter) -> None:
+        """match_keywords() 결과 중 이 테이블의 키워드만 반영"""
+        for kw, n in hits.items():
+            if kw in self.keywords:
+                self.hits[kw] += n
+
+    def merge(self, other: "KeywordCounter") -> None:
+        self.hits.update(other.hits)
+
+    def to_dict(self) -> dict:
+        return dict(self.hits)
+
+    def load(self, data: dict) -> None:
+        """to_dict() 결과를 현재 상태에 합침"""
+        self.hits.update({kw: n for kw, n in data.items() if kw in self.keywords})
+
+    def counter(self, occurrences: bool = False) -> Counter:
+        """테이블 순서대로 집계
+
+        기본은 한 번이라도 등장한 키워드 수, occurrences=True면 실제 등장 횟수 합계
+        """
+        counter = Counter()
+        for name, keywords in self.table.items():
+            if occurrences:
+                count = sum(self.hits[kw.lower()] for kw in keywords)
+            else:
+                count = sum(1 for kw in keywords if self.hits[kw.lower()])
+            if count > 0:
+                counter[name] = count
+        return counter
+
+
+class Analyzer:
+    """분석기 인터페이스
+
+    모든 분석기는 한 번의 스트리밍 스캔 안에서 함께 실행됩니다.
+    - __init__(): 빈 상태 생성
+    - consume(kind, value): ``kinds``에 선언한 종류의 이벤트를 하나씩 반영
+    - merge(other): 같은 분석기의 부분 상태를 합침 (세션/워커 간 병합)
+    - finalize(options): 최종 결과 생성
+    - to_dict() / load(data): 캐시 저장과 워커 전송을 위한 직렬화
+
+    이벤트 종류:
+    - 세션 파일: "message"(user/assistant 엔트리 원본), "text", "tool_result",
+      "assistant", "tool_use", "file" (새 종류는 @entry_handler로 추가),
+      "source" → (프로젝트 디렉토리 이름, 세션 파일 이름), 파일을 읽기 전에 한 번
+    - 키워드: "keywords" → (원본 종류 "text"/"file", 키워드별 등장 횟수)
+    - 인덱스: "session" → 세션 인덱스 엔트리, "project" → 프로젝트 이름
+    """
+
+    name = ""
+    kinds: tuple[str, ...] = ()
+
+    def consume(self, kind: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def merge(self, other: "Analyzer") -> None:
+        self.load(other.to_dict())
+
+    def to_dict(self) -> dict:
+        raise NotImplementedError
+
+    def load(self, data: dict) -> None:
+        raise NotImplementedError
+
+    def finalize(self, options: dict) -> Any:
+        raise NotImplementedError
+
+
+# 분석기 레지스트리: 이름 → 분석기 클래스 (등록 순서대로 실행)
+ANALYZERS: dict[str, type[Analyzer]] = {}
+
+
+def register_analyzer(cls: type[Analyzer]) -> type[Analyzer]:
+    """분석기 등록 데코레이터
+
+    --jobs 워커에서도 같은 분석기가 쓰이도록 모듈 최상위에서 등록해야 합니다.
+    """
+    ANALYZERS[cls.name] = cls
+    return cls
+
+
+@register_analyzer
+class TechStackAnalyzer(Analyzer):
+    """기술 스택 분석"""
+
+    name = "tech_stack"
+    kinds = ("keywords",)
+
+    def __init__(self):
+        self.categories = {
+            category: KeywordCounter(techs) for category, techs in TECH_KEYWORDS.items()
+        }
+
+    def consume(self, kind: str, value: tuple[str, Counter]) -> None:
+        for counter in self.categories.values():
+            counter.add(value[1])
+
+    def merge(self, other: "TechStackAnalyzer") -> None:
+        for category, counter in self.categories.items():
+            counter.merge(other.categories[category])
+
+    def to_dict(self) -> dict:
+        return {category: c.to_dict() for category, c in self.categories.items() if c.hits}
+
+    def load(self, data: dict) -> None:
+        for category, hits in data.items():
+            if category in self.categories:
+                self.categories[category].load(hits)
+
+    def finalize(self, options: dict) -> dict[str, Counter]:
+        occurrences = options.get("count_occurrences", False)
+        return {category: c.counter(occurrences) for category, c in self.categories.items()}
+
+
+@register_analyzer
+class TaskTypeAnalyzer(Analyzer):
+    """작업 유형 분석 (사용자 텍스트만 대상)"""
+
+    name = "task_types"
+    kinds = ("keywords",)
+
+    def __init__(self):
+        self.keywords = KeywordCounter(TASK_PATTERNS)
+
+    def consume(self, kind: str, value: tuple[str, Counter]) -> None:
+        source, hits = value
+        if source == "text":
+            self.keywords.add(hits)
+
+    def merge(self, other: "TaskTypeAnalyzer") -> None:
+        self.keywords.merge(other.keywords)
+
+    def to_dict(self) -> dict:
+        return self.keywords.to_dict()
+
+    def load(self, data: dict) -> None:
+        self.keywords.load(data)
+
+    def finalize(self, options: dict) -> Counter:
+        return self.keywords.counter(options.get("count_occurrences", False))
+
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+@register_analyzer
+class WorkingHoursAnalyzer(Analyzer):
+    """세션 생성 시각 기반 작업 시간대/요일 분석"""
+
+    name = "working_hours"
+    kinds = ("session",)
+
+    def __init__(self):
+        self.hours = Counter()
+        self.weekdays = Counter()
+
+    def consume(self, kind: str, session: dict) -> None:
+        created = session.get("created")
+        if created:
+            try:
+                dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
+                self.hours[dt.hour] += 1
+                self.weekdays[dt.strftime("%A")] += 1
+            except:
+                return
+
+    def merge(self, other: "WorkingHoursAnalyzer") -> None:
+        self.hours.update(other.hours)
+        self.weekdays.update(other.weekdays)
+
+    def to_dict(self) -> dict:
+        if not self.hours:
+            return {}
+        # JSON 키는 문자열이므로 시간대는 load()에서 정수로 되돌림
+        return {"hours": {str(h): n for h, n in self.hours.items()}, "weekdays": dict(self.weekdays)}
+
+    def load(self, data: dict) -> None:
+        self.hours.update({int(h): n for h, n in data.get("hours", {}).items()})
+        self.weekdays.update(data.get("weekdays", {}))
+
+    def finalize(self, options: dict) -> dict:
+        # 병합 순서와 무관하게 같은 결과가 나오도록 시간/요일 순으로 정렬
+        # (동률일 때 most_common 순서도 이 순서를 따름)
+        return {
+            "hours": Counter(dict(sorted(self.hours.items()))),
+            "weekdays": Counter({d: self.weekdays[d] for d in WEEKDAYS if d in self.weekdays}),
+        }
+
+
+@register_analyzer
+class MetricsAnalyzer(Analyzer):
+    """세션/메시지 메트릭 (합계와 개수만 유지)"""
+
+    name = "metrics"
+    kinds = ("session", "message", "text", "duplicates")
+    FIELDS = (
+        "total_sessions", "total_messages", "file_messages",
+        "user_messages", "total_length", "question_count", "duplicate_entries",
+    )
+
+    def __init__(self):
+        self.total_sessions = 0
+        self.total_messages = 0
+        # 파일에서 직접 센 user/assistant 엔트리 수 (인덱스에 없는 세션용)
+        self.file_messages = 0
+        self.user_messages = 0
+        self.total_length = 0
+        self.question_count = 0
+        # 앞선 세션에서 이미 센 엔트리라 건너뛴 수 (이어하기/포크한 세션)
+        self.duplicate_entries = 0
+
+    def consume(self, kind: str, value: Any) -> None:
+        if kind == "session":
+            self.total_sessions += 1
+            self.total_messages += value.get("messageCount", 0)
+        elif kind == "message":
+            self.file_messages += 1
+        elif kind == "duplicates":
+            self.duplicate_entries += value
+        else:
+            self.user_messages += 1
+            self.total_length += len(value)
+            if "?" in value or "?" in value:
+                self.question_count += 1
+
+    def merge(self, other: "MetricsAnalyzer") -> None:
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def to_dict(self) -> dict:
+        if not any(getattr(self, field) for field in self.FIELDS):
+            return {}
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def load(self, data: dict) -> None:
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + data.get(field, 0))
+
+    def finalize(self, options: dict) -> dict:
+        n = self.user_messages
+        avg_message_length = self.total_length / n if n else 0
+        question_ratio = self.question_count / n if n else 0
+
+        return {
+            "total_sessions": self.total_sessions,
+            "total_messages": self.total_messages,
+            "avg_messages_per_session": (
+                self.total_messages / self.total_sessions if self.total_sessions else 0
+            ),
+            "avg_message_length": round(avg_message_length),
+            "question_ratio": round(question_ratio * 100, 1),
+        }
+
+
+@register_analyzer
+class ProjectAnalyzer(Analyzer):
+    """프로젝트 수"""
+
+    name = "projects"
+    kinds = ("project",)
+
+    def __init__(self):
+        self.names: set[str] = set()
+
+    def consume(self, kind: str, name: str) -> None:
+        self.names.add(name)
+
+    def merge(self, other: "ProjectAnalyzer") -> None:
+        self.names |= other.names
+
+    def to_dict(self) -> dict:
+        return {"names": sorted(self.names)} if self.names else {}
+
+    def load(self, data: dict) -> None:
+        self.names.update(data.get("names", []))
+
+    def finalize(self, options: dict) -> int:
+        return len(self.names)
+
+
+# 사용량 분석: --usage로 켜며, 기본 프로필(JSON 키와 요약 섹션)은 바꾸지 않음
+class ToolCallAnalyzer(Analyzer):
+    """도구 호출 분포"""
+
+    name = "tool_calls"
+    kinds = ("tool_use",)
+
+    def __init__(self):
+        self.tools = Counter()
+
+    def consume(self, kind: str, block: dict) -> None:
+        self.tools[block.get("name", "unknown")] += 1
+
+    def merge(self, other: "ToolCallAnalyzer") -> None:
+        self.tools.update(other.tools)
+
+    def to_dict(self) -> dict:
+        return dict(self.tools)
+
+    def load(self, data: dict) -> None:
+        self.tools.update(data)
+
+    def finalize(self, options: dict) -> dict:
+        return dict(self.tools.most_common())
+
+
+class TokenUsageAnalyzer(Analyzer):
+    """어시스턴트 응답의 토큰 사용량 합계"""
+
+    name = "token_usage"
+    kinds = ("assistant",)
+    FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+    def __init__(self):
+        self.responses = 0
+        self.totals = Counter()
+
+    def consume(self, kind: str, message: dict) -> None:
+        usage = message.get("usage")
+        if not isinstance(usage, dict):
+            return
+        self.responses += 1
+        for field in self.FIELDS:
+            value = usage.get(field)
+            if isinstance(value, int):
+                self.totals[field] += value
+
+    def merge(self, other: "TokenUsageAnalyzer") -> None:
+        self.responses += other.responses
+        self.totals.update(other.totals)
+
+    def to_dict(self) -> dict:
+        return {"responses": self.responses, "totals": dict(self.totals)} if self.responses else {}
+
+    def load(self, data: dict) -> None:
+        self.responses += data.get("responses", 0)
+        self.totals.update(data.get("totals", {}))
+
+    def finalize(self, options: dict) -> dict:
+        result = {"responses": self.responses}
+        result.update({field: self.totals[field] for field in self.FIELDS})
+        return result
+
+
+class SessionDurationAnalyzer(Analyzer):
+    """세션 인덱스의 created~modified 기반 세션 길이"""
+
+    name = "session_duration"
+    kinds = ("session",)
+
+    def __init__(self):
+        self.sessions = 0
+        self.total_minutes = 0.0
+        self.max_minutes = 0.0
+
+    def consume(self, kind: str, session: dict) -> None:
+        try:
+            created = datetime.fromisoformat(session["created"].replace("Z", "+00:00"))
+            modified = datetime.fromisoformat(session["modified"].replace("Z", "+00:00"))
+        except (KeyError, AttributeError, ValueError):
+            return
+        minutes = max((modified - created).total_seconds() / 60, 0.0)
+        self.sessions += 1
+        self.total_minutes += minutes
+        self.max_minutes = max(self.max_minutes, minutes)
+
+    def merge(self, other: "SessionDurationAnalyzer") -> None:
+        self.sessions += other.sessions
+        self.total_minutes += other.total_minutes
+        self.max_minutes = max(self.max_minutes, other.max_minutes)
+
+    def to_dict(self) -> dict:
+        if not self.sessions:
+            return {}
+        return {"sessions": self.sessions, "total_minutes": self.total_minutes, "max_minutes": self.max_minutes}
+
+    def load(self, data: dict) -> None:
+        self.sessions += data.get("sessions", 0)
+        self.total_minutes += data.get("total_minutes", 0.0)
+        self.max_minutes = max(self.max_minutes, data.get("max_minutes", 0.0))
+
+    def finalize(self, options: dict) -> dict:
+        return {
+            "sessions": self.sessions,
+            "avg_minutes": round(self.total_minutes / self.sessions, 1) if self.sessions else 0,
+            "max_minutes": round(self.max_minutes, 1),
+            "total_hours": round(self.total_minutes / 60, 1),
+        }
+
+
+USAGE_ANALYZERS = (ToolCallAnalyzer, TokenUsageAnalyzer, SessionDurationAnalyzer)
+
+
+def enable_usage() -> None:
+    """도구 호출/토큰 사용량/세션 길이 분석기 등록 (이후 생성하는 ProfilePartial부터 포함)"""
+    for cls in USAGE_ANALYZERS:
+        register_analyzer(cls)
+
+
+# 근사(스케치) 분석: --sketch로 켜며, 정해진 메모리 상한 안에서 병합 가능한 근사 통계를 계산
+DEFAULT_SKETCH_MEMORY_KB = 256
+MIN_SKETCH_MEMORY_KB = 16
+# 원소가 적은 동안은 0이 아닌 칸만 dict로 유지 (세션별 부분 집계와 캐시를 작게 유지)
+# dict 항목은 칸보다 훨씬 크므로 전체 칸 수의 1/128을 넘으면 배열로 전환
+SPARSE_RATIO = 128
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """고유 개수 추정 (레지스터 m = 2^p개, 1바이트씩, 상대 표준 오차 ≈ 1.04/√m)"""
+
+    def __init__(self, p: int):
+        self.p = p
+        self.sparse: dict[int, int] | None = {}
+        self.registers: bytearray | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.sparse) if self.registers is None else any(self.registers)
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        width = 64 - self.p
+        index = h >> width
+        rank = width - (h & ((1 << width) - 1)).bit_length() + 1
+        self._update(index, rank)
+
+    def _update(self, index: int, rank: int) -> None:
+        if self.registers is not None:
+            if rank > self.registers[index]:
+                self.registers[index] = rank
+        elif rank > self.sparse.get(index, 0):
+            self.sparse[index] = rank
+            if len(self.sparse) > (1 << self.p) // SPARSE_RATIO:
+                self._densify()
+
+    def _densify(self) -> None:
+        self.registers = bytearray(1 << self.p)
+        for index, rank in self.sparse.items():
+            self.registers[index] = rank
+        self.sparse = None
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.p != self.p:
+            raise ValueError(f"HyperLogLog 정밀도가 다릅니다 (p={other.p} ≠ {self.p})")
+        if other.registers is None:
+            for index, rank in other.sparse.items():
+                self._update(index, rank)
+            return
+        if self.registers is None:
+            self._densify()
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = 1 << self.p
+        ranks = self.sparse.values() if self.registers is None else self.registers
+        zeros = m - len(self.sparse) if self.registers is None else self.registers.count(0)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / (zeros + sum(2.0 ** -r for r in ranks if r))
+        # 작은 범위는 선형 계수(linear counting)가 더 정확함
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_dict(self) -> dict:
+        if self.registers is None:
+            return {"p": self.p, "sparse": sorted(self.sparse.items())}
+        return {"p": self.p, "registers": base64.b64encode(self.registers).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        sketch = cls(data["p"])
+        if "registers" in data:
+            sketch.registers = bytearray(base64.b64decode(data["registers"]))
+            sketch.sparse = None
+        else:
+            sketch.sparse = {index: rank for index, rank in data["sparse"]}
+        return sketch
+
+
+class CountMinSketch:
+    """빈도 추정 (width × depth 카운터, 과대 추정만 하며 오차 ≤ e/width × 전체 합일 확률 ≥ 1 - e^-depth)"""
+
+    def __init__(self, width: int, depth: int):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.sparse: dict[int, int] | None = {}
+        self.table: array.array | None = None
+
+    def _cells(self, key: str) -> list[int]:
+        h = _hash64(key)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """key의 빈도를 count만큼 늘리고 새 추정값 반환"""
+        self.total += count
+        cells = self._cells(key)
+        if self.table is not None:
+            table = self.table
+            for cell in cells:
+                table[cell] += count
+            return min(table[cell] for cell in cells)
+        sparse = self.sparse
+        for cell in cells:
+            sparse[cell] = sparse.get(cell, 0) + count
+        estimate = min(sparse[cell] for cell in cells)
+        if len(sparse) > self.width * self.depth // SPARSE_RATIO:
+            self._densify()
+        return estimate
+
+    def _densify(self) -> None:
+        self.table = array.array("Q", bytes(8 * self.width * self.depth))
+        for cell, count in self.sparse.items():
+            self.table[cell] = count
+        self.sparse = None
+
+    def estimate(self, key: str) -> int:
+        cells = self._cells(key)
+        if self.table is not None:
+            return min(self.table[cell] for cell in cells)
+        return min(self.sparse.get(cell, 0) for cell in cells)
+
+    def error_bound(self) -> int:
+        return math.ceil(math.e / self.width * self.total)
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(
+                f"count-min 스케치 크기가 다릅니다 ({other.width}×{other.depth} ≠ {self.width}×{self.depth})"
+            )
+        self.total += other.total
+        if other.table is None:
+            if self.table is None:
+                for cell, count in other.sparse.items():
+                    self.sparse[cell] = self.sparse.get(cell, 0) + count
+                if len(self.sparse) > self.width * self.depth // SPARSE_RATIO:
+                    self._densify()
+            else:
+                for cell, count in other.sparse.items():
+                    self.table[cell] += count
+            return
+        if self.table is None:
+            self._densify()
+        self.table = array.array("Q", map(sum, zip(self.table, other.table)))
+
+    def to_dict(self) -> dict:
+        data = {"width": self.width, "depth": self.depth, "total": self.total}
+        if self.table is None:
+            data["sparse"] = sorted(self.sparse.items())
+        else:
+            data["table"] = self.table.tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CountMinSketch":
+        sketch = cls(data["width"], data["depth"])
+        sketch.total = data["total"]
+        if "table" in data:
+            sketch.table = array.array("Q", data["table"])
+            sketch.sparse = None
+        else:
+            sketch.sparse = {cell: count for cell, count in data["sparse"]}
+        return sketch
+
+
+class QuantileSketch:
+    """분위수 추정 (로그 버킷 히스토그램, 양수 값의 상대 오차 ≤ alpha)
+
+    값 x는 ceil(log_γ x) 버킷에 세며 (γ = (1+α)/(1-α)), 버킷 수가 max_buckets를
+    넘으면 가장 작은 버킷부터 합칩니다 (이때 작은 분위수만 오차가 커짐).
+    """
+
+    def __init__(self, alpha: float = 0.01, max_buckets: int = 1024):
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.buckets[target] += self.buckets.pop(key)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.alpha != self.alpha:
+            raise ValueError(f"분위수 스케치 오차 설정이 다릅니다 ({other.alpha} ≠ {self.alpha})")
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def to_dict(self) -> dict:
+        return {
+            "alpha": self.alpha,
+            "zeros": self.zeros,
+            "count": self.count,
+            # JSON 키는 문자열이므로 from_dict()에서 정수로 되돌림
+            "buckets": {str(k): n for k, n in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, max_buckets: int = 1024) -> "QuantileSketch":
+        sketch = cls(data["alpha"], max_buckets)
+        sketch.zeros = data["zeros"]
+        sketch.count = data["count"]
+        sketch.buckets.update({int(k): n for k, n in data["buckets"].items()})
+        return sketch
+
+
+TERM_PATTERN = re.compile(r"\w{2,}")
+
+
+def iter_terms(text: str) -> Iterator[str]:
+    """사용자 메시지의 단어와 2-gram"""
+    words = TERM_PATTERN.findall(text.lower())
+    yield from words
+    for first, second in zip(words, words[1:]):
+        yield f"{first} {second}"
+
+
+class SketchAnalyzer(Analyzer):
+    """근사 통계 (--sketch로 등록, 메모리 상한 memory_kb 안에서 계산)
+
+    - 고유 세션/파일 수: HyperLogLog (각각 상한의 1/8)
+    - 사용자 메시지의 단어·2-gram 빈도: count-min 스케치 (상한의 1/2) + 상위 후보
+      (표현마다 해시하지 않도록 상한의 1/4 이내의 정확한 카운터에 모았다가 한 번에 반영)
+    - 사용자 메시지 길이 분위수: QuantileSketch (상대 오차 1%)
+
+    기술/작업 키워드는 사전이 고정되어 있어 기존 분석기가 이미 상한 있는 메모리로
+    정확히 셉니다. 상위 표현은 부분 집계마다 남긴 후보를 병합된 스케치로 다시
+    추정하므로, 어느 부분 집계에서도 후보가 되지 못한 표현은 빠질 수 있습니다.
+    메모리 상한이 다른 부분 집계끼리는 병합할 수 없습니다 (ValueError).
+    """
+
+    name = "sketch"
+    kinds = ("session", "file", "text")
+    memory_kb = DEFAULT_SKETCH_MEMORY_KB
+    CMS_DEPTH = 4
+    QUANTILE_ALPHA = 0.01
+    QUANTILES = (0.5, 0.9, 0.99)
+    TOP_TERMS = 20
+    # 병합 후에도 상위 표현이 남도록 보고할 개수보다 넉넉히 후보 유지
+    CANDIDATES = TOP_TERMS * 4
+
+    def __init__(self):
+        budget = self.memory_kb * 1024
+        p = min(18, max(4, (budget // 8).bit_length() - 1))
+        self.sessions = HyperLogLog(p)
+        self.files = HyperLogLog(p)
+        self.terms = CountMinSketch(budget // 2 // (8 * self.CMS_DEPTH), self.CMS_DEPTH)
+        self.lengths = QuantileSketch(self.QUANTILE_ALPHA)
+        self.candidates: dict[str, int] = {}  # 상위 표현 후보 → 추정 빈도
+        self._floor = 0
+        self._pending = Counter()
+        # Counter 항목 하나를 약 64바이트로 계산
+        self._pending_limit = budget // 4 // 64
+
+    def consume(self, kind: str, value: Any) -> None:
+        if kind == "session":
+            self.sessions.add(value.get("sessionId") or value.get("fullPath", ""))
+        elif kind == "file":
+            self.files.add(value)
+        else:
+            self.lengths.add(len(value))
+            self._pending.update(iter_terms(value))
+            if len(self._pending) > self._pending_limit:
+                self._flush()
+
+    def _flush(self) -> None:
+        for term, count in self._pending.items():
+            self._track(term, self.terms.add(term, count))
+        self._pending.clear()
+
+    def _track(self, term: str, estimate: int) -> None:
+        # 후보가 2배로 늘 때만 정리하여 표현마다 정렬하지 않음
+        if term in self.candidates or estimate > self._floor or len(self.candidates) < self.CANDIDATES:
+            self.candidates[term] = estimate
+            if len(self.candidates) >= 2 * self.CANDIDATES:
+                self._prune()
+
+    def _prune(self) -> None:
+        top = sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))[: self.CANDIDATES]
+        self.candidates = dict(top)
+        self._floor = top[-1][1] if len(top) == self.CANDIDATES else 0
+
+    def merge(self, other: "SketchAnalyzer") -> None:
+        self._flush()
+        other._flush()
+        self.sessions.merge(other.sessions)
+        self.files.merge(other.files)
+        self.terms.merge(other.terms)
+        self.lengths.merge(other.lengths)
+        terms = self.candidates.keys() | other.candidates.keys()
+        self.candidates = {term: self.terms.estimate(term) for term in terms}
+        self._prune()
+
+    def to_dict(self) -> dict:
+        if not (self.sessions or self.files or self.lengths.count):
+            return {}
+        self._flush()
+        return {
+            "memory_kb": self.memory_kb,
+            "sessions": self.sessions.to_dict(),
+            "files": self.files.to_dict(),
+            "terms": self.terms.to_dict(),
+            "lengths": self.lengths.to_dict(),
+            "candidates": sorted(self.candidates),
+        }
+
+    def load(self, data: dict) -> None:
+        if data["memory_kb"] != self.memory_kb:
+            raise ValueError(f"스케치 메모리 상한이 다릅니다 ({data['memory_kb']}KB ≠ {self.memory_kb}KB)")
+        other = SketchAnalyzer()
+        other.sessions = HyperLogLog.from_dict(data["sessions"])
+        other.files = HyperLogLog.from_dict(data["files"])
+        other.terms = CountMinSketch.from_dict(data["terms"])
+        other.lengths = QuantileSketch.from_dict(data["lengths"])
+        other.candidates = dict.fromkeys(data["candidates"], 0)
+        self.merge(other)
+
+    def finalize(self, options: dict) -> dict:
+        self._flush()
+        top = sorted(
+            ((term, self.terms.estimate(term)) for term in self.candidates),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return {
+            "memory_kb": self.memory_kb,
+            "distinct_sessions": self.sessions.estimate(),
+            "distinct_files": self.files.estimate(),
+            "message_length": {f"p{round(q * 100)}": round(self.lengths.quantile(q)) for q in self.QUANTILES},
+            "top_terms": dict(top[: self.TOP_TERMS]),
+            "error_bounds": {
+                # 고유 개수: 상대 표준 오차 (1σ)
+                "distinct_relative_std": round(1.04 / math.sqrt(1 << self.files.p), 4),
+                # 표현 빈도: 실제보다 최대 이만큼 크게 추정 (확률 term_confidence 이상)
+                "term_overcount": self.terms.error_bound(),
+                "term_confidence": round(1 - math.exp(-self.CMS_DEPTH), 3),
+                # 메시지 길이 분위수: 상대 오차
+                "length_relative": self.QUANTILE_ALPHA,
+            },
+        }
+
+
+def enable_sketch(memory_kb: int = DEFAULT_SKETCH_MEMORY_KB) -> None:
+    """근사 분석기 등록 (이후 생성하는 ProfilePartial부터 포함)"""
+    if memory_kb < MIN_SKETCH_MEMORY_KB:
+        raise ValueError(f"스케치 메모리 상한은 {MIN_SKETCH_MEMORY_KB}KB 이상이어야 합니다")
+    SketchAnalyzer.memory_kb = memory_kb
+    register_analyzer(SketchAnalyzer)
+
+
+# 열 지향 메시지 테이블: --table로 켜며, 사용자 메시지마다 한 행을 배열에 쌓아 벡터 연산으로 통계 계산
+@functools.cache
+def _numpy():
+    import numpy
+    return numpy
+
+
+@functools.lru_cache(maxsize=4096)
+def _day_epoch(day: str) -> int:
+    return int(datetime.fromisoformat(day).replace(tzinfo=timezone.utc).timestamp())
+
+
+def _epoch_seconds(value: str | None) -> int | None:
+    """타임스탬프 → epoch 초 (흔한 "…T09:00:00.000Z" 형식은 날짜만 캐시해 직접 계산)"""
+    if isinstance(value, str) and len(value) >= 20 and value[10] == "T" and value[-1] == "Z":
+        try:
+            return _day_epoch(value[:10]) + int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+        except ValueError:
+            pass
+    ts = _parse_time(value)
+    return int(ts.timestamp()) if ts else None
+
+
+class MessageTable:
+    """사용자 메시지 열 지향 테이블
+
+    열마다 array.array 하나에 값을 쌓고 (행당 21바이트), numpy가 있으면
+    columns()가 복사 없이 ndarray로 돌려줍니다. 세션/프로젝트는 이름 목록의
+    번호로 저장하며, 타임스탬프를 모르는 행의 ts는 0입니다.
+    """
+
+    COLUMNS = {"ts": "q", "length": "i", "question": "b", "session": "i", "project": "i"}
+    DTYPES = {"q": "<i8", "i": "<i4", "b": "<i1"}
+
+    def __init__(self):
+        self.data = {name: array.array(code) for name, code in self.COLUMNS.items()}
+        self.sessions: list[str] = []
+        self.projects: list[str] = []
+        self._session_ids: dict[str, int] = {}
+        self._project_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.data["ts"])
+
+    def session_id(self, name: str) -> int:
+        if name not in self._session_ids:
+            self._session_ids[name] = len(self.sessions)
+            self.sessions.append(name)
+        return self._session_ids[name]
+
+    def project_id(self, name: str) -> int:
+        if name not in self._project_ids:
+            self._project_ids[name] = len(self.projects)
+            self.projects.append(name)
+        return self._project_ids[name]
+
+    def append(self, ts: int, length: int, question: bool, session: int, project: int) -> None:
+        data = self.data
+        data["ts"].append(ts)
+        data["length"].append(length)
+        data["question"].append(question)
+        data["session"].append(session)
+        data["project"].append(project)
+
+    def extend(self, other: "MessageTable") -> None:
+        """다른 테이블의 행을 뒤에 붙임 (세션/프로젝트 번호는 이 테이블 기준으로 바꿈)"""
+        sessions = [self.session_id(name) for name in other.sessions]
+        projects = [self.project_id(name) for name in other.projects]
+        for name in ("ts", "length", "question"):
+            self.data[name].extend(other.data[name])
+        self.data["session"].extend(map(sessions.__getitem__, other.data["session"]))
+        self.data["project"].extend(map(projects.__getitem__, other.data["project"]))
+
+    def rename_projects(self, rename: Callable[[str], str]) -> None:
+        self.projects = [rename(name) for name in self.projects]
+        self._project_ids = {name: i for i, name in enumerate(self.projects)}
+
+    def columns(self) -> dict:
+        """열 이름 → ndarray (numpy가 없으면 array.array)"""
+        if not HAS_NUMPY:
+            return dict(self.data)
+        np = _numpy()
+        return {name: np.frombuffer(column, dtype=column.typecode) for name, column in self.data.items()}
+
+    def to_dict(self) -> dict:
+        columns = {}
+        for name, column in self.data.items():
+            if sys.byteorder == "big":
+                column = array.array(column.typecode, column)
+                column.byteswap()
+            columns[name] = base64.b64encode(column.tobytes()).decode("ascii")
+        return {"sessions": self.sessions, "projects": self.projects, "columns": columns}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MessageTable":
+        table = cls()
+        for name in data["sessions"]:
+            table.session_id(name)
+        for name in data["projects"]:
+            table.project_id(name)
+        for name, encoded in data["columns"].items():
+            column = table.data[name]
+            column.frombytes(base64.b64decode(encoded))
+            if sys.byteorder == "big":
+                column.byteswap()
+        return table
+
+    def save_npz(self, path: Path) -> None:
+        """열과 세션/프로젝트 이름을 .npz로 저장 (numpy 필요)"""
+        np = _numpy()
+        arrays = {
+            name: np.frombuffer(column, dtype=column.typecode).astype(self.DTYPES[column.typecode], copy=False)
+            for name, column in self.data.items()
+        }
+        np.savez_compressed(path, **arrays, sessions=np.array(self.sessions, dtype=str), projects=np.array(self.projects, dtype=str))
+
+    @classmethod
+    def load_npz(cls, path: Path) -> "MessageTable":
+        """save_npz()로 저장한 테이블 로드 (JSON을 다시 읽지 않고 이후 분석에 사용)"""
+        np = _numpy()
+        table = cls()
+        with np.load(path) as data:
+            for name in data["sessions"].tolist():
+                table.session_id(name)
+            for name in data["projects"].tolist():
+                table.project_id(name)
+            for name, code in cls.COLUMNS.items():
+                table.data[name].frombytes(np.ascontiguousarray(data[name], dtype=code).tobytes())
+        return table
+
+
+def _lower_percentiles(sorted_values, fractions: Iterable[float]) -> list:
+    n = len(sorted_values)
+    return [sorted_values[int(q * (n - 1))] for q in fractions]
+
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def table_stats(table: MessageTable) -> dict:
+    """메시지 테이블 통계: 시간대/요일 분포(UTC), 길이 평균·분위수, 질문 비율, 세션별 메시지 수·활동 시간
+
+    numpy가 있으면 bincount/정렬 기반 벡터 연산으로, 없으면 배열을 한 번씩 순회해 계산합니다.
+    분위수는 정렬한 값에서 (n-1)·q번째 값입니다.
+    """
+    n = len(table)
+    if not n:
+        return {"messages": 0}
+    cols = table.columns()
+    if HAS_NUMPY:
+        np = _numpy()
+        ts, lengths, question, session = cols["ts"], cols["length"], cols["question"], cols["session"]
+        timed = ts[ts > 0]
+        hours = np.bincount(timed // 3600 % 24, minlength=24).tolist()
+        # 1970-01-01은 목요일 (월요일 = 0)
+        weekdays = np.bincount((timed // 86400 + 3) % 7, minlength=7).tolist()
+        total_length = int(lengths.sum(dtype=np.int64))
+        questions = int(np.count_nonzero(question))
+        length_pcts = np.sort(lengths)[[int(q * (n - 1)) for q in PERCENTILES]].tolist()
+        per_session = np.bincount(session).tolist()
+        # 세션별 첫/마지막 메시지 시각: (세션, 시각) 순으로 정렬해 구간 경계만 비교
+        has_ts = ts > 0
+        order = np.lexsort((ts[has_ts], session[has_ts]))
+        s, t = session[has_ts][order], ts[has_ts][order]
+        if len(s):
+            starts = np.flatnonzero(np.r_[True, s[1:] != s[:-1]])
+            ends = np.r_[starts[1:], len(s)] - 1
+            spans = np.sort((t[ends] - t[starts]) / 60).tolist()
+        else:
+            spans = []
+    else:
+        hours, weekdays = [0] * 24, [0] * 7
+        first: dict[int, int] = {}
+        last: dict[int, int] = {}
+        for t, s in zip(cols["ts"], cols["session"]):
+            if t > 0:
+                hours[t // 3600 % 24] += 1
+                weekdays[(t // 86400 + 3) % 7] += 1
+                if s not in first or t < first[s]:
+                    first[s] = t
+                if s not in last or t > last[s]:
+                    last[s] = t
+        total_length = sum(cols["length"])
+        questions = sum(cols["question"])
+        length_pcts = _lower_percentiles(sorted(cols["length"]), PERCENTILES)
+        counts = Counter(cols["session"])
+        per_session = [counts[i] for i in range(max(counts) + 1)]
+        spans = sorted((last[s] - first[s]) / 60 for s in first)
+
+    per_session = [c for c in per_session if c]
+    result = {
+        "messages": n,
+        "hours": {h: c for h, c in enumerate(hours) if c},
+        "weekdays": {WEEKDAYS[d]: c for d, c in enumerate(weekdays) if c},
+        "avg_length": round(total_length / n),
+        "length_percentiles": {f"p{round(q * 100)}": v for q, v in zip(PERCENTILES, length_pcts)},
+        "question_ratio": round(questions / n * 100, 1),
+        "sessions": len(per_session),
+        "avg_messages_per_session": round(n / len(per_session), 1),
+    }
+    if spans:
+        p50, p90, _ = _lower_percentiles(spans, PERCENTILES)
+        result["session_minutes"] = {
+            "avg": round(sum(spans) / len(spans), 1),
+            "p50": round(p50, 1),
+            "p90": round(p90, 1),
+            "max": round(spans[-1], 1),
+        }
+    return result
+
+
+class MessageTableAnalyzer(Analyzer):
+    """사용자 메시지 열 지향 테이블 (--table로 등록)
+
+    메시지마다 (시각, 길이, 질문 여부, 세션, 프로젝트) 한 행을 쌓고,
+    결과는 table_stats()로 한꺼번에 계산합니다. 세션/프로젝트는 scan_session_file()이
+    보내는 "source" 이벤트(프로젝트 디렉토리, 세션 파일 이름)로 정합니다.
+    """
+
+    name = "table"
+    kinds = ("source", "message", "text")
+
+    def __init__(self):
+        self.table = MessageTable()
+        self._ts = 0
+        self._session = self._project = -1
+
+    def consume(self, kind: str, value: Any) -> None:
+        if kind == "message":
+            # 타임스탬프가 없는 엔트리는 직전 엔트리의 시각을 씀
+            self._ts = _epoch_seconds(value.get("timestamp")) or self._ts
+        elif kind == "text":
+            if self._session < 0:
+                self.consume("source", ("", ""))
+            question = "?" in value or "?" in value
+            self.table.append(self._ts, len(value), question, self._session, self._project)
+        else:
+            project, session = value
+            self._project = self.table.project_id(project)
+            self._session = self.table.session_id(session)
+
+    def merge(self, other: "MessageTableAnalyzer") -> None:
+        self.table.extend(other.table)
+
+    def to_dict(self) -> dict:
+        return self.table.to_dict() if len(self.table) else {}
+
+    def load(self, data: dict) -> None:
+        self.table.extend(MessageTable.from_dict(data))
+
+    def finalize(self, options: dict) -> dict:
+        return table_stats(self.table)
+
+
+def enable_table() -> None:
+    """메시지 테이블 분석기 등록 (이후 생성하는 ProfilePartial부터 포함)"""
+    register_analyzer(MessageTableAnalyzer)
+
+
+def _runtime_analyzers() -> dict[str, Any]:
+    """실행 중에 켠 선택적 분석기 이름 → 설정 (워커 전달과 부분 프로필 병합에 사용)"""
+    enabled = {}
+    if "sketch" in ANALYZERS:
+        enabled["sketch"] = SketchAnalyzer.memory_kb
+    if "table" in ANALYZERS:
+        enabled["table"] = None
+    if "tool_calls" in ANALYZERS:
+        enabled["usage"] = None
+    return enabled
+
+
+def _enable_analyzers(enabled: dict[str, Any]) -> None:
+    """_runtime_analyzers() 결과대로 선택적 분석기 등록 (이미 켠 분석기는 그대로)"""
+    if "sketch" in enabled and "sketch" not in ANALYZERS:
+        enable_sketch(enabled["sketch"])
+    if "table" in enabled:
+        enable_table()
+    if "usage" in enabled:
+        enable_usage()
+
+
+class ProfilePartial:
+    """등록된 모든 분석기의 부분 상태 묶음
+
+    세션 파일 하나, 워커 하나, 혹은 전체 실행의 집계를 담으며 원문 메시지 없이
+    누적 상태만 가지므로 캐시에 저장하거나 다른 부분 집계와 병합할 수 있습니다.
+    이벤트는 kinds에 해당 종류를 선언한 분석기에게만 전달됩니다.
+    """
+
+    KEYWORD_SOURCES = ("text", "file")
+
+    def __init__(self):
+        self.analyzers = {name: cls() for name, cls in ANALYZERS.items()}
+        self._routes: dict[str, list[Analyzer]] = defaultdict(list)
+        for analyzer in self.analyzers.values():
+            for kind in analyzer.kinds:
+                self._routes[kind].append(analyzer)
+        # 스냅샷은 추적 중인 파일 전체를 매번 다시 기록하므로 한 번씩만 반영
+        self._seen_files: set[str] = set()
+        # --stats일 때만 키워드 매칭 시간을 잼 (None이면 측정 안 함)
+        self.match_seconds: float | None = None
+
+    def consume(self, kind: str, value: Any) -> None:
+        if kind == "file":
+            if value in self._seen_files:
+                return
+            self._seen_files.add(value)
+
+        for analyzer in self._routes.get(kind, ()):
+            analyzer.consume(kind, value)
+
+        # 키워드 매칭은 텍스트마다 한 번만 수행하여 여러 분석기가 공유
+        if kind in self.KEYWORD_SOURCES and "keywords" in self._routes:
+            if self.match_seconds is None:
+                event = (kind, match_keywords(value))
+            else:
+                started = time.perf_counter()
+                event = (kind, match_keywords(value))
+                self.match_seconds += time.perf_counter() - started
+            for analyzer in self._routes["keywords"]:
+                analyzer.consume("keywords", event)
+
+    def merge(self, other: "ProfilePartial") -> None:
+        for name, analyzer in self.analyzers.items():
+            if name in other.analyzers:
+                analyzer.merge(other.analyzers[name])
+
+    def to_dict(self) -> dict:
+        states = {name: a.to_dict() for name, a in self.analyzers.items()}
+        return {name: state for name, state in states.items() if state}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ProfilePartial":
+        partial = cls()
+        for name, state in data.items():
+            if name in partial.analyzers:
+                partial.analyzers[name].load(state)
+        return partial
+
+    def finalize(self, options: dict | None = None) -> dict[str, Any]:
+        """분석기 이름 → 최종 결과"""
+        options = options or {}
+        return {name: a.finalize(options) for name, a in self.analyzers.items()}
+
+
+def scan_session_file(
+    jsonl_path: Path,
+    offset: int = 0,
+    partial: ProfilePartial | None = None,
+    stats: DecodeStats | None = None,
+    window: TimeWindow | None = None,
+    drop: set[int] | None = None,
+) -> tuple[ProfilePartial, int]:
+    """세션 파일을 offset부터 분석하여 (부분 집계, 다음 offset) 반환
+
+    window가 주어지면 기간 안의 엔트리만 분석하고, drop에 키가 있는 엔트리는
+    이미 센 것으로 보고 건너뜁니다 (SessionReader 참고).
+    """
+    partial = partial or ProfilePartial()
+    partial.consume("source", (jsonl_path.parent.name, session_stem(jsonl_path)))
+    reader = SessionReader(jsonl_path, offset, routed_types(), stats, window, drop=drop)
+    for kind, value in route_entries(reader):
+        partial.consume(kind, value)
+    if reader.duplicates:
+        partial.consume("duplicates", reader.duplicates)
+    return partial, reader.offset
+
+
+def analyze_tech_stack(
+    texts: Iterable[str], files: Iterable[str], occurrences: bool = False
+) -> dict[str, Counter]:
+    """기술 스택 분석"""
+    analyzer = TechStackAnalyzer()
+    for source, items in (("text", texts), ("file", files)):
+        for item in items:
+            analyzer.consume("keywords", (source, match_keywords(item)))
+    return analyzer.finalize({"count_occurrences": occurrences})
+
+
+def analyze_task_types(texts: Iterable[str], occurrences: bool = False) -> Counter:
+    """작업 유형 분석"""
+    analyzer = TaskTypeAnalyzer()
+    for text in texts:
+        analyzer.consume("keywords", ("text", match_keywords(text)))
+    return analyzer.finalize({"count_occurrences": occurrences})
+
+
+def analyze_working_hours(sessions: Iterable[dict]) -> dict:
+    """작업 시간대 분석"""
+    analyzer = WorkingHoursAnalyzer()
+    for session in sessions:
+        analyzer.consume("session", session)
+    return analyzer.finalize({})
+
+
+def calculate_metrics(sessions: Iterable[dict], all_user_messages: Iterable[str]) -> dict:
+    """주요 메트릭 계산"""
+    analyzer = MetricsAnalyzer()
+    for session in sessions:
+        analyzer.consume("session", session)
+    for text in all_user_messages:
+        analyzer.consume("text", text)
+    return analyzer.finalize({})
+
+
+CACHE_VERSION = 6
+DEFAULT_CACHE_PATH = Path.home() / ".claude" / "developer-profile-cache.json"
+
+
+def _analyzer_signature() -> list:
+    """캐시된 부분 집계가 지금 등록된 분석기 구성과 맞는지 확인하기 위한 값"""
+    signature = list(ANALYZERS)
+    if "sketch" in ANALYZERS:
+        signature.append(SketchAnalyzer.memory_kb)
+    return signature
+
+
+def load_cache(cache_path: Path) -> dict[str, dict]:
+    """세션 체크포인트 캐시 로드 (없거나 버전·분석기 구성이 다르면 빈 캐시)"""
+    try:
+        with open(cache_path) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != CACHE_VERSION or data.get("analyzers") != _analyzer_signature():
+        return {}
+    return data.get("sessions", {})
+
+
+def save_cache(cache_path: Path, sessions: dict[str, dict]) -> None:
+    """세션 체크포인트 캐시 저장 (임시 파일 후 교체)"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {"version": CACHE_VERSION, "analyzers": _analyzer_signature(), "sessions": sessions},
+            f, ensure_ascii=False,
+        )
+    os.replace(tmp_path, cache_path)
+
+
+def _file_head(jsonl_path: Path, size: int = 1024) -> str:
+    """파일 앞부분 지문 (재작성 여부 판별용)"""
+    with open(jsonl_path, "rb") as f:
+        return hashlib.sha1(f.read(size)).hexdigest()
+
+
+def _cache_unchanged(entry: dict, jsonl_path: Path) -> bool:
+    """캐시 항목을 만든 뒤로 파일 크기와 mtime이 그대로인지"""
+    try:
+        stat = jsonl_path.stat()
+    except OSError:
+        return False
+    return entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns
+
+
+def _pack_keys(keys: array.array) -> str:
+    return base64.b64encode(keys.tobytes()).decode("ascii")
+
+
+def _unpack_keys(encoded: str) -> array.array:
+    keys = array.array("Q")
+    keys.frombytes(base64.b64decode(encoded))
+    return keys
+
+
+def _plan_dedup(
+    jsonl_path: Path,
+    seen_keys: set[int],
+    entry: dict | None,
+    resume: int | None,
+    unchanged: bool,
+    types: tuple[str, ...],
+) -> tuple[set[int], array.array, int | None, int, int]:
+    """세션 파일의 엔트리 키를 이미 본 키와 비교해 중복 판정을 정하고 seen_keys에 추가
+
+    → (건너뛸 키 집합, 파일의 모든 키, 이어서 분석할 offset, 분석을 시작할 offset, 읽지 않고 건너뛴 엔트리 수)
+    캐시 항목(entry)의 부분 집계는 resume까지의 집계이며, 그때의 중복 판정이 지금과
+    다르면 이어서 분석하지 않습니다 (resume → None). 처음부터 분석할 때 앞부분이 모두
+    이미 본 엔트리면 (이어하기/포크한 세션) 그 부분은 읽지 않고 건너뜁니다.
+    """
+    ends = None
+    if resume is not None and "keys" in entry:
+        keys = _unpack_keys(entry["keys"])
+        old = len(keys)
+        if not unchanged:
+            keys.extend(scan_message_keys(jsonl_path, resume, types)[0])
+    else:
+        keys, ends, _ = scan_message_keys(jsonl_path, 0, types)
+        old = bisect.bisect_right(ends, resume) if resume is not None else 0
+
+    drop = {key for key in keys if key in seen_keys}
+    seen_keys.update(keys)
+    if resume is not None and _drop_digest(key for key in keys[:old] if key in drop) != entry.get("drop", ""):
+        resume = None
+
+    start, prefix = resume or 0, 0
+    if resume is None and ends is not None:
+        prefix = next((i for i, key in enumerate(keys) if key not in drop), len(keys))
+        start = ends[prefix - 1] if prefix else 0
+    return drop, keys, resume, start, prefix
+
+
+def _process_pool(jobs: int) -> "ProcessPoolExecutor":
+    """분석 워커 풀 (--sketch/--table처럼 실행 중에 등록한 분석기도 워커에 전달)
+
+    spawn 방식 워커는 모듈을 새로 import하므로 initializer에서 다시 등록합니다.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_enable_analyzers, initargs=(_runtime_analyzers(),))
+
+
+def _scan_job(
+    job: tuple[str, int, dict | None, list[str], bool, TimeWindow | None, set[int] | None, int],
+) -> tuple[dict, int, list[str], dict | None]:
+    """프로세스 풀 작업 단위: 세션 파일 하나를 분석해 직렬화된 부분 집계 반환
+
+    → (부분 집계, 다음 offset, 반영한 스냅샷 파일 목록, 통계)
+    이어서 분석할 때 이미 반영한 스냅샷 파일을 다시 세지 않도록 seen 목록을 주고받습니다.
+    with_stats가 참이면 디코딩/키워드 매칭/전체 시간 통계도 함께 반환합니다.
+    drop과 skipped는 중복 판정 결과입니다 (skipped는 offset 앞에서 건너뛴 중복 엔트리 수).
+    """
+    path, offset, state, seen, with_stats, window, drop, skipped = job
+    partial = ProfilePartial.from_dict(state) if state else ProfilePartial()
+    partial._seen_files.update(seen)
+    if skipped:
+        partial.consume("duplicates", skipped)
+    if not with_stats:
+        partial, offset = scan_session_file(Path(path), offset, partial, None, window, drop)
+        return partial.to_dict(), offset, sorted(partial._seen_files), None
+
+    decode = DecodeStats()
+    partial.match_seconds = 0.0
+    wall, cpu = time.perf_counter(), time.process_time()
+    partial, offset = scan_session_file(Path(path), offset, partial, decode, window, drop)
+    job_stats = {
+        "decode": decode.to_dict(),
+        "match": partial.match_seconds,
+        "seconds": time.perf_counter() - wall,
+        "cpu": time.process_time() - cpu,
+    }
+    return partial.to_dict(), offset, sorted(partial._seen_files), job_stats
+
+
+def _family_keys(jsonl_path: Path, cache: dict[str, dict] | None, types: tuple[str, ...]) -> array.array:
+    """묶음의 첫 파일처럼 중복 판정 없이 분석한 파일의 엔트리 키 (캐시에 있으면 재사용)
+
+    다음 파일이 같은 첫 엔트리로 시작해 묶음이 드러난 뒤에야 읽으며,
+    캐시 항목이 지금 파일과 같으면 키를 저장해 다음 실행에서는 파일을 읽지 않습니다.
+    """
+    entry = cache.get(str(jsonl_path)) if cache is not None else None
+    unchanged = bool(entry) and _cache_unchanged(entry, jsonl_path)
+    if unchanged and "keys" in entry:
+        return _unpack_keys(entry["keys"])
+    keys, _, offset = scan_message_keys(jsonl_path, 0, types)
+    if unchanged and offset == entry["offset"] and not entry.get("drop"):
+        entry["keys"] = _pack_keys(keys)
+    return keys
+
+
+def _plan_session_files(
+    paths: Iterable[Path],
+    cache: dict[str, dict] | None,
+    stats: RunStats | None,
+    windows: dict[str, TimeWindow] | None,
+    dedup: bool,
+) -> Iterator[tuple[Path, ProfilePartial | None, dict | None, tuple | None]]:
+    """iter_session_partials()의 파일별 계획 (경로, 캐시된 부분 집계 | None, 캐시 메타데이터, 작업)
+
+    요청받은 만큼만 계획하도록 파일마다 하나씩 생성합니다.
+    """
+    with_stats = stats is not None
+    types = routed_types()
+    # 첫 엔트리 키 → 그 키로 시작하는 파일들에서 지금까지 본 키 (둘째 파일이 나오면 만듦)
+    families: dict[int, set[int]] = {}
+    # 첫 엔트리 키 → 그 키로 시작하는 첫 파일 (묶음이 드러나면 키를 읽음)
+    first_paths: dict[int, Path] = {}
+
+    for jsonl_path in paths:
+        key = str(jsonl_path)
+        window = windows.get(key) if windows else None
+        head_key, seen_keys = None, None
+        if dedup:
+            with _stage(stats, "dedup"):
+                entry = cache.get(key) if cache is not None else None
+                if entry and "head_key" in entry and _cache_unchanged(entry, jsonl_path):
+                    head_key = entry["head_key"]
+                else:
+                    head_key = read_head_key(jsonl_path, types)
+                if head_key is not None:
+                    seen_keys = families.get(head_key)
+                    if seen_keys is None and head_key in first_paths:
+                        seen_keys = families[head_key] = set(_family_keys(first_paths.pop(head_key), cache, types))
+                    elif seen_keys is None:
+                        first_paths[head_key] = jsonl_path
+
+        if cache is None or window is not None:
+            drop, start, skipped = None, 0, 0
+            if seen_keys is not None:
+                with _stage(stats, "dedup"):
+                    drop, _, _, start, skipped = _plan_dedup(jsonl_path, seen_keys, None, None, False, types)
+            yield jsonl_path, None, None, (key, start, None, [], with_stats, window, drop or None, skipped)
+            continue
+
+        try:
+            stat = jsonl_path.stat()
+        except OSError:
+            # 캐시 없이 실행할 때와 같이 빈 집계를 내보내 입력 순서를 유지
+            cache.pop(key, None)
+            yield jsonl_path, ProfilePartial(), None, None
+            continue
+
+        entry = cache.get(key)
+        unchanged = bool(entry) and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns
+        if unchanged and head_key is not None:
+            entry["head_key"] = head_key
+        head = None
+        resume = None  # 캐시된 집계를 이어 쓸 수 있으면 그 offset
+        if unchanged:
+            resume = entry["offset"]
+        else:
+            head = _file_head(jsonl_path)
+            # 압축 파일의 offset은 풀린 바이트 기준이라 크기와 비교할 수 없으므로 항상 처음부터
+            if entry and _compression(jsonl_path) is None and stat.st_size >= entry["offset"] and entry["head"] == head:
+                resume = entry["offset"]
+
+        drop, keys, start, skipped = None, None, resume or 0, 0
+        if seen_keys is not None:
+            with _stage(stats, "dedup"):
+                drop, keys, resume, start, skipped = _plan_dedup(jsonl_path, seen_keys, entry, resume, unchanged, types)
+        elif entry and entry.get("drop"):
+            # 중복을 건너뛰고 만든 집계는 중복 제거 없이 실행할 때 쓰지 않음
+            resume, start = None, 0
+
+        if unchanged and resume is not None:
+            if keys is not None:
+                entry["keys"] = _pack_keys(keys)
+            cached = ProfilePartial.from_dict(entry["partial"])
+            cached._seen_files.update(entry["seen"])
+            yield jsonl_path, cached, None, None
+            continue
+
+        state, seen = (entry["partial"], entry["seen"]) if resume is not None else (None, [])
+        meta = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "head": head or _file_head(jsonl_path)}
+        if head_key is not None:
+            meta["head_key"] = head_key
+        if keys is not None:
+            meta.update(keys=_pack_keys(keys), drop=_drop_digest(drop))
+        yield jsonl_path, None, meta, (key, start, state, seen, with_stats, None, drop or None, skipped)
+
+
+def iter_session_partials(
+    paths: Iterable[Path],
+    cache: dict[str, dict] | None = None,
+    jobs: int = 1,
+    stats: RunStats | None = None,
+    windows: dict[str, TimeWindow] | None = None,
+    dedup: bool = False,
+) -> Iterator[tuple[Path, ProfilePartial]]:
+    """세션 파일마다 (경로, 부분 집계)를 입력 순서대로 생성
+
+    cache가 주어지면:
+    - 크기와 mtime이 같으면 파일을 열지 않고 캐시된 집계를 사용
+    - 뒤에 줄이 추가된 경우 저장된 offset부터 이어서 분석
+    - 그 밖의 경우(잘림, 재작성) 처음부터 다시 분석
+    - 존재하지 않는 파일은 캐시에서 제거하고 빈 집계를 내보냄
+
+    jobs가 1이면 파일마다 결과를 요청받을 때 계획하고 분석하므로, 중간에 멈추면 남은 파일은
+    열지 않습니다. jobs > 1이면 모든 파일을 먼저 계획한 뒤 분석이 필요한 파일을 프로세스 풀에
+    나눠 맡기고, 워커가 돌려준 부분 집계를 입력 순서대로 내보냅니다. 내보내는 부분 집계는
+    이미 반영한 스냅샷 파일 목록을 가지고 있어 이어서 분석할 수 있습니다.
+    stats가 주어지면 파일별 스캔 통계를 합산합니다.
+    windows에 있는 파일(기간에 일부만 걸친 세션)은 캐시 없이 해당 기간만 분석합니다.
+
+    dedup이 참이면 첫 엔트리가 같은 파일들(원래 세션과 그 세션을 이어하기/포크한 세션)을
+    한 묶음으로 보고, 묶음 안에서 입력 순서대로 각 파일의 엔트리 키를 먼저 훑어 앞선
+    파일에서 이미 본 엔트리는 파싱하지 않고 건너뜁니다 (_plan_dedup() 참고). 파일마다 첫
+    줄만 읽어 묶음을 찾고, 묶음의 둘째 파일이 나왔을 때 첫 파일의 키를 읽으므로 묶음에
+    속하지 않는 대부분의 파일은 첫 줄만 읽습니다. 이미 본 키는 묶음마다 실행이 끝날 때까지 유지합니다.
+    캐시에는 첫 엔트리 키와, 묶음에 속한 파일의 키와 중복 판정의 지문을 함께 저장합니다.
+    """
+    plan = _plan_session_files(paths, cache, stats, windows, dedup)
+    outputs = None
+    executor = None
+    if jobs > 1:
+        plan = list(plan)
+        work = [job for *_, job in plan if job is not None]
+        if len(work) > 1:
+            executor = _process_pool(jobs)
+            outputs = executor.map(_scan_job, work, chunksize=max(1, len(work) // (jobs * 4)))
+
+    try:
+        for jsonl_path, cached, meta, job in plan:
+            if stats is not None:
+                stats.sessions += 1
+            if cached is not None:
+                if stats is not None:
+                    stats.cached += 1
+                yield jsonl_path, cached
+                continue
+
+            state, offset, seen, job_stats = next(outputs) if outputs is not None else _scan_job(job)
+            if meta is not None:
+                cache[job[0]] = {**meta, "offset": offset, "partial": state, "seen": seen}
+            if job_stats:
+                stats.add_file(job[0], job_stats)
+            partial = ProfilePartial.from_dict(state)
+            partial._seen_files.update(seen)
+            yield jsonl_path, partial
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _archive_compression(name: str) -> str | None:
+    if name.endswith((".tar.gz", ".tgz")):
+        return "gz"
+    return "zst" if name.endswith(".tar.zst") else None
+
+
+def scan_archive(
+    archive_path: Path,
+    window: TimeWindow | None = None,
+    stats: DecodeStats | None = None,
+) -> Iterator[tuple[str, dict, ProfilePartial]]:
+    """프로젝트 디렉토리를 묶은 tar 파일을 한 번 순회하며 세션 파일마다 (프로젝트 디렉토리 이름, 세션 항목, 부분 집계) 생성
+
+    묶음 안의 sessions-index.json은 세션 파일보다 뒤에 있을 수 있어 쓰지 않고,
+    --discover로 새로 찾은 세션처럼 첫/마지막 엔트리 시각과 파일에서 센 메시지 수로
+    세션 항목을 만듭니다. 압축된 묶음(.tar.gz/.tgz/.tar.zst)은 백그라운드 스레드에서 풉니다.
+    """
+    import tarfile
+    compression = _archive_compression(archive_path.name)
+    if compression is None:
+        raw = open(archive_path, "rb", buffering=READ_BUFFER_SIZE)
+    else:
+        raw = io.BufferedReader(DecompressedStream(archive_path, compression), READ_BUFFER_SIZE)
+    types = routed_types()
+
+    with raw, tarfile.open(fileobj=raw, mode="r|") as tar:
+        for member in tar:
+            member_path = Path(member.name)
+            if not member.isfile() or member_path.suffix != ".jsonl" or len(member_path.parts) < 2:
+                continue
+            project = member_path.parts[-2]
+            edges: list = [None, None]  # 첫 타임스탬프, 타임스탬프가 있는 마지막 줄
+
+            def tapped(lines: Iterable[bytes]) -> Iterator[bytes]:
+                # read_edge_timestamps()와 같은 기준으로 첫/마지막 시각을 읽으며 기록
+                for line in lines:
+                    if line.endswith(b"\n") and b'"timestamp"' in line:
+                        if edges[0] is None:
+                            edges[0] = _entry_timestamp(line)
+                        edges[1] = line
+                    yield line
+
+            first_inside: list = [None]  # 기간 안의 첫 엔트리 시각
+
+            def noted(entries: Iterable[dict]) -> Iterator[dict]:
+                for entry in entries:
+                    if first_inside[0] is None:
+                        first_inside[0] = _entry_time(entry)
+                    yield entry
+
+            partial = ProfilePartial()
+            partial.consume("source", (project, member_path.stem))
+            reader = SessionReader(member_path, 0, types, stats, window, stream=tapped(tar.extractfile(member)))
+            for kind, value in route_entries(noted(reader) if window is not None else reader):
+                partial.consume(kind, value)
+            session = {
+                "sessionId": member_path.stem,
+                "fullPath": f"{archive_path}/{member.name}",
+                "created": edges[0],
+                "modified": edges[1] and _entry_timestamp(edges[1]),
+                "messageCount": partial.analyzers["metrics"].file_messages,
+            }
+            # 기간 시작에 걸친 세션의 작업 시간대는 기간 안의 첫 엔트리 시각으로 셈
+            if window is not None and first_inside[0] and _starts_before(session, window):
+                session["created"] = first_inside[0]
+            yield project, session, partial
+
+
+def _archive_job(job: tuple[str, TimeWindow | None, bool]) -> tuple[list[tuple[str, dict, dict]], dict | None]:
+    """프로세스 풀 작업 단위: tar 보관 파일 하나 → ([(프로젝트, 세션 항목, 부분 집계)], 통계)"""
+    path, window, with_stats = job
+    decode = DecodeStats() if with_stats else None
+    wall, cpu = time.perf_counter(), time.process_time()
+    sessions = [(project, session, partial.to_dict()) for project, session, partial in scan_archive(Path(path), window, decode)]
+    if not with_stats:
+        return sessions, None
+    return sessions, {
+        "decode": decode.to_dict(),
+        "match": 0.0,
+        "seconds": time.perf_counter() - wall,
+        "cpu": time.process_time() - cpu,
+    }
+
+
+def iter_archive_sessions(
+    archives: Iterable[Path],
+    cache: dict[str, dict] | None = None,
+    jobs: int = 1,
+    stats: RunStats | None = None,
+    window: TimeWindow | None = None,
+) -> Iterator[tuple[Path, list[tuple[str, dict, ProfilePartial]]]]:
+    """tar 보관 파일마다 (경로, [(프로젝트 디렉토리 이름, 세션 항목, 부분 집계)])를 입력 순서대로 생성
+
+    보관 파일은 이어 쓰지 않으므로, cache가 주어지면 크기와 mtime이 같을 때만 저장된
+    집계를 쓰고 아니면 처음부터 분석합니다 (window가 있으면 캐시 없이 기간 안만 분석).
+    jobs > 1이면 보관 파일마다 프로세스 풀의 워커 하나가 분석합니다.
+    """
+    with_stats = stats is not None
+    use_cache = cache is not None and window is None
+    plan = []  # (경로, 캐시된 세션 목록 | None, 캐시 메타데이터)
+    for path in archives:
+        stat = path.stat()
+        meta = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+        entry = cache.get(str(path)) if use_cache else None
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns:
+            plan.append((path, entry["archive"], None))
+        else:
+            plan.append((path, None, meta if use_cache else None))
+
+    work = [(str(path), window, with_stats) for path, cached, _ in plan if cached is None]
+    executor = None
+    if jobs > 1 and len(work) > 1:
+        executor = _process_pool(jobs)
+        outputs = executor.map(_archive_job, work)
+    else:
+        outputs = map(_archive_job, work)
+
+    try:
+        for path, sessions, meta in plan:
+            if sessions is None:
+                sessions, job_stats = next(outputs)
+                if meta is not None:
+                    cache[str(path)] = {**meta, "archive": sessions}
+                if job_stats:
+                    stats.add_file(str(path), job_stats)
+            yield path, [(project, session, ProfilePartial.from_dict(state)) for project, session, state in sessions]
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def collect_session_partials(
+    paths: Iterable[Path],
+    cache: dict[str, dict] | None = None,
+    jobs: int = 1,
+    stats: RunStats | None = None,
+) -> ProfilePartial:
+    """세션 파일들의 부분 집계를 모두 병합하여 반환 (인자는 iter_session_partials() 참고)"""
+    totals = ProfilePartial()
+    for _, partial in iter_session_partials(paths, cache, jobs, stats):
+        totals.merge(partial)
+    return totals
+
+
+def anonymize_project_name(name: str) -> str:
+    """프로젝트 이름 익명화 (실행/머신이 달라도 같은 이름은 같은 값)"""
+    return f"project_{hashlib.sha1(name.encode()).hexdigest()[:8]}"
+
+
+def iter_profile_sessions(
+    root: Path | None = None,
+    anonymize: bool = True,
+    cache_path: Path | None = None,
+    jobs: int = 1,
+    stats: RunStats | None = None,
+    discover: bool = False,
+    discovery: Counter | None = None,
+    window: TimeWindow | None = None,
+    cache: dict[str, dict] | None = None,
+    dedup: bool = True,
+) -> Iterator[tuple[str | None, dict | None, ProfilePartial]]:
+    """root(기본: ~/.claude/projects) 아래 세션마다 (프로젝트 이름, 세션 항목, 부분 집계)를 차례로 생성
+
+    세션 → 메시지 → 추출 → 분석이 모두 스트리밍으로 진행되며, 세션 파일은
+    다음 결과를 요청할 때 분석하므로 소비자가 중간에 멈추면 나머지 파일은 읽지 않습니다
+    (dedup의 묶음 판정도 파일마다 그때 함). jobs > 1이면 모든 파일을 먼저 계획해 워커에
+    맡기고, 중간에 멈추면 남은 작업을 취소합니다. fold_sessions()로 합치면 전체 집계가 됩니다.
+
+    세션 항목이 None이면 세션으로 세지 않는 결과입니다: 세션이 없는 프로젝트,
+    기간 안에 메시지가 없는 세션, 앞선 세션을 다시 기록하기만 한 파일.
+    프로젝트 이름은 프로젝트 수에 셀 프로젝트입니다. 기간이 없으면 모든 프로젝트 디렉토리를 세고,
+    기간이 있으면 기간 안의 세션이 있는 프로젝트만 세도록 세션으로 세지 않는 결과는 None입니다.
+    익명화하면 프로젝트 이름과 메시지 테이블의 프로젝트 이름을 해시로 바꿔 내보냅니다.
+
+    cache_path가 주어지면 세션별 체크포인트를 사용해 바뀐 부분만 다시 분석하고,
+    jobs > 1이면 세션 파일을 프로세스 풀에서 병렬로 분석합니다.
+    stats가 주어지면 단계별 시간과 처리량을 기록합니다.
+    discover가 참이면 인덱스 대신 디렉토리를 직접 탐색해 세션을 찾고
+    (discover_sessions() 참고), 그 결과를 discovery 카운터에 기록합니다.
+
+    window가 주어지면 파일을 열기 전에 인덱스와 mtime으로 기간 밖 세션을 제외하고,
+    기간에 일부만 걸친 세션은 기간 안의 엔트리만 분석합니다 (session_overlap() 참고).
+
+    cache를 직접 주면 파일 대신 그 메모리 캐시를 사용하고 갱신합니다 (상주 모드용).
+    캐시 정리와 저장은 순회를 끝내거나 중간에 멈출 때 합니다.
+
+    root에 있는 tar 보관 파일(.tar/.tar.gz/.tgz/.tar.zst)도 세션 파일 다음에 분석합니다
+    (iter_archive_sessions() 참고).
+
+    dedup이 참이면 여러 인덱스에 실린 같은 세션 파일은 한 번만 분석하고, 이어하기/포크한
+    세션이 다시 기록한 엔트리는 처음 나온 세션에서만 셉니다 (tar 보관 파일은 제외).
+    엔트리가 모두 중복인 파일은 세션으로 세지 않고, 일부가 중복이면 메시지 수를 파일에서
+    센 값으로 바꿉니다.
+    """
+    root = root or CLAUDE_PROJECTS_DIR
+    if cache is None and cache_path:
+        with _stage(stats, "cache_load"):
+            cache = load_cache(cache_path)
+    sessions = []  # (프로젝트 이름, 세션 항목)
+    empty_projects = []
+    seen_paths = set()
+    windows: dict[str, TimeWindow] = {}
+    archives = []
+
+    # 모든 프로젝트 순회 (인덱스만 읽으므로 먼저 끝냄)
+    with _stage(stats, "walk"):
+        for project_dir in sorted(root.iterdir()):
+            if not project_dir.is_dir():
+                if _is_archive(project_dir.name) and project_dir.is_file():
+                    if _archive_compression(project_dir.name) == "zst" and not HAS_ZSTD:
+                        _warn_no_zstd()
+                    else:
+                        archives.append(project_dir)
+                continue
+
+            project_sessions = load_sessions_index(project_dir)
+            if discover:
+                project_sessions = discover_sessions(project_dir, project_sessions, discovery)
+
+            # 프로젝트 이름 추출 (익명화 시 해시)
+            project_name = project_dir.name
+            if anonymize:
+                project_name = anonymize_project_name(project_name)
+
+            count = len(sessions)
+            for session in project_sessions:
+                full_path = str(Path(session.get("fullPath", "")))
+                if dedup and full_path in seen_paths:
+                    continue
+                seen_paths.add(full_path)
+                if window is not None:
+                    overlap = session_overlap(session, window)
+                    if overlap == "outside":
+                        continue
+                    if overlap == "partial":
+                        # 인덱스의 메시지 수는 세션 전체 기준이므로 기간 안에서 다시 셈
+                        windows[full_path] = window
+                        session = {**session, "messageCount": None}
+                sessions.append((project_name, session))
+            if len(sessions) == count:
+                empty_projects.append(project_name)
+
+    if window is not None and stats is not None:
+        stats.extra["window"] = {
+            **window.to_dict(),
+            "sessions": len(seen_paths),
+            "pruned": len(seen_paths) - len(sessions),
+            "partial": len(windows),
+        }
+
+    def anonymized(partial: ProfilePartial) -> ProfilePartial:
+        # 메시지 테이블은 파일 위치의 디렉토리 이름을 쓰므로 따로 익명화
+        if anonymize and "table" in partial.analyzers:
+            partial.analyzers["table"].table.rename_projects(anonymize_project_name)
+        return partial
+
+    try:
+        if window is None:
+            for project_name in empty_projects:
+                yield project_name, None, ProfilePartial()
+
+        # 세션별 메시지를 스트리밍으로 분석
+        # 중간에 멈추면 워커에 맡긴 작업도 바로 취소되도록 하위 생성기를 명시적으로 닫음
+        session_paths = [Path(s.get("fullPath", "")) for _, s in sessions]
+        partials = iter_session_partials(session_paths, cache, jobs, stats, windows, dedup)
+        with _stage(stats, "scan"), contextlib.closing(partials):
+            for (project_name, session), (path, partial) in zip(sessions, partials):
+                metrics = partial.analyzers["metrics"]
+                file_messages = metrics.file_messages
+                # 기간에 일부만 걸친 세션은 기간 안에 메시지가 있을 때만 세션으로 셈
+                # (mtime만으로는 기간 안의 활동 여부를 알 수 없음)
+                # 앞선 세션을 다시 기록하기만 한 파일도 세션으로 세지 않음
+                if (str(path) in windows or metrics.duplicate_entries) and not file_messages:
+                    session = None
+                # 인덱스에 메시지 수가 없거나 낡은 세션, 중복을 건너뛴 세션은 실제로 센 값 사용
+                elif session.get("messageCount") is None or metrics.duplicate_entries:
+                    session = {**session, "messageCount": file_messages}
+                if session is None and window is not None:
+                    project_name = None
+                # 작업 시간대는 세션 생성 시각으로 세므로, 기간 시작에 걸친 세션은 기간 안의 첫 엔트리 시각을 씀
+                if session is not None and str(path) in windows and _starts_before(session, window):
+                    session = {**session, "created": first_entry_time(path, window) or session.get("created")}
+                yield project_name, session, anonymized(partial)
+
+        # 프로젝트 디렉토리를 묶은 tar 보관 파일 (세션 항목은 파일 내용으로 만듦)
+        if archives:
+            archived_sessions = iter_archive_sessions(archives, cache, jobs, stats, window)
+            with _stage(stats, "archives"), contextlib.closing(archived_sessions):
+                for _, archived in archived_sessions:
+                    for project, session, partial in archived:
+                        # 기간이 주어지면 기간 안에 메시지가 있는 세션만 셈
+                        if window is not None and not session["messageCount"]:
+                            yield None, None, anonymized(partial)
+                            continue
+                        yield anonymize_project_name(project) if anonymize else project, session, anonymized(partial)
+    finally:
+        if cache is not None:
+            # 더 이상 인덱스에 없는 세션은 캐시에서 제거 (기간 밖 세션은 유지)
+            seen_paths.update(str(archive) for archive in archives)
+            for key in [k for k in cache if k not in seen_paths]:
+                del cache[key]
+            if cache_path:
+                with _stage(stats, "cache_save"):
+                    save_cache(cache_path, cache)
+
+
+def fold_sessions(results: Iterable[tuple[str | None, dict | None, ProfilePartial]]) -> ProfilePartial:
+    """iter_profile_sessions()의 결과를 하나의 부분 집계로 합침"""
+    totals = ProfilePartial()
+    for project_name, session, partial in results:
+        if project_name is not None:
+            totals.consume("project", project_name)
+        if session is not None:
+            totals.consume("session", session)
+        totals.merge(partial)
+    return totals
+
+
+def finalize_profile(
+    totals: ProfilePartial,
+    anonymize: bool = True,
+    window: TimeWindow | None = None,
+    count_occurrences: bool = False,
+) -> dict[str, Any]:
+    """부분 집계를 최종 프로필로 변환 (count_occurrences는 generate_profile() 참고)"""
+    results = totals.finalize({"count_occurrences": count_occurrences})
+    return build_profile(results, anonymize, window)
+
+
+def collect_profile_partial(
+    anonymize: bool = True,
+    cache_path: Path | None = None,
+    jobs: int = 1,
+    stats: RunStats | None = None,
+    discover: bool = False,
+    discovery: Counter | None = None,
+    window: TimeWindow | None = None,
+    cache: dict[str, dict] | None = None,
+    dedup: bool = True,
+    root: Path | None = None,
+) -> ProfilePartial:
+    """모든 프로젝트를 스캔하여 전체 부분 집계 생성 (인자는 iter_profile_sessions() 참고)"""
+    return fold_sessions(iter_profile_sessions(
+        root, anonymize, cache_path, jobs, stats, discover, discovery, window, cache, dedup
+    ))
+
+
+def generate_profile(
+    anonymize: bool = True,
+    cache_path: Path | None = None,
+    jobs: int = 1,
+    count_occurrences: bool = False,
+    stats: RunStats | None = None,
+    discover: bool = False,
+    window: TimeWindow | None = None,
+    store_path: Path | None = None,
+    ingest: bool = True,
+    projects: list[str] | None = None,
+    dedup: bool = True,
+    root: Path | None = None,
+) -> dict[str, Any]:
+    """개발자 프로필 생성
+
+    count_occurrences가 참이면 기술/작업 키워드를 "등장 여부" 대신
+    실제 등장 횟수로 집계합니다. 나머지 인자는 collect_profile_partial() 참고.
+
+    store_path가 주어지면 SQLite 저장소를 (ingest가 참이면) 갱신한 뒤
+    window와 projects로 저장소에서 바로 집계합니다 (ProfileStore 참고).
+    """
+    if store_path is not None:
+        with ProfileStore(store_path) as store:
+            if ingest:
+                with _stage(stats, "ingest"):
+                    store.ingest(jobs, discover, root=root, dedup=dedup)
+            with _stage(stats, "query"):
+                totals = store.query(window, projects, anonymize)
+    else:
+        totals = collect_profile_partial(anonymize, cache_path, jobs, stats, discover, window=window, dedup=dedup, root=root)
+    with _stage(stats, "finalize"):
+        return finalize_profile(totals, anonymize, window, count_occurrences)
+
+
+PARTIAL_FORMAT = "developer-profile-partial"
+PARTIAL_VERSION = 1
+
+
+def _partial_analyzers(partial: ProfilePartial) -> dict[str, Any]:
+    """부분 집계가 가진 선택적 분석기 이름 → 설정 (_runtime_analyzers()와 같은 형식)"""
+    enabled = {}
+    if "sketch" in partial.analyzers:
+        enabled["sketch"] = partial.analyzers["sketch"].memory_kb
+    if "table" in partial.analyzers:
+        enabled["table"] = None
+    if "tool_calls" in partial.analyzers:
+        enabled["usage"] = None
+    return enabled
+
+
+def save_partial_profile(path: Path, partial: ProfilePartial, anonymize: bool = True) -> None:
+    """부분 프로필 파일 저장
+
+    top-N 자르기나 평균 계산 전의 원시 카운터/합계/개수만 담고 있어
+    여러 머신에서 수집한 파일을 `merge`로 정확히 합칠 수 있습니다.
+    원문 대화는 포함되지 않습니다.
+    """
+    data = {
+        "format": PARTIAL_FORMAT,
+        "version": PARTIAL_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "anonymized": anonymize,
+        # 비어 있는 스케치/테이블은 partial에 남지 않으므로 켠 분석기를 따로 기록
+        "analyzers": _partial_analyzers(partial),
+        "partial": partial.to_dict(),
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _read_partial_file(path: Path) -> tuple[dict, dict[str, Any]]:
+    """부분 프로필 파일 읽기 → (파일 내용, 켠 선택적 분석기)"""
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("format") != PARTIAL_FORMAT:
+        raise ValueError(f"부분 프로필 파일이 아닙니다: {path}")
+    if data.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"지원하지 않는 부분 프로필 버전({data.get('version')}): {path}")
+    enabled = data.get("analyzers")
+    if enabled is None:
+        # analyzers 기록이 없는 이전 파일은 담긴 상태로 판단
+        enabled = {name: state.get("memory_kb") for name, state in data["partial"].items() if name in ("sketch", "table")}
+        if any(cls.name in data["partial"] for cls in USAGE_ANALYZERS):
+            enabled["usage"] = None
+    return data, enabled
+
+
+def load_partial_profile(path: Path) -> tuple[ProfilePartial, bool]:
+    """부분 프로필 파일 로드 → (부분 집계, 익명화 여부)"""
+    data, enabled = _read_partial_file(path)
+    # --sketch/--table/--usage로 만든 부분 프로필은 같은 설정으로 해당 분석기를 켜고 병합
+    _enable_analyzers(enabled)
+    return ProfilePartial.from_dict(data["partial"]), data.get("anonymized", True)
+
+
+def merge_partial_profiles(paths: Iterable[Path]) -> tuple[ProfilePartial, bool]:
+    """부분 프로필 파일들을 병합 → (부분 집계, 모두 익명화되었는지)
+
+    병합 결과는 파일 순서와 무관합니다. 켠 선택적 분석기(--sketch/--table/--usage)나 스케치
+    메모리 상한이 파일마다 다르면 일부 파일만 반영한 값이 되므로 ValueError를 냅니다.
+    """
+    shards = [(path, *_read_partial_file(path)) for path in paths]
+    if not shards:
+        return ProfilePartial(), True
+    first_path, _, enabled = shards[0]
+    for path, _, other in shards[1:]:
+        if other != enabled:
+            raise ValueError(
+                f"부분 프로필의 선택적 분석기 설정이 다릅니다: {first_path} {_describe_analyzers(enabled)}, "
+                f"{path} {_describe_analyzers(other)}"
+            )
+    # 모든 파일의 설정을 확인한 뒤 분석기를 켜야 병합 대상이 처음부터 같은 분석기를 가짐
+    _enable_analyzers(enabled)
+    merged = ProfilePartial()
+    for _, data, _ in shards:
+        merged.merge(ProfilePartial.from_dict(data["partial"]))
+    return merged, all(data.get("anonymized", True) for _, data, _ in shards)
+
+
+def _describe_analyzers(enabled: dict[str, Any]) -> str:
+    names = [f"sketch({kb}KB)" if name == "sketch" else name for name, kb in sorted(enabled.items())]
+    return "(" + (", ".join(names) or "없음") + ")"
+
+
+# SQLite 집계 저장소: 세션별·일별 카운터를 저장해 기간/프로젝트 조회를 파일 재분석 없이 처리
+STORE_VERSION = 3
+# 날짜별 첫 엔트리 시각(epoch 초)을 담는 카운터 이름 (더하지 않고 작은 값을 유지)
+FIRST_ENTRY_COUNTER = json.dumps(["first_entry"])
+DEFAULT_STORE_PATH = Path.home() / ".claude" / "developer-profile.sqlite"
+
+
+def _day(ts: datetime) -> str:
+    """UTC 기준 날짜 문자열 (YYYY-MM-DD)"""
+    return ts.astimezone(timezone.utc).date().isoformat()
+
+
+def _flatten_counts(data: dict, prefix: tuple[str, ...] = ()) -> Iterator[tuple[str, int | float]]:
+    """분석기 상태(중첩 dict)의 숫자 leaf를 (JSON 경로, 값)으로 펼침"""
+    for key, value in data.items():
+        path = (*prefix, key)
+        if isinstance(value, dict):
+            yield from _flatten_counts(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield json.dumps(path, ensure_ascii=False), value
+        else:
+            raise ValueError(f"합산할 수 없는 분석기 상태: {'/'.join(path)}")
+
+
+def _unflatten_counts(rows: Iterable[tuple[str, int | float]]) -> dict:
+    """_flatten_counts()의 역변환"""
+    data: dict = {}
+    for name, value in rows:
+        *parents, leaf = json.loads(name)
+        node = data
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+    return data
+
+
+def scan_session_days(
+    jsonl_path: Path,
+    offset: int = 0,
+    seen: set[str] | None = None,
+    default_day: str = "",
+    drop: set[int] | None = None,
+    skipped: int = 0,
+    first_times: dict[str, int] | None = None,
+) -> tuple[dict[str, ProfilePartial], int]:
+    """세션 파일을 offset부터 분석해 (엔트리 날짜별 부분 집계, 다음 offset) 반환
+
+    타임스탬프가 없는 엔트리는 직전 엔트리의 날짜(처음이면 default_day)로 묶습니다.
+    스냅샷 파일 중복 제거가 날짜를 넘어 유지되도록 모든 날짜가 seen 집합을 공유합니다.
+    drop에 키가 있는 엔트리는 건너뛰며, 건너뛴 수는 offset 앞에서 건너뛴 skipped와 함께
+    default_day에 셉니다 (파싱하지 않으므로 날짜를 모름).
+    날짜별 부분 집계의 to_dict()를 저장할 때 쓰도록 날짜마다 첫 엔트리 시각을
+    first_times(날짜 → epoch 초)에 기록합니다.
+    """
+    seen = seen if seen is not None else set()
+    days: dict[str, ProfilePartial] = {}
+    day = default_day
+
+    def day_partial(day: str) -> ProfilePartial:
+        partial = days.get(day)
+        if partial is None:
+            partial = days[day] = ProfilePartial()
+            partial._seen_files = seen
+        return partial
+
+    reader = SessionReader(jsonl_path, offset, routed_types(), drop=drop)
+    for entry in reader:
+        ts = _parse_time(_entry_time(entry))
+        if ts is not None:
+            day = _day(ts)
+            if first_times is not None and day not in first_times:
+                first_times[day] = int(ts.timestamp())
+        partial = day_partial(day)
+        for kind, value in route_entries((entry,)):
+            partial.consume(kind, value)
+    if reader.duplicates + skipped:
+        day_partial(default_day).consume("duplicates", reader.duplicates + skipped)
+    return days, reader.offset
+
+
+def _ingest_job(
+    job: tuple[str, int, list[str], str, set[int] | None, int],
+) -> tuple[dict[str, dict], int, list[str]]:
+    """프로세스 풀 작업 단위: 세션 파일 하나를 날짜별로 분석해 직렬화된 상태 반환"""
+    path, offset, seen, default_day, drop, skipped = job
+    seen_files = set(seen)
+    first_times = {}
+    days, offset = scan_session_days(Path(path), offset, seen_files, default_day, drop, skipped, first_times)
+    states = {day: partial.to_dict() for day, partial in days.items()}
+    for day, first in first_times.items():
+        states[day]["first_entry"] = first
+    return states, offset, sorted(seen_files)
+
+
+class ProfileStore:
+    """세션별·일별(UTC) 부분 집계를 담는 SQLite 저장소
+
+    ingest()는 바뀐 세션 파일만 다시 읽어 카운터를 갱신하고(뒤에 추가된 줄은
+    이어서 분석), query()는 파일을 읽지 않고 기간/프로젝트별 합계만으로
+    ProfilePartial을 만듭니다. 프로젝트 이름은 원래 이름으로 저장하고 조회할 때
+    익명화하므로 익명화 설정을 바꿔도 다시 분석할 필요가 없습니다.
+    원문 대화는 저장하지 않습니다.
+
+    엔트리 이벤트를 받는 분석기의 상태(to_dict)는 숫자 leaf를 더해서 병합할 수
+    있어야 합니다. 세션/프로젝트 이벤트는 조회 시 sessions 테이블에서 다시 만듭니다.
+
+    중복 제거는 스캔(iter_session_partials())과 같은 방식으로, 첫 엔트리가 같은 세션
+    파일 묶음의 엔트리 키와 중복 판정의 지문을 sessions 테이블에 함께 저장합니다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE projects (name TEXT PRIMARY KEY);
+        CREATE TABLE sessions (
+            path TEXT PRIMARY KEY,
+            project TEXT NOT NULL,
+            entry TEXT NOT NULL,            -- 세션 인덱스 엔트리 (JSON)
+            first_day TEXT,
+            last_day TEXT,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            head TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            seen TEXT NOT NULL,             -- 이미 반영한 스냅샷 파일 (JSON 목록)
+            head_key TEXT,                  -- 첫 엔트리의 중복 판별 키 (64비트라 문자열로 저장)
+            keys TEXT,                      -- 묶음에 속한 파일의 엔트리 키 (_pack_keys)
+            drop_digest TEXT NOT NULL       -- 건너뛴 키 집합의 지문 (_drop_digest)
+        );
+        CREATE INDEX sessions_days ON sessions (last_day, first_day);
+        CREATE INDEX sessions_project ON sessions (project);
+        CREATE TABLE counters (
+            path TEXT NOT NULL,
+            project TEXT NOT NULL,
+            day TEXT NOT NULL,
+            name TEXT NOT NULL,             -- 분석기 상태 안의 JSON 경로
+            value NUMERIC NOT NULL,
+            PRIMARY KEY (path, day, name)
+        ) WITHOUT ROWID;
+        CREATE INDEX counters_day ON counters (day, name);
+        CREATE INDEX counters_project ON counters (project, day);
+    """
+
+    def __init__(self, path: Path):
+        import sqlite3
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        # 형식이 바뀐 저장소는 다시 만듦 (원본 대화 기록에서 언제든 재구성 가능)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+            self.db.executescript(
+                "DROP TABLE IF EXISTS projects; DROP TABLE IF EXISTS sessions; DROP TABLE IF EXISTS counters;"
+            )
+            self.db.executescript(self.SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {STORE_VERSION}")
+            self.db.commit()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "ProfileStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def ingest(
+        self,
+        jobs: int = 1,
+        discover: bool = False,
+        discovery: Counter | None = None,
+        root: Path | None = None,
+        dedup: bool = True,
+    ) -> Counter:
+        """root(기본: ~/.claude/projects)의 대화 기록을 스캔해 바뀐 세션만 저장소에 반영
+
+        dedup이 참이면 여러 인덱스에 실린 같은 세션 파일은 처음 실린 프로젝트로 한 번만
+        반영하고, 이어하기/포크한 세션이 다시 기록한 엔트리는 처음 나온 세션에서만 셉니다.
+        중복 판정이 바뀐 세션(묶음에 앞선 파일이 생기거나 사라짐)은 처음부터 다시 분석합니다.
+
+        반환: 세션별 처리 결과 카운터 (new, appended, rescanned, unchanged, missing, removed)
+        """
+        result = Counter()
+        stored = {
+            row[0]: row[1:]
+            for row in self.db.execute(
+                "SELECT path, size, mtime, head, offset, seen, first_day, last_day, head_key, keys, drop_digest "
+                "FROM sessions"
+            )
+        }
+        types = routed_types()
+        projects = []
+        listed = []  # (프로젝트, 인덱스 엔트리, 경로, stat | None, 저장된 행 | None)
+        listed_paths = set()
+        sessions = {}  # 경로 → (프로젝트, 인덱스 엔트리, 파일 정보)
+        work = []
+        reset = []  # 기존 카운터를 지울 세션 (사라졌거나 처음부터 다시 분석)
+
+        for project_dir in sorted((root or CLAUDE_PROJECTS_DIR).iterdir()):
+            if not project_dir.is_dir():
+                continue
+            index = load_sessions_index(project_dir)
+            if discover:
+                index = discover_sessions(project_dir, index, discovery)
+            projects.append(project_dir.name)
+
+            for session in index:
+                key = session.get("fullPath", "")
+                if dedup:
+                    if key in listed_paths:
+                        continue
+                    listed_paths.add(key)
+                try:
+                    stat = Path(key).stat()
+                except OSError:
+                    stat = None
+                listed.append((project_dir.name, session, key, stat, stored.get(key)))
+
+        # 첫 엔트리 키 → 그 키로 시작하는 파일들에서 지금까지 본 키 (둘 이상인 묶음만)
+        head_keys: list[int | None] = [None] * len(listed)
+        families: dict[int, set[int]] = {}
+        remaining = Counter()
+        if dedup:
+            for i, (_, _, key, stat, old) in enumerate(listed):
+                if stat is None:
+                    continue
+                if old and old[:2] == (stat.st_size, stat.st_mtime_ns) and old[7] is not None:
+                    head_keys[i] = int(old[7])
+                else:
+                    head_keys[i] = read_head_key(Path(key), types)
+            remaining.update(head_key for head_key in head_keys if head_key is not None)
+            families = {head_key: set() for head_key, count in remaining.items() if count > 1}
+
+        for (project, session, key, stat, old), head_key in zip(listed, head_keys):
+            seen_keys = families.get(head_key)
+            if head_key is not None:
+                remaining[head_key] -= 1
+                if not remaining[head_key]:
+                    families.pop(head_key, None)
+
+            jsonl_path = Path(key)
+            if stat is None:
+                # 캐시 없는 실행과 같이 세션으로는 세되 집계는 비움
+                sessions[key] = (project, session, (-1, -1, "", 0, "[]", None, None, None, None, ""))
+                if old:
+                    reset.append((key,))
+                result["missing"] += 1
+                continue
+
+            unchanged = bool(old) and old[0] == stat.st_size and old[1] == stat.st_mtime_ns
+            head = None
+            resume = None  # 저장된 카운터를 이어 쓸 수 있으면 그 offset
+            if unchanged:
+                resume = old[3]
+            else:
+                head = _file_head(jsonl_path)
+                if old and _compression(jsonl_path) is None and stat.st_size >= old[3] and old[2] == head:
+                    resume = old[3]
+
+            drop, keys, start, skipped = None, None, resume or 0, 0
+            if seen_keys is not None:
+                entry = {"drop": old[9]} if old else {}
+                if old and old[8] is not None:
+                    entry["keys"] = old[8]
+                drop, keys, resume, start, skipped = _plan_dedup(jsonl_path, seen_keys, entry, resume, unchanged, types)
+            elif old and old[9]:
+                # 중복을 건너뛰고 만든 카운터는 중복 판정이 없어졌으면 쓰지 않음
+                resume, start = None, 0
+            dedup_info = (
+                str(head_key) if head_key is not None else None,
+                _pack_keys(keys) if keys is not None else None,
+                _drop_digest(drop) if keys is not None else "",
+            )
+
+            if unchanged and resume is not None:
+                sessions[key] = (project, session, (*old[:7], *dedup_info))
+                result["unchanged"] += 1
+                continue
+
+            if resume is not None:
+                # 이어서 분석: 기존 활동 기간은 유지
+                offset, seen, days = resume, json.loads(old[4]), old[5:7]
+                result["appended"] += 1
+            else:
+                offset, seen, days = start, [], (None, None)
+                if old:
+                    reset.append((key,))
+                result["rescanned" if old else "new"] += 1
+            created = _parse_time(session.get("created"))
+            default_day = _day(created or datetime.fromtimestamp(stat.st_mtime, timezone.utc))
+            sessions[key] = (
+                project, session,
+                (stat.st_size, stat.st_mtime_ns, head or _file_head(jsonl_path), offset, "[]", *days, *dedup_info),
+            )
+            work.append((key, offset, seen, default_day, drop or None, skipped))
+
+        executor = None
+        if jobs > 1 and len(work) > 1:
+            executor = _process_pool(jobs)
+            outputs = executor.map(_ingest_job, work, chunksize=max(1, len(work) // (jobs * 4)))
+        else:
+            outputs = map(_ingest_job, work)
+
+        upsert = (
+            "INSERT INTO counters VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (path, day, name) DO UPDATE SET value = CASE WHEN name = ? "
+            "THEN MIN(value, excluded.value) ELSE value + excluded.value END"
+        )
+        try:
+            with self.db:
+                removed = [(path,) for path in stored if path not in sessions]
+                result["removed"] = len(removed)
+                for rows in (removed, reset):
+                    self.db.executemany("DELETE FROM counters WHERE path = ?", rows)
+                self.db.executemany("DELETE FROM sessions WHERE path = ?", removed)
+                self.db.execute("DELETE FROM projects")
+                self.db.executemany("INSERT INTO projects VALUES (?)", [(name,) for name in projects])
+
+                scanned = {}
+                for (key, *_), (days, offset, seen) in zip(work, outputs):
+                    project = sessions[key][0]
+                    self.db.executemany(upsert, [
+                        (key, project, day, name, value, FIRST_ENTRY_COUNTER)
+                        for day, state in days.items()
+                        for name, value in _flatten_counts(state)
+                    ])
+                    scanned[key] = (offset, json.dumps(seen, ensure_ascii=False), list(days))
+
+                rows = []
+                for key, (project, session, info) in sessions.items():
+                    size, mtime, head, offset, seen, first_day, last_day, head_key, keys, drop = info
+                    active_days = [d for d in (first_day, last_day) if d]
+                    if key in scanned:
+                        offset, seen, new_days = scanned[key]
+                        active_days += new_days
+                    # 세션의 활동 기간: 인덱스의 created/modified와 실제 엔트리 날짜를 모두 포함
+                    edges = [_parse_time(session.get(k)) for k in ("created", "modified")]
+                    active_days += [_day(ts) for ts in edges if ts is not None]
+                    rows.append((
+                        key, project, json.dumps(session, ensure_ascii=False),
+                        min(active_days, default=None), max(active_days, default=None),
+                        size, mtime, head, offset, seen, head_key, keys, drop,
+                    ))
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return result
+
+    def resolve_projects(self, names: Iterable[str]) -> list[str]:
+        """원래 이름 또는 익명화된 이름을 저장된 프로젝트 이름으로 변환"""
+        wanted = set(names)
+        all_projects = [row[0] for row in self.db.execute("SELECT name FROM projects ORDER BY name")]
+        matched = [p for p in all_projects if p in wanted or anonymize_project_name(p) in wanted]
+        if not matched:
+            raise ValueError(f"저장소에 없는 프로젝트입니다: {', '.join(sorted(wanted))}")
+        return matched
+
+    def query(
+        self,
+        window: TimeWindow | None = None,
+        projects: Iterable[str] | None = None,
+        anonymize: bool = True,
+    ) -> ProfilePartial:
+        """기간(일 단위)과 프로젝트로 저장된 카운터를 합쳐 부분 집계 생성
+
+        기간 안에 있는 세션과, 기간에 일부만 걸치되 기간 안에 메시지가 있는 세션을
+        세며, 후자의 메시지 수는 기간 안의 엔트리로 다시 셉니다
+        (--since/--until 스캔과 같은 기준).
+        """
+        since = _day(window.since) if window and window.since else None
+        until = _day(window.until) if window and window.until else None
+        project_names = self.resolve_projects(projects) if projects is not None else None
+
+        def where(day_column: str) -> tuple[str, list]:
+            clauses, params = [], []
+            if since:
+                clauses.append(f"{day_column} >= ?")
+                params.append(since)
+            if until:
+                clauses.append(f"{day_column} <= ?")
+                params.append(until)
+            if project_names is not None:
+                clauses.append(f"project IN ({', '.join('?' * len(project_names))})")
+                params.extend(project_names)
+            return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+        clause, params = where("day")
+        totals = ProfilePartial.from_dict(_unflatten_counts(
+            self.db.execute(f"SELECT name, SUM(value) FROM counters{clause} GROUP BY name", params)
+        ))
+
+        def per_session(name: str, aggregate: str = "SUM") -> dict[str, int]:
+            return dict(self.db.execute(
+                f"SELECT path, {aggregate}(value) FROM counters{clause}{' AND' if clause else ' WHERE'} name = ? "
+                "GROUP BY path",
+                [*params, name],
+            ))
+
+        file_messages = per_session(json.dumps(["metrics", "file_messages"]))
+        duplicates = per_session(json.dumps(["metrics", "duplicate_entries"]))
+        first_entries = per_session(FIRST_ENTRY_COUNTER, "MIN") if since else {}
+
+        # 세션 활동 기간이 조회 기간과 겹치는 세션 (날짜를 모르는 세션은 항상 포함)
+        clauses, params = [], []
+        if since:
+            clauses.append("(last_day IS NULL OR last_day >= ?)")
+            params.append(since)
+        if until:
+            clauses.append("(first_day IS NULL OR first_day <= ?)")
+            params.append(until)
+        if project_names is not None:
+            clauses.append(f"project IN ({', '.join('?' * len(project_names))})")
+            params.extend(project_names)
+        clause = " WHERE " + " AND ".join(clauses) if clauses else ""
+        rows = self.db.execute(f"SELECT path, project, entry, first_day, last_day FROM sessions{clause}", params)
+
+        active = set()  # 기간 안에서 세션으로 센 프로젝트
+        for path, project, entry, first_day, last_day in rows:
+            session = json.loads(entry)
+            inside = (not since or (first_day and first_day >= since)) and (not until or (last_day and last_day <= until))
+            if not inside:
+                # 기간에 일부만 걸친 세션은 기간 안에 메시지가 있을 때만 셈
+                if not file_messages.get(path):
+                    continue
+                session["messageCount"] = file_messages[path]
+                # 기간 시작에 걸친 세션의 작업 시간대는 기간 안의 첫 엔트리 시각으로 셈
+                if since and (not first_day or first_day < since) and path in first_entries:
+                    session["created"] = datetime.fromtimestamp(first_entries[path], timezone.utc).isoformat()
+            elif duplicates.get(path) and not file_messages.get(path):
+                # 앞선 세션을 다시 기록하기만 한 파일은 세션으로 세지 않음
+                continue
+            elif session.get("messageCount") is None or duplicates.get(path):
+                session["messageCount"] = file_messages.get(path, 0)
+            totals.consume("session", session)
+            active.add(project)
+
+        # 스캔과 같이 기간이 없으면 모든 프로젝트 디렉토리를, 있으면 기간 안의 세션이 있는 프로젝트만 셈
+        if since or until:
+            names = sorted(active)
+        else:
+            names = project_names or [row[0] for row in self.db.execute("SELECT name FROM projects")]
+        for name in names:
+            totals.consume("project", anonymize_project_name(name) if anonymize else name)
+        return totals
+
+
+# 프로필 본문에 직접 반영되는 분석기 (나머지는 이름 그대로 프로필에 추가)
+CORE_ANALYZERS = ("metrics", "tech_stack", "task_types", "working_hours", "projects")
+
+
+def build_profile(results: dict[str, Any], anonymize: bool = True, window: TimeWindow | None = None) -> dict[str, Any]:
+    """분석기 결과로 프로필 생성 (window가 있으면 분석 기간도 기록)"""
+    tech_stack = results["tech_stack"]
+    task_types = results["task_types"]
+    working_hours = results["working_hours"]
+    metrics = results["metrics"]
+
+    # 프로필 생성
+    profile = {
+        "generated_at": datetime.now().isoformat(),
+        "anonymized": anonymize,
+        "metrics": metrics,
+        "tech_stack": {
+            category: dict(counter.most_common(5))
+            for category, counter in tech_stack.items()
+            if counter
+        },
+        "task_types": dict(task_types.most_common()),
+        "working_patterns": {
+            "peak_hours": [h for h, _ in working_hours["hours"].most_common(3)],
+            "active_days": [d for d, _ in working_hours["weekdays"].most_common(3)],
+        },
+        "hours_detail": dict(working_hours["hours"]),
+        "weekdays_detail": dict(working_hours["weekdays"]),
+        "project_count": results["projects"],
+    }
+    if window is not None:
+        profile["period"] = window.to_dict()
+    for name, result in results.items():
+        if name not in CORE_ANALYZERS:
+            profile[name] = result
+    # 자주 쓴 표현은 메시지 원문의 일부이므로 익명화할 때는 내보내지 않음
+    if anonymize and "sketch" in profile:
+        profile["sketch"] = {k: v for k, v in profile["sketch"].items() if k != "top_terms"}
+
+    return profile
+
+
+def generate_summary(profile: dict) -> str:
+    """프로필 요약 텍스트 생성"""
+    lines = ["## 개발자 프로필 분석 결과\n"]
+    if profile.get("period"):
+        period = profile["period"]
+        lines.append(f"분석 기간: {period['since'] or '처음'} ~ {period['until'] or '현재'}\n")
+
+    # 메트릭
+    m = profile["metrics"]
+    lines.append(f"### 활동 통계")
+    lines.append(f"- 총 세션 수: {m['total_sessions']}")
+    lines.append(f"- 총 메시지 수: {m['total_messages']}")
+    lines.append(f"- 세션당 평균 메시지: {m['avg_messages_per_session']:.1f}")
+    lines.append(f"- 평균 메시지 길이: {m['avg_message_length']} 자")
+    lines.append(f"- 질문형 메시지 비율: {m['question_ratio']}%")
+    lines.append(f"- 프로젝트 수: {profile['project_count']}\n")
+
+    # 기술 스택
+    if profile["tech_stack"]:
+        lines.append("### 주요 기술 스택")
+        for category, techs in profile["tech_stack"].items():
+            if techs:
+                tech_list = ", ".join(f"{t}({c})" for t, c in techs.items())
+                lines.append(f"- **{category}**: {tech_list}")
+        lines.append("")
+
+    # 작업 유형
+    if profile["task_types"]:
+        lines.append("### 작업 유형 분포")
+        for task, count in profile["task_types"].items():
+            lines.append(f"- {task}: {count}")
+        lines.append("")
+
+    # 작업 패턴
+    wp = profile["working_patterns"]
+    if wp["peak_hours"]:
+        lines.append("### 작업 패턴")
+        lines.append(f"- 주요 활동 시간대: {', '.join(f'{h}시' for h in wp['peak_hours'])}")
+        if wp["active_days"]:
+            lines.append(f"- 주요 활동 요일: {', '.join(wp['active_days'])}")
+
+    # 도구 사용
+    if profile.get("tool_calls"):
+        lines.append("\n### 도구 사용")
+        for tool, count in list(profile["tool_calls"].items())[:5]:
+            lines.append(f"- {tool}: {count}")
+        tokens = profile.get("token_usage", {})
+        if tokens.get("responses"):
+            lines.append(f"- 토큰 사용량: 입력 {tokens['input_tokens']:,} / 출력 {tokens['output_tokens']:,}")
+
+    # 메시지 테이블 통계
+    if profile.get("table", {}).get("messages"):
+        table = profile["table"]
+        pcts = table["length_percentiles"]
+        lines.append("\n### 메시지 통계")
+        lines.append(f"- 사용자 메시지: {table['messages']:,}개 (세션 {table['sessions']:,}개)")
+        lines.append(f"- 메시지 길이 분위수: p50 {pcts['p50']}자 / p90 {pcts['p90']}자 / p99 {pcts['p99']}자")
+        if table.get("session_minutes"):
+            minutes = table["session_minutes"]
+            lines.append(f"- 세션 활동 시간(첫~마지막 메시지): 중앙값 {minutes['p50']}분 / 최대 {minutes['max']}분")
+
+    # 근사 통계
+    if profile.get("sketch"):
+        sk = profile["sketch"]
+        bounds = sk["error_bounds"]
+        lengths = sk["message_length"]
+        lines.append(f"\n### 근사 통계 (메모리 상한 {sk['memory_kb']}KB)")
+        lines.append(f"- 고유 세션 수: 약 {sk['distinct_sessions']:,} (±{bounds['distinct_relative_std']:.1%})")
+        lines.append(f"- 고유 파일 수: 약 {sk['distinct_files']:,} (±{bounds['distinct_relative_std']:.1%})")
+        lines.append(
+            f"- 메시지 길이 분위수: p50 {lengths['p50']}자 / p90 {lengths['p90']}자 / p99 {lengths['p99']}자"
+            f" (±{bounds['length_relative']:.0%})"
+        )
+        if sk.get("top_terms"):
+            terms = ", ".join(f"{t}({c})" for t, c in list(sk["top_terms"].items())[:10])
+            lines.append(f"- 자주 쓴 표현: {terms} (최대 +{bounds['term_overcount']} 과대 추정)")
+
+    return "\n".join(lines)
+
+
+# 시각화: matplotlib은 --visualize일 때만 불러오고, 차트마다 별도 프로세스에서 그림
+VIZ_FORMATS = ("png", "svg", "pdf")
+WEEKDAYS_KR = ("월", "화", "수", "목", "금", "토", "일")
+
+
+@functools.cache
+def _pyplot():
+    """비대화형(Agg) 백엔드로 matplotlib.pyplot 로드 (프로세스마다 한 번)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # 한글 폰트 설정 (macOS)
+    plt.rcParams['font.family'] = ['AppleGothic', 'Malgun Gothic', 'sans-serif']
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
+
+
+def _chart_task_types(plt, profile: dict):
+    """작업 유형 파이 차트"""
+    if not profile.get("task_types"):
+        return None
+    fig, ax = plt.subplots(figsize=(10, 8))
+    task_types = profile["task_types"]
+    labels = list(task_types.keys())
+    sizes = list(task_types.values())
+    colors = plt.cm.Pastel1(range(len(labels)))
+
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
+    ax.set_title('작업 유형 분포', fontsize=16, fontweight='bold')
+    return fig
+
+
+def _chart_hours(plt, profile: dict):
+    """활동 시간대 바 차트"""
+    if "hours_detail" not in profile:
+        return None
+    fig, ax = plt.subplots(figsize=(14, 6))
+    hours_data = profile["hours_detail"]
+    hours = list(range(24))
+    counts = [hours_data.get(h, 0) for h in hours]
+
+    bars = ax.bar(hours, counts, color='steelblue', edgecolor='navy', alpha=0.8)
+    ax.set_xlabel('시간 (24시간)', fontsize=12)
+    ax.set_ylabel('세션 수', fontsize=12)
+    ax.set_title('시간대별 활동 패턴', fontsize=16, fontweight='bold')
+    ax.set_xticks(hours)
+    ax.set_xticklabels([f'{h}시' for h in hours], rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.3)
+
+    # 피크 시간 강조
+    peak_hours = profile.get("working_patterns", {}).get("peak_hours", [])
+    for i, bar in enumerate(bars):
+        if i in peak_hours:
+            bar.set_color('coral')
+            bar.set_edgecolor('darkred')
+    return fig
+
+
+def _chart_tech_stack(plt, profile: dict):
+    """기술 스택 바 차트"""
+    if not profile.get("tech_stack"):
+        return None
+    fig, axes = plt.subplots(2, 2, figsize=(14, 12))
+    fig.suptitle('기술 스택 분석', fontsize=18, fontweight='bold')
+
+    categories = ["languages", "frameworks", "tools", "databases"]
+    titles = ["프로그래밍 언어", "프레임워크", "도구", "데이터베이스"]
+    colors = ['#4CAF50', '#2196F3', '#FF9800', '#9C27B0']
+
+    for idx, (cat, title, color) in enumerate(zip(categories, titles, colors)):
+        ax = axes[idx // 2, idx % 2]
+        data = profile["tech_stack"].get(cat, {})
+
+        if data:
+            techs = list(data.keys())[:8]
+            counts = [data[t] for t in techs]
+
+            bars = ax.barh(techs, counts, color=color, alpha=0.8, edgecolor='black')
+            ax.set_xlabel('언급 횟수')
+            ax.set_title(title, fontsize=14, fontweight='bold')
+            ax.invert_yaxis()
+
+            for bar, count in zip(bars, counts):
+                ax.text(bar.get_width() + 0.1, bar.get_y() + bar.get_height()/2,
+                       str(count), va='center', fontsize=10)
+        else:
+            ax.text(0.5, 0.5, '데이터 없음', ha='center', va='center', fontsize=12)
+            ax.set_title(title, fontsize=14, fontweight='bold')
+
+    fig.tight_layout()
+    return fig
+
+
+def _chart_weekdays(plt, profile: dict):
+    """요일별 활동 차트"""
+    if "weekdays_detail" not in profile:
+        return None
+    fig, ax = plt.subplots(figsize=(10, 6))
+    weekdays_data = profile["weekdays_detail"]
+
+    counts = [weekdays_data.get(d, 0) for d in WEEKDAYS]
+    colors = ['#5DADE2'] * 5 + ['#F39C12'] * 2  # 주중은 파랑, 주말은 주황
+
+    bars = ax.bar(WEEKDAYS_KR, counts, color=colors, edgecolor='black', alpha=0.8)
+    ax.set_xlabel('요일', fontsize=12)
+    ax.set_ylabel('세션 수', fontsize=12)
+    ax.set_title('요일별 활동 패턴', fontsize=16, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3)
+
+    for bar, count in zip(bars, counts):
+        if count > 0:
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.2,
+                   str(count), ha='center', fontsize=11, fontweight='bold')
+    return fig
+
+
+def _chart_dashboard(plt, profile: dict):
+    """종합 대시보드"""
+    fig = plt.figure(figsize=(16, 12))
+    fig.suptitle('개발자 프로필 대시보드', fontsize=20, fontweight='bold', y=0.98)
+
+    # 메트릭 요약
+    ax1 = fig.add_subplot(2, 3, 1)
+    ax1.axis('off')
+    m = profile["metrics"]
+    metrics_text = f"""
+    📊 활동 통계
+
+    총 세션: {m['total_sessions']}
+    총 메시지: {m['total_messages']}
+    세션당 메시지: {m['avg_messages_per_session']:.1f}
+    평균 메시지 길이: {m['avg_message_length']}자
+    질문 비율: {m['question_ratio']}%
+    프로젝트 수: {profile['project_count']}
+    """
+    ax1.text(0.1, 0.5, metrics_text, fontsize=12, verticalalignment='center',
+             fontfamily='monospace', bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.5))
+
+    # 작업 유형 (파이)
+    ax2 = fig.add_subplot(2, 3, 2)
+    if profile.get("task_types"):
+        task_types = profile["task_types"]
+        ax2.pie(list(task_types.values()), labels=list(task_types.keys()),
+               autopct='%1.0f%%', colors=plt.cm.Pastel1(range(len(task_types))))
+    ax2.set_title('작업 유형', fontsize=14, fontweight='bold')
+
+    # 주요 언어 (바)
+    ax3 = fig.add_subplot(2, 3, 3)
+    if profile.get("tech_stack", {}).get("languages"):
+        langs = profile["tech_stack"]["languages"]
+        ax3.barh(list(langs.keys())[:5], list(langs.values())[:5], color='#4CAF50')
+        ax3.invert_yaxis()
+    ax3.set_title('주요 언어', fontsize=14, fontweight='bold')
+
+    # 시간대 (바)
+    ax4 = fig.add_subplot(2, 3, 4)
+    if "hours_detail" in profile:
+        hours_data = profile["hours_detail"]
+        hours = list(range(24))
+        counts = [hours_data.get(h, 0) for h in hours]
+        ax4.bar(hours, counts, color='steelblue', alpha=0.8)
+        ax4.set_xticks([0, 6, 12, 18, 23])
+        ax4.set_xticklabels(['0시', '6시', '12시', '18시', '23시'])
+    ax4.set_title('활동 시간대', fontsize=14, fontweight='bold')
+
+    # 요일 (바)
+    ax5 = fig.add_subplot(2, 3, 5)
+    if "weekdays_detail" in profile:
+        weekdays_data = profile["weekdays_detail"]
+        counts = [weekdays_data.get(d, 0) for d in WEEKDAYS]
+        colors = ['#5DADE2'] * 5 + ['#F39C12'] * 2
+        ax5.bar(WEEKDAYS_KR, counts, color=colors)
+    ax5.set_title('활동 요일', fontsize=14, fontweight='bold')
+
+    # 도구 (바)
+    ax6 = fig.add_subplot(2, 3, 6)
+    if profile.get("tech_stack", {}).get("tools"):
+        tools = profile["tech_stack"]["tools"]
+        ax6.barh(list(tools.keys())[:5], list(tools.values())[:5], color='#FF9800')
+        ax6.invert_yaxis()
+    ax6.set_title('주요 도구', fontsize=14, fontweight='bold')
+
+    fig.tight_layout()
+    return fig
+
+
+# 차트 파일 이름 → 그리는 함수 (결과 목록도 이 순서를 따름)
+CHARTS = {
+    "task_types_pie": _chart_task_types,
+    "activity_hours": _chart_hours,
+    "tech_stack": _chart_tech_stack,
+    "activity_weekdays": _chart_weekdays,
+    "dashboard": _chart_dashboard,
+}
+
+
+def _render_chart(name: str, profile: dict, output_dir: Path, fmt: str, dpi: int) -> str | None:
+    """차트 하나를 그려 저장하고 파일 경로 반환 (그릴 데이터가 없으면 None)"""
+    plt = _pyplot()
+    fig = CHARTS[name](plt, profile)
+    if fig is None:
+        return None
+    filepath = output_dir / f"{name}.{fmt}"
+    fig.savefig(filepath, dpi=dpi, bbox_inches='tight', facecolor='white')
+    plt.close(fig)
+    return str(filepath)
+
+
+def generate_visualizations(
+    profile: dict,
+    output_dir: Path,
+    fmt: str = "png",
+    dpi: int = 150,
+    jobs: int = 0,
+) -> list[str]:
+    """시각화 차트 생성
+
+    차트마다 jobs개(0이면 CPU 코어 수, 최대 차트 수)의 프로세스에 나눠 그립니다.
+    fmt이 "svg"/"pdf"면 벡터 파일로 저장하며, dpi를 낮추면 빠른 미리보기용 이미지가 됩니다.
+    """
+    if not HAS_MATPLOTLIB:
+        print("matplotlib이 설치되지 않았습니다. pip install matplotlib 실행 후 다시 시도하세요.")
+        return []
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    names = list(CHARTS)
+    jobs = min(len(names), jobs or os.cpu_count() or 1)
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_render_chart, name, profile, output_dir, fmt, dpi) for name in names]
+            results = [future.result() for future in futures]
+    else:
+        results = [_render_chart(name, profile, output_dir, fmt, dpi) for name in names]
+    return [filepath for filepath in results if filepath]
+
+
+# 상주 모드: 세션별 집계를 메모리에 유지하며 로컬 JSON-RPC 요청에 응답
+DEFAULT_SOCKET_PATH = Path.home() / ".claude" / "developer-profile.sock"
+
+
+class ProfileDaemon:
+    """세션별 부분 집계를 메모리에 유지하고 요청마다 바뀐 세션만 다시 분석
+
+    요청/응답은 한 줄짜리 JSON-RPC 2.0 메시지입니다.
+
+        {"jsonrpc": "2.0", "id": 1, "method": "summary", "params": {"since": "30d"}}
+
+    - 메서드: ping, profile, summary, refresh, shutdown
+    - params(모두 선택): anonymize, count_occurrences, since, until
+
+    집계는 (익명화, 기간)마다 메모리에 유지합니다. 변경 확인은 root 바로 아래 항목(프로젝트
+    디렉토리와 인덱스의 mtime, tar 보관 파일)과 인덱스에 실린 세션 파일의 크기/mtime만 봅니다.
+    세션 파일 뒤에 줄이 추가되기만 했으면 추가된 줄만 분석해 기간 없는 집계에 더하고
+    (SessionWatcher와 같은 방식), 세션이 생기거나 사라지는 등 그 밖의 변경은 집계를 비운 뒤
+    다음 요청에서 메모리 체크포인트 캐시로 바뀐 세션만 다시 분석해 다시 합칩니다.
+    기간이 있는 집계는 변경이 있으면 다시 합칩니다 (상대 기간(30d 등)은 분 단위로 맞춰 재사용).
+    상대 기간은 분마다 새 기간이 되므로 기간이 있는 집계는 최근에 쓴 WINDOW_VIEWS개만 유지합니다.
+    --poll로 주기적 확인을 켜면 요청 때는 확인하지 않고 미리 갱신된 집계로 바로 응답합니다.
+    """
+
+    WINDOW_VIEWS = 4
+
+    def __init__(
+        self,
+        anonymize: bool = True,
+        cache_path: Path | None = None,
+        jobs: int = 1,
+        discover: bool = False,
+        root: Path | None = None,
+    ):
+        self.anonymize = anonymize
+        self.cache_path = cache_path
+        self.cache = load_cache(cache_path) if cache_path else {}
+        self.jobs = jobs
+        self.discover = discover
+        self.root = root or CLAUDE_PROJECTS_DIR
+        self.lock = threading.Lock()
+        self.running = True
+        self.polling = False  # 참이면 요청 때 변경을 확인하지 않음 (_poll_loop가 갱신)
+        self._projects: dict[str, tuple] | None = None  # root 바로 아래 항목 → 지문
+        self._files: dict[str, tuple[tuple | None, bool]] = {}  # 세션 파일 → (크기/mtime, 인덱스에 메시지 수가 있는지)
+        self._totals: dict[tuple, ProfilePartial] = {}  # (익명화, since, until) → 집계 (최근에 쓴 것이 뒤)
+        self.refreshed_at: str | None = None
+
+    @staticmethod
+    def _file_stamp(path: str) -> tuple | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _project_stamps(self) -> dict[str, tuple]:
+        """root 바로 아래 항목의 지문 (프로젝트 디렉토리는 디렉토리/인덱스 mtime, 보관 파일은 크기/mtime)"""
+        items = {}
+        with os.scandir(self.root) as projects:
+            for project in projects:
+                if project.is_dir():
+                    items[project.path] = ("dir", *SessionWatcher._stamp(Path(project.path)))
+                elif _is_archive(project.name) and project.is_file():
+                    stat = project.stat()
+                    items[project.path] = ("archive", stat.st_size, stat.st_mtime_ns)
+        return items
+
+    def _load_files(self) -> None:
+        """인덱스(--discover면 디렉토리 탐색 포함)에 실린 세션 파일의 지문을 다시 읽음"""
+        self._files = {}
+        for path, stamp in sorted(self._projects.items()):
+            if stamp[0] != "dir":
+                continue
+            sessions = load_sessions_index(Path(path))
+            if self.discover:
+                sessions = discover_sessions(Path(path), sessions)
+            for session in sessions:
+                key = str(Path(session.get("fullPath", "")))
+                self._files[key] = (self._file_stamp(key), session.get("messageCount") is not None)
+
+    def _appendable(self, key: str, old: tuple | None, new: tuple | None) -> bool:
+        """뒤에 줄이 추가되기만 해서 추가된 줄만 더하면 되는지
+
+        중복 제거 묶음에 속한 파일은 다른 파일의 집계도 바뀔 수 있고, 인덱스에 메시지 수가
+        없는 세션(--discover 포함)은 세션 항목이 파일 내용으로 바뀌므로 다시 합칩니다.
+        """
+        entry = self.cache.get(key)
+        if self.discover or old is None or new is None or entry is None:
+            return False
+        if (entry["size"], entry["mtime"]) != old or new[0] < entry["offset"] or "keys" in entry or entry.get("drop"):
+            return False
+        path = Path(key)
+        return _compression(path) is None and entry["head"] == _file_head(path)
+
+    def _apply_append(self, key: str, stamp: tuple) -> None:
+        """추가된 줄만 분석해 캐시 항목과 기간 없는 집계에 더하고, 기간 있는 집계는 비움"""
+        entry = self.cache[key]
+        delta = ProfilePartial()
+        delta._seen_files = set(entry["seen"])
+        delta, offset = scan_session_file(Path(key), entry["offset"], delta)
+        state = ProfilePartial.from_dict(entry["partial"])
+        state.merge(delta)
+        entry.update(
+            size=stamp[0], mtime=stamp[1], offset=offset,
+            partial=state.to_dict(), seen=sorted(delta._seen_files),
+        )
+        for view in list(self._totals):
+            anonymize, since, until = view
+            if since is not None or until is not None:
+                del self._totals[view]
+                continue
+            added = delta
+            if anonymize and "table" in delta.analyzers:
+                # 메시지 테이블의 프로젝트 이름은 익명화한 사본에만 적용
+                added = ProfilePartial.from_dict(delta.to_dict())
+                added.analyzers["table"].table.rename_projects(anonymize_project_name)
+            self._totals[view].merge(added)
+
+    def refresh(self, force: bool = False) -> bool:
+        """파일이 바뀌었으면 집계를 갱신하고 참 반환 (캐시는 유지)
+
+        뒤에 줄만 추가된 세션은 추가분을 더하고, 그 밖의 변경이 있으면 집계를 비웁니다.
+        """
+        projects = self._project_stamps()
+        if force or projects != self._projects:
+            self._projects = projects
+            self._load_files()
+            self._totals.clear()
+            self.refreshed_at = datetime.now().isoformat()
+            return True
+
+        changed = []
+        for key, (old, counted) in self._files.items():
+            new = self._file_stamp(key)
+            if new != old:
+                changed.append((key, old, new, counted))
+        if not changed:
+            return False
+
+        if self._totals and all(counted and self._appendable(key, old, new) for key, old, new, counted in changed):
+            for key, _, new, _ in changed:
+                self._apply_append(key, new)
+        else:
+            self._totals.clear()
+        for key, _, new, counted in changed:
+            self._files[key] = (new, counted)
+        self.refreshed_at = datetime.now().isoformat()
+        return True
+
+    def totals(self, anonymize: bool, window: TimeWindow | None) -> ProfilePartial:
+        key = (anonymize, window.since if window else None, window.until if window else None)
+        totals = self._totals.pop(key, None)
+        if totals is None:
+            totals = collect_profile_partial(
+                anonymize, jobs=self.jobs, discover=self.discover, window=window, cache=self.cache, root=self.root
+            )
+        self._totals[key] = totals
+        if window is not None:
+            # 가장 오래 쓰지 않은 기간 집계부터 버림 (기간 없는 집계는 유지)
+            windowed = [view for view in self._totals if view[1] is not None or view[2] is not None]
+            for view in windowed[: -self.WINDOW_VIEWS]:
+                del self._totals[view]
+        return totals
+
+    def warm(self) -> None:
+        """바뀐 파일이 있으면 기본 설정의 집계를 미리 계산"""
+        with self.lock:
+            if self.refresh() or not self._totals:
+                self.totals(self.anonymize, None)
+
+    def handle(self, method: str, params: dict) -> Any:
+        if method == "ping":
+            return {"sessions": len(self.cache), "refreshed_at": self.refreshed_at, "json_backend": JSON_BACKEND}
+        if method == "shutdown":
+            self.running = False
+            return {"ok": True}
+        if method == "refresh":
+            with self.lock:
+                self.refresh(force=True)
+                self.totals(self.anonymize, None)
+            return {"sessions": len(self.cache), "refreshed_at": self.refreshed_at}
+        if method not in ("profile", "summary"):
+            raise ValueError(f"알 수 없는 메서드입니다: {method}")
+
+        anonymize = params.get("anonymize", self.anonymize)
+        window = None
+        if params.get("since") or params.get("until"):
+            now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+            window = TimeWindow.parse(params.get("since"), params.get("until"), now)
+        with self.lock:
+            if not self.polling:
+                self.refresh()
+            totals = self.totals(anonymize, window)
+            results = totals.finalize({"count_occurrences": bool(params.get("count_occurrences"))})
+        profile = build_profile(results, anonymize, window)
+        return profile if method == "profile" else {"summary": generate_summary(profile)}
+
+    def respond(self, line: str) -> str:
+        """요청 한 줄을 처리해 응답 한 줄 반환"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            result = self.handle(request.get("method"), request.get("params") or {})
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except Exception as e:
+            # 요청 하나의 오류로 상주 프로세스가 죽지 않도록 모두 응답으로 돌려줌
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32000, "message": str(e)}}
+        return json.dumps(response, ensure_ascii=False)
+
+    def close(self) -> None:
+        if self.cache_path:
+            save_cache(self.cache_path, self.cache)
+
+
+def _poll_loop(daemon: ProfileDaemon, interval: float) -> None:
+    """interval초마다 파일 변경을 확인해 집계를 미리 갱신"""
+    while daemon.running:
+        time.sleep(interval)
+        if daemon.running:
+            daemon.warm()
+
+
+def serve_stdio(daemon: ProfileDaemon) -> None:
+    """표준 입출력으로 한 줄씩 요청을 받아 응답"""
+    for line in sys.stdin:
+        if line.strip():
+            print(daemon.respond(line), flush=True)
+        if not daemon.running:
+            break
+
+
+def serve_socket(daemon: ProfileDaemon, socket_path: Path) -> None:
+    """Unix 소켓으로 요청을 받아 응답 (연결마다 스레드, 여러 요청 가능)"""
+    import socket
+    import socketserver
+    if socket_path.exists():
+        # 응답하는 데몬이 있으면 중복 실행하지 않음, 남은 소켓 파일만 정리
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(socket_path))
+            except OSError:
+                socket_path.unlink()
+            else:
+                raise RuntimeError(f"이미 실행 중인 데몬이 있습니다: {socket_path}")
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if line.strip():
+                    self.wfile.write(daemon.respond(line.decode("utf-8")).encode("utf-8") + b"\n")
+                if not daemon.running:
+                    threading.Thread(target=self.server.shutdown).start()
+                    break
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    # 프로필에는 작업 기록이 담기므로 소켓 파일을 만들 때부터 소유자만 접근
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    finally:
+        os.umask(umask)
+    with server:
+        server.daemon_threads = True
+        print(f"개발자 프로필 데몬 대기 중: {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            daemon.running = False
+            socket_path.unlink(missing_ok=True)
+
+
+class SessionWatcher:
+    """--watch: 세션 파일 뒤에 추가된 줄만 분석해 프로필을 실시간으로 갱신
+
+    세션별 부분 집계와 메모리 체크포인트 캐시를 유지하고, 주기마다 프로젝트 디렉토리/인덱스/
+    세션 파일의 크기와 mtime만 확인합니다. 뒤에 줄이 추가된 파일은 새 줄만 분석해
+    세션 집계와 전체 집계에 더하므로 CPU 사용량은 추가되는 양에 비례합니다.
+    세션이 생기거나 사라지거나, 잘리거나 다시 쓰인 파일, 중복 제거 묶음에 속한 파일이
+    바뀌었을 때만 캐시로 바뀐 세션을 다시 분석해(iter_session_partials()) 전체 집계를
+    다시 합칩니다. 세션/프로젝트 이벤트는 결과를 만들 때 인덱스에서 다시 만듭니다.
+    """
+
+    def __init__(
+        self,
+        anonymize: bool = True,
+        cache_path: Path | None = None,
+        jobs: int = 1,
+        discover: bool = False,
+        root: Path | None = None,
+        dedup: bool = True,
+    ):
+        self.anonymize = anonymize
+        self.cache_path = cache_path
+        self.jobs = jobs
+        self.discover = discover
+        self.root = root or CLAUDE_PROJECTS_DIR
+        self.dedup = dedup
+        self.projects: dict[Path, tuple[tuple, list[dict]]] = {}  # 디렉토리 → (변경 지문, 세션 목록)
+        self.cache: dict[str, dict] = {}  # 세션 경로 → 체크포인트 (load_cache() 형식)
+        self.partials: dict[str, ProfilePartial] = {}  # 세션 경로 → 부분 집계
+        self.stamps: dict[str, tuple | None] = {}  # 세션 경로 → 반영한 크기/mtime (파일이 없으면 None)
+        self.entries = ProfilePartial()  # 세션 파일에서 나온 이벤트의 합계
+
+    @staticmethod
+    def _stamp(project_dir: Path) -> tuple:
+        """디렉토리(파일 추가/삭제)와 인덱스의 mtime"""
+        try:
+            index_mtime = (project_dir / "sessions-index.json").stat().st_mtime_ns
+        except OSError:
+            index_mtime = None
+        return project_dir.stat().st_mtime_ns, index_mtime
+
+    def _load_project(self, project_dir: Path) -> list[dict]:
+        sessions = load_sessions_index(project_dir)
+        if self.discover:
+            sessions = discover_sessions(project_dir, sessions)
+        return sessions
+
+    def _session_paths(self) -> list[str]:
+        """스캔과 같은 순서(프로젝트 디렉토리 이름, 인덱스 순)의 세션 경로 (중복 제외)"""
+        paths = (str(Path(s.get("fullPath", ""))) for _, (_, sessions) in sorted(self.projects.items()) for s in sessions)
+        return list(dict.fromkeys(paths))
+
+    def _rescan(self) -> None:
+        """모든 세션의 집계를 캐시로 다시 만들고 (바뀐 세션만 분석) 전체 집계를 다시 합침"""
+        paths = self._session_paths()
+        self.partials = {}
+        self.entries = ProfilePartial()
+        for jsonl_path, partial in iter_session_partials([Path(p) for p in paths], self.cache, self.jobs, dedup=self.dedup):
+            self.partials[str(jsonl_path)] = partial
+            self.entries.merge(partial)
+        for key in [k for k in self.cache if k not in self.partials]:
+            del self.cache[key]
+        self.stamps = {
+            key: (entry["size"], entry["mtime"]) if (entry := self.cache.get(key)) else None
+            for key in self.partials
+        }
+
+    def _appendable(self, key: str, stamp: tuple | None) -> bool:
+        """뒤에 줄이 추가되기만 해서 추가된 줄만 더하면 되는지 (중복 제거 묶음에 속한 파일 제외)"""
+        entry = self.cache.get(key)
+        if entry is None or stamp is None or stamp[0] < entry["offset"] or "keys" in entry or entry.get("drop"):
+            return False
+        path = Path(key)
+        return _compression(path) is None and entry["head"] == _file_head(path)
+
+    def _apply_append(self, key: str, stamp: tuple) -> None:
+        """추가된 줄만 분석해 세션 집계, 캐시 항목, 전체 집계에 더함"""
+        entry = self.cache[key]
+        partial = self.partials[key]
+        delta = ProfilePartial()
+        delta._seen_files = partial._seen_files
+        delta, offset = scan_session_file(Path(key), entry["offset"], delta)
+        partial.merge(delta)
+        self.entries.merge(delta)
+        entry.update(
+            size=stamp[0], mtime=stamp[1], offset=offset,
+            partial=partial.to_dict(), seen=sorted(partial._seen_files),
+        )
+        self.stamps[key] = stamp
+
+    def start(self) -> None:
+        """처음 한 번 전체 분석 (캐시가 있으면 바뀐 세션만)"""
+        for project_dir in sorted(self.root.iterdir()):
+            if project_dir.is_dir():
+                self.projects[project_dir] = (self._stamp(project_dir), self._load_project(project_dir))
+        self.cache = load_cache(self.cache_path) if self.cache_path else {}
+        self._rescan()
+
+    def poll(self) -> bool:
+        """바뀐 부분만 반영하고, 결과가 달라졌으면 참 반환"""
+        changed = False
+
+        current = {p for p in self.root.iterdir() if p.is_dir()}
+        for project_dir in set(self.projects) - current:
+            del self.projects[project_dir]
+            changed = True
+        for project_dir in sorted(current):
+            stamp = self._stamp(project_dir)
+            known = self.projects.get(project_dir)
+            if known is None or known[0] != stamp:
+                self.projects[project_dir] = (stamp, self._load_project(project_dir))
+                changed = True
+
+        paths = self._session_paths()
+        # 세션 목록이나 순서가 바뀌면 중복 판정(묶음의 첫 파일)도 달라질 수 있음
+        rescan = paths != list(self.partials)
+        appended = []
+        for key in paths:
+            if key not in self.stamps:
+                continue
+            stamp = ProfileDaemon._file_stamp(key)
+            if stamp == self.stamps[key]:
+                continue
+            if not rescan and self._appendable(key, stamp):
+                appended.append((key, stamp))
+            else:
+                rescan = True
+
+        if rescan:
+            self._rescan()
+            return True
+        for key, stamp in appended:
+            self._apply_append(key, stamp)
+        return changed or bool(appended)
+
+    def totals(self) -> ProfilePartial:
+        """현재 전체 부분 집계 (파일 이벤트 합계 + 인덱스의 세션/프로젝트 이벤트)
+
+        세션 항목은 iter_profile_sessions()와 같이 만듭니다: 중복 제거 중이면 여러 인덱스에
+        실린 세션은 한 번만, 앞선 세션을 다시 기록하기만 한 파일은 세지 않고, 중복 제거 없이는
+        여러 인덱스에 실린 세션을 실린 만큼 셉니다.
+        """
+        totals = ProfilePartial()
+        totals.merge(self.entries)
+        listed = set()
+        for project_dir, (_, sessions) in sorted(self.projects.items()):
+            name = project_dir.name
+            totals.consume("project", anonymize_project_name(name) if self.anonymize else name)
+            for session in sessions:
+                key = str(Path(session.get("fullPath", "")))
+                partial = self.partials.get(key)
+                if key in listed:
+                    if self.dedup:
+                        continue
+                    if partial is not None:
+                        # 중복 제거 없이 스캔할 때처럼 여러 인덱스에 실린 파일은 실린 만큼 셈
+                        totals.merge(partial)
+                listed.add(key)
+                metrics = partial.analyzers["metrics"] if partial is not None else MetricsAnalyzer()
+                if metrics.duplicate_entries and not metrics.file_messages:
+                    continue
+                if session.get("messageCount") is None or metrics.duplicate_entries:
+                    session = {**session, "messageCount": metrics.file_messages}
+                totals.consume("session", session)
+        return totals
+
+    def close(self) -> None:
+        """--cache가 주어졌으면 현재 offset과 세션 집계를 캐시로 저장"""
+        if self.cache_path:
+            save_cache(self.cache_path, self.cache)
+
+
+def watch(args) -> None:
+    """--watch 실행: 결과가 바뀔 때마다 요약(또는 JSON 한 줄)을 출력하거나 --output 파일을 갱신"""
+    anonymize = not args.no_anonymize
+    watcher = SessionWatcher(
+        anonymize=anonymize,
+        cache_path=Path(args.cache) if args.cache else None,
+        jobs=args.jobs or os.cpu_count() or 1,
+        discover=args.discover,
+        root=Path(args.root).expanduser() if args.root else None,
+        dedup=not args.no_dedup,
+    )
+    watcher.start()
+    changed = True
+    try:
+        while True:
+            if changed:
+                profile = finalize_profile(watcher.totals(), anonymize, count_occurrences=args.count_occurrences)
+                if args.json:
+                    output = json.dumps(profile, ensure_ascii=False)
+                else:
+                    output = f"--- {datetime.now():%H:%M:%S} 갱신 ---\n" + generate_summary(profile) + "\n"
+                if args.output:
+                    # 대시보드가 읽는 도중 잘린 파일을 보지 않도록 교체 방식으로 기록
+                    tmp_path = Path(args.output + ".tmp")
+                    tmp_path.write_text(output)
+                    os.replace(tmp_path, args.output)
+                else:
+                    print(output, flush=True)
+            time.sleep(args.watch_interval)
+            changed = watcher.poll()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def main():
+    import argparse
+
+    # 스캔과 merge 모두에 쓰이는 출력 옵션
+    def output_parser(defaults: bool = True) -> argparse.ArgumentParser:
+        output_options = argparse.ArgumentParser(add_help=False)
+
+        def add(*flags, **kwargs) -> None:
+            if not defaults:
+                kwargs["default"] = argparse.SUPPRESS
+            output_options.add_argument(*flags, **kwargs)
+
+        add("--json", action="store_true", help="JSON 형식으로 출력")
+        add("--output", "-o", help="출력 파일 경로")
+        add("--visualize", "-v", action="store_true", help="시각화 차트 생성")
+        add("--viz-output", default="./profile_charts", help="시각화 출력 디렉토리 (기본: ./profile_charts)")
+        add(
+            "--viz-format", choices=VIZ_FORMATS, default="png",
+            help="차트 파일 형식 (기본: png, svg/pdf는 벡터)",
+        )
+        add(
+            "--viz-dpi", type=int, default=150,
+            help="차트 해상도 (기본: 150, 빠른 미리보기용 썸네일은 50 정도)",
+        )
+        add(
+            "--count-occurrences", action="store_true",
+            help="키워드를 등장 여부 대신 메시지별 실제 등장 횟수로 집계",
+        )
+        add(
+            "--partial-out",
+            help="병합 가능한 부분 프로필(원시 카운터) 파일 저장 경로",
+        )
+        add(
+            "--stats",
+            help="단계별 wall/CPU 시간, 처리량, 가장 느린 세션 파일을 JSON으로 저장 (-면 stderr)",
+        )
+        add("--stats-slowest", type=int, default=10, help="--stats에 기록할 느린 파일 수 (기본: 10)")
+        add("--profile-out", help="cProfile 결과(pstats) 저장 경로")
+        add("--tracemalloc", action="store_true", help="메모리 할당 상위 지점을 --stats 보고서에 포함")
+        add(
+            "--table", action="store_true",
+            help="사용자 메시지별 (시각, 길이, 질문 여부, 세션, 프로젝트) 열 지향 테이블을 만들어 "
+                 "시간대/길이 분위수/세션 활동 시간 통계 추가 (numpy가 있으면 벡터 연산)",
+        )
+        add("--table-out", help="메시지 테이블을 .npz로 저장 (--table 포함, numpy 필요)")
+        add(
+            "--sketch", nargs="?", type=int, const=DEFAULT_SKETCH_MEMORY_KB, default=None, metavar="KB",
+            help="고유 세션/파일 수, 표현 빈도, 메시지 길이 분위수를 메모리 상한(KB) 안에서 근사 "
+                 f"(기본: {DEFAULT_SKETCH_MEMORY_KB}KB, --store와 함께 사용 불가)",
+        )
+        add(
+            "--usage", action="store_true",
+            help="도구 호출 분포, 토큰 사용량, 세션 길이를 프로필에 추가 (--store와 함께 사용 불가)",
+        )
+        return output_options
+
+    output_options = output_parser()
+    # merge 뒤에 주지 않은 옵션이 merge 앞에서 준 값을 기본값으로 덮어쓰지 않도록 기본값을 생략
+    merge_options = output_parser(defaults=False)
+
+    parser = argparse.ArgumentParser(
+        description="Claude Code 사용 기록 기반 개발자 프로필 분석",
+        parents=[output_options],
+    )
+    parser.add_argument("--no-anonymize", action="store_true", help="익명화하지 않음")
+    parser.add_argument("--root", help=f"분석할 projects 디렉토리 (기본: {CLAUDE_PROJECTS_DIR})")
+    parser.add_argument(
+        "--cache", nargs="?", const=str(DEFAULT_CACHE_PATH), default=None,
+        help=f"세션별 체크포인트 캐시 사용 (기본 경로: {DEFAULT_CACHE_PATH})",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="세션 파일 분석과 --visualize 차트 렌더링에 쓸 프로세스 수 "
+             "(기본: 분석은 1, 차트는 차트 수와 CPU 코어 수 중 작은 값, 0이면 CPU 코어 수, 1이면 차트도 한 프로세스에서)",
+    )
+    parser.add_argument(
+        "--discover", action="store_true",
+        help="sessions-index.json에 의존하지 않고 *.jsonl을 직접 탐색하여 인덱스와 교차 검증",
+    )
+    parser.add_argument(
+        "--no-dedup", action="store_true",
+        help="이어하기/포크한 세션이 다시 기록한 엔트리도 중복 제거 없이 모두 셈",
+    )
+    parser.add_argument(
+        "--decode-stats", action="store_true",
+        help="JSONL 디코딩 처리량(줄/초, MB/초)을 stderr로 출력",
+    )
+    parser.add_argument("--since", help="이 시점 이후만 분석 (예: 2025-01-01, 30d, 12h, 2w)")
+    parser.add_argument("--until", help="이 시점까지만 분석 (날짜만 주면 그날 끝까지 포함)")
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="세션 파일에 추가되는 줄만 분석하며 결과가 바뀔 때마다 다시 출력 (Ctrl+C로 종료)",
+    )
+    parser.add_argument("--watch-interval", type=float, default=5, help="--watch 확인 간격(초, 기본: 5)")
+    parser.add_argument(
+        "--store", nargs="?", const=str(DEFAULT_STORE_PATH), default=None,
+        help=f"세션별·일별 집계를 SQLite 저장소에 반영하고 저장소에서 조회 (기본 경로: {DEFAULT_STORE_PATH}, "
+             "--since/--until은 일 단위)",
+    )
+    parser.add_argument("--no-ingest", action="store_true", help="저장소를 갱신하지 않고 조회만 수행")
+    parser.add_argument(
+        "--project", action="append",
+        help="저장소 조회를 이 프로젝트로 제한 (원래 이름 또는 익명화된 이름, 여러 번 지정 가능)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    merge_parser = subparsers.add_parser(
+        "merge", parents=[merge_options],
+        help="여러 부분 프로필 파일을 하나의 프로필로 병합",
+    )
+    merge_parser.add_argument("partials", nargs="+", help="--partial-out으로 저장한 부분 프로필 파일")
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="집계를 메모리에 유지하며 로컬 JSON-RPC(Unix 소켓/표준 입출력)로 프로필 제공",
+    )
+    serve_parser.add_argument(
+        "--socket", default=str(DEFAULT_SOCKET_PATH),
+        help=f"Unix 소켓 경로 (기본: {DEFAULT_SOCKET_PATH})",
+    )
+    serve_parser.add_argument("--stdio", action="store_true", help="소켓 대신 표준 입출력으로 통신")
+    serve_parser.add_argument(
+        "--poll", type=float, default=5,
+        help="파일 변경을 확인해 집계를 미리 갱신할 간격(초, 기본: 5, 0이면 주기 확인 없이 요청마다 확인)",
+    )
+    args = parser.parse_args()
+    # 차트는 --jobs를 주지 않으면 병렬로 그리고, 세션 분석은 기본 1개 프로세스
+    viz_jobs = 0 if args.jobs is None else args.jobs
+    if args.jobs is None:
+        args.jobs = 1
+
+    if args.sketch is not None:
+        if args.command != "merge" and args.store:
+            parser.error("--sketch는 --store와 함께 사용할 수 없습니다")
+        try:
+            enable_sketch(args.sketch)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.table or args.table_out:
+        if args.command != "merge" and args.store:
+            parser.error("--table은 --store와 함께 사용할 수 없습니다")
+        if args.table_out and not HAS_NUMPY:
+            parser.error("--table-out은 numpy가 필요합니다 (pip install numpy)")
+        enable_table()
+    if args.usage:
+        if args.command != "merge" and args.store:
+            parser.error("--usage는 --store와 함께 사용할 수 없습니다")
+        enable_usage()
+
+    root = Path(args.root).expanduser() if args.root else None
+    if args.command == "serve":
+        daemon = ProfileDaemon(
+            anonymize=not args.no_anonymize,
+            cache_path=Path(args.cache) if args.cache else None,
+            jobs=args.jobs or os.cpu_count() or 1,
+            discover=args.discover,
+            root=root,
+        )
+        daemon.warm()
+        if args.poll > 0:
+            daemon.polling = True
+            threading.Thread(target=_poll_loop, args=(daemon, args.poll), daemon=True).start()
+        try:
+            if args.stdio:
+                serve_stdio(daemon)
+            else:
+                serve_socket(daemon, Path(args.socket).expanduser())
+        except RuntimeError as e:
+            parser.error(str(e))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.close()
+        return
+
+    if args.tracemalloc and not args.stats:
+        parser.error("--tracemalloc은 --stats와 함께 사용해야 합니다")
+
+    stats = RunStats(args.stats_slowest) if args.stats or args.decode_stats else None
+    profiler = None
+    if args.profile_out:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if args.tracemalloc:
+        import tracemalloc
+        tracemalloc.start()
+    started = time.perf_counter(), time.process_time()
+
+    window = None
+    if args.command != "merge" and (args.since or args.until):
+        try:
+            window = TimeWindow.parse(args.since, args.until)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.command != "merge" and not args.store:
+        if args.no_ingest or args.project:
+            parser.error("--no-ingest와 --project는 --store와 함께 사용해야 합니다")
+    if args.command != "merge" and args.store and args.cache:
+        parser.error("--store와 --cache는 함께 사용할 수 없습니다")
+    if args.command != "merge" and args.watch:
+        if args.store or window or args.visualize or args.partial_out or args.table_out:
+            parser.error("--watch는 --store, --since/--until, --visualize, --partial-out, --table-out과 함께 사용할 수 없습니다")
+        watch(args)
+        return
+
+    if args.command == "merge":
+        try:
+            with _stage(stats, "merge"):
+                totals, anonymize = merge_partial_profiles(Path(p) for p in args.partials)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    elif args.store:
+        anonymize = not args.no_anonymize
+        with ProfileStore(Path(args.store).expanduser()) as store:
+            if not args.no_ingest:
+                with _stage(stats, "ingest"):
+                    ingested = store.ingest(
+                        args.jobs or os.cpu_count() or 1, args.discover, root=root, dedup=not args.no_dedup
+                    )
+                print(
+                    "저장소 갱신: 새 세션 {new}개, 이어서 분석 {appended}개, 다시 분석 {rescanned}개, "
+                    "변경 없음 {unchanged}개, 파일 없음 {missing}개, 삭제 {removed}개".format_map(ingested),
+                    file=sys.stderr,
+                )
+            try:
+                with _stage(stats, "query"):
+                    totals = store.query(window, args.project, anonymize)
+            except ValueError as e:
+                parser.error(str(e))
+    else:
+        anonymize = not args.no_anonymize
+        discovery = Counter()
+        totals = collect_profile_partial(
+            anonymize=anonymize,
+            cache_path=Path(args.cache) if args.cache else None,
+            jobs=args.jobs or os.cpu_count() or 1,
+            stats=stats,
+            discover=args.discover,
+            discovery=discovery,
+            window=window,
+            dedup=not args.no_dedup,
+            root=root,
+        )
+        duplicates = totals.analyzers["metrics"].duplicate_entries
+        if duplicates:
+            print(f"중복 제거: 앞선 세션에서 이미 센 엔트리 {duplicates}개를 건너뜀", file=sys.stderr)
+        if args.discover:
+            print(
+                "세션 탐색: 인덱스 {indexed}개 (경로 복구 {relocated}, 갱신 {stale}), "
+                "새로 발견 {discovered}개, 파일 없음 {missing}개".format_map(discovery),
+                file=sys.stderr,
+            )
+        if args.decode_stats:
+            print(stats.decode.report(), file=sys.stderr)
+
+    if args.partial_out:
+        save_partial_profile(Path(args.partial_out), totals, anonymize)
+        print(f"부분 프로필 저장됨: {args.partial_out}", file=sys.stderr)
+    if args.table_out:
+        totals.analyzers["table"].table.save_npz(Path(args.table_out))
+        print(f"메시지 테이블 저장됨: {args.table_out}", file=sys.stderr)
+
+    with _stage(stats, "finalize"):
+        profile = finalize_profile(totals, anonymize, window, args.count_occurrences)
+
+    # 시각화 생성
+    if args.visualize:
+        output_dir = Path(args.viz_output)
+        with _stage(stats, "visualize"):
+            generated = generate_visualizations(profile, output_dir, args.viz_format, args.viz_dpi, viz_jobs)
+        if generated:
+            print(f"시각화 생성 완료:")
+            for f in generated:
+                print(f"  - {f}")
+            print()
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile_out)
+        print(f"cProfile 저장됨: {args.profile_out}", file=sys.stderr)
+
+    if args.stats:
+        report = stats.to_dict()
+        report["wall_seconds"] = round(time.perf_counter() - started[0], 4)
+        report["cpu_seconds"] = round(time.process_time() - started[1], 4)
+        if args.tracemalloc:
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:10]
+            tracemalloc.stop()
+            report["tracemalloc"] = {
+                "peak_mb": round(peak / 1e6, 2),
+                "top": [{"where": str(s.traceback), "kb": round(s.size / 1024, 1), "count": s.count} for s in top],
+            }
+        report_json = json.dumps(report, indent=2, ensure_ascii=False)
+        if args.stats == "-":
+            print(report_json, file=sys.stderr)
+        else:
+            with open(args.stats, "w") as f:
+                f.write(report_json)
+            print(f"실행 통계 저장됨: {args.stats}", file=sys.stderr)
+
+    if args.json:
+        output = json.dumps(profile, indent=2, ensure_ascii=False)
+    else:
+        output = generate_summary(profile)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"저장됨: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
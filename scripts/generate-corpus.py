@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+합성 대화 기록 생성기
+~/.claude/projects/ 와 같은 구조의 가짜 대화 기록을 만들어 analyze-developer.py의
+성능 측정과 회귀 확인에 사용합니다.
+"""
+
+import json
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# 사용자 메시지 템플릿 (기술/작업 키워드가 섞이도록 구성)
+ENGLISH_PROMPTS = [
+    "fix the bug in {file}",
+    "add a new endpoint to the fastapi app",
+    "how to configure docker compose for postgres?",
+    "refactor this react component, it is too long",
+    "explain what is going on in {file}",
+    "write a pytest test for {file}",
+    "review my typescript changes before I push",
+    "why is cargo build failing with this error?",
+    "create a kubernetes deployment with helm",
+    "optimize the redis cache lookup",
+    "update the readme with the new npm scripts",
+    "check the github actions workflow",
+]
+KOREAN_PROMPTS = [
+    "{file} 에러 좀 봐줘",
+    "왜 안 되지? 버그 같은데",
+    "새 기능 추가해줘: 로그인 구현",
+    "이 코드 리팩토링 해줘",
+    "어떻게 테스트를 작성하면 돼?",
+    "문서 정리 좀 해줘",
+    "리뷰 부탁해, 커밋 전에 확인하고 싶어",
+    "mongodb 쿼리 개선 방법 알려줘",
+    "terraform 모듈 구조 설명해줘",
+    "주석 추가해줘",
+]
+FILE_NAMES = [
+    "src/main.py", "src/app.ts", "src/index.tsx", "src/lib.rs", "cmd/server/main.go",
+    "src/App.java", "ios/View.swift", "infra/main.tf", "Dockerfile", "README.md",
+]
+TOOL_NAMES = ["Bash", "Read", "Edit", "Write", "Grep", "Glob", "TodoWrite"]
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _user_prompt(rng: random.Random, korean_ratio: float) -> str:
+    templates = KOREAN_PROMPTS if rng.random() < korean_ratio else ENGLISH_PROMPTS
+    return rng.choice(templates).format(file=rng.choice(FILE_NAMES))
+
+
+def generate_session(
+    rng: random.Random,
+    path: Path,
+    session_id: str,
+    started: datetime,
+    messages: int,
+    tool_result_size: int,
+    korean_ratio: float,
+) -> tuple[datetime, int]:
+    """세션 JSONL 하나 생성 → (마지막 시각, user/assistant 메시지 수)"""
+    now = started
+    tracked: dict[str, dict] = {}
+    message_count = 0
+    parent = None
+
+    with open(path, "w") as f:
+        def write(entry: dict) -> None:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+        for _ in range(messages):
+            now += timedelta(seconds=rng.randint(3, 240))
+            entry_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            base = {
+                "parentUuid": parent,
+                "isSidechain": False,
+                "sessionId": session_id,
+                "uuid": entry_id,
+                "timestamp": _iso(now),
+            }
+            parent = entry_id
+            roll = rng.random()
+
+            if roll < 0.2:
+                base.update(type="user", message={"role": "user", "content": _user_prompt(rng, korean_ratio)})
+                message_count += 1
+            elif roll < 0.45:
+                # 도구 결과: 실제 기록에서 바이트 대부분을 차지
+                size = max(1, int(rng.expovariate(1 / tool_result_size)))
+                base.update(type="user", message={"role": "user", "content": [{
+                    "type": "tool_result",
+                    "tool_use_id": f"toolu_{entry_id[:12]}",
+                    "content": "x" * size,
+                }]})
+                message_count += 1
+            elif roll < 0.8:
+                tool = rng.choice(TOOL_NAMES)
+                base.update(type="assistant", message={
+                    "role": "assistant",
+                    "model": "synthetic",
+                    "content": [
+                        {"type": "text", "text": "확인했습니다. 다음 단계를 진행합니다."},
+                        {"type": "tool_use", "id": f"toolu_{entry_id[:12]}", "name": tool,
+                         "input": {"file_path": rng.choice(FILE_NAMES)}},
+                    ],
+                    "usage": {
+                        "input_tokens": rng.randint(1, 4000),
+                        "output_tokens": rng.randint(1, 2000),
+                        "cache_read_input_tokens": rng.randint(0, 20000),
+                    },
+                })
+                message_count += 1
+            elif roll < 0.9:
+                tracked.setdefault(rng.choice(FILE_NAMES), {"version": len(tracked) + 1})
+                write({
+                    "type": "file-history-snapshot",
+                    "messageId": entry_id,
+                    "snapshot": {"messageId": entry_id, "trackedFileBackups": tracked, "timestamp": _iso(now)},
+                    "isSnapshotUpdate": False,
+                })
+                continue
+            else:
+                base.update(type="progress", data={"type": "hook_progress", "output": "." * rng.randint(10, 400)})
+
+            write(base)
+
+    return now, message_count
+
+
+def generate_corpus(
+    root: Path,
+    projects: int = 5,
+    sessions: int = 20,
+    messages: int = 200,
+    tool_result_size: int = 2000,
+    korean_ratio: float = 0.5,
+    seed: int = 0,
+) -> dict:
+    """projects × sessions 개의 세션을 만들고 프로젝트별 sessions-index.json 작성"""
+    rng = random.Random(seed)
+    epoch = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    total_bytes = 0
+
+    for p in range(projects):
+        project_dir = root / f"-Users-dev-synthetic-project{p:03d}"
+        project_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+
+        for _ in range(sessions):
+            session_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            path = project_dir / f"{session_id}.jsonl"
+            started = epoch + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+            ended, message_count = generate_session(
+                rng, path, session_id, started,
+                messages=max(1, int(rng.gauss(messages, messages / 4))),
+                tool_result_size=tool_result_size,
+                korean_ratio=korean_ratio,
+            )
+            # 실제 기록처럼 파일 mtime을 마지막 엔트리 시각에 맞춤 (--since 가지치기 확인용)
+            os.utime(path, (ended.timestamp(), ended.timestamp()))
+            stat = path.stat()
+            total_bytes += stat.st_size
+            entries.append({
+                "sessionId": session_id,
+                "fullPath": str(path),
+                "fileMtime": int(stat.st_mtime * 1000),
+                "firstPrompt": "synthetic",
+                "messageCount": message_count,
+                "created": _iso(started),
+                "modified": _iso(ended),
+                "gitBranch": "main",
+                "projectPath": f"/Users/dev/synthetic/project{p:03d}",
+                "isSidechain": False,
+            })
+
+        with open(project_dir / "sessions-index.json", "w") as f:
+            json.dump({"version": 1, "entries": entries}, f, ensure_ascii=False)
+
+    return {"projects": projects, "sessions": projects * sessions, "bytes": total_bytes}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="analyze-developer.py 성능 측정용 합성 대화 기록 생성")
+    parser.add_argument("root", help="생성할 projects 디렉토리 (예: /tmp/bench/.claude/projects)")
+    parser.add_argument("--projects", type=int, default=5, help="프로젝트 수 (기본: 5)")
+    parser.add_argument("--sessions", type=int, default=20, help="프로젝트당 세션 수 (기본: 20)")
+    parser.add_argument("--messages", type=int, default=200, help="세션당 평균 엔트리 수 (기본: 200)")
+    parser.add_argument("--tool-result-size", type=int, default=2000, help="도구 결과 평균 바이트 (기본: 2000)")
+    parser.add_argument("--korean-ratio", type=float, default=0.5, help="한국어 사용자 메시지 비율 (기본: 0.5)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (기본: 0)")
+    args = parser.parse_args()
+
+    root = Path(os.path.expanduser(args.root))
+    info = generate_corpus(
+        root,
+        projects=args.projects,
+        sessions=args.sessions,
+        messages=args.messages,
+        tool_result_size=args.tool_result_size,
+        korean_ratio=args.korean_ratio,
+        seed=args.seed,
+    )
+    print(f"생성 완료: {root} (프로젝트 {info['projects']}개, 세션 {info['sessions']}개, {info['bytes'] / 1e6:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
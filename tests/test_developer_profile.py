@@ -0,0 +1,183 @@
+"""
+analyze-developer.py 회귀 테스트
+generate-corpus.py로 만든 작은 합성 기록에서 실행 방식(직렬, -j, --cache, --store)별 결과가 같은지,
+이어하기/포크 세션의 중복 제거와 부분 프로필 병합이 순서에 무관한지 확인합니다.
+"""
+
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+ANALYZER = SCRIPTS_DIR / "analyze-developer.py"
+
+
+def _load_script(filename: str):
+    """하이픈이 들어간 스크립트를 모듈로 로드"""
+    name = filename.removesuffix(".py").replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run(home: Path, *args: str) -> subprocess.CompletedProcess:
+    """분석기를 별도 프로세스로 실행 (선택적 분석기 설정이 테스트 사이에 남지 않도록)"""
+    return subprocess.run(
+        [sys.executable, str(ANALYZER), *args],
+        env={"HOME": str(home), "PATH": "/usr/bin:/bin"},
+        capture_output=True, text=True,
+    )
+
+
+def _profile(home: Path, *args: str) -> dict:
+    """--json 출력에서 실행마다 달라지는 생성 시각을 뺀 프로필"""
+    result = _run(home, "--json", *args)
+    assert result.returncode == 0, result.stderr
+    profile = json.loads(result.stdout)
+    profile.pop("generated_at")
+    return profile
+
+
+def _relocate(src: Path, dst: Path) -> None:
+    """기록 디렉토리를 복사하고 인덱스의 fullPath를 새 위치로 바꿈"""
+    shutil.copytree(src, dst)
+    for index in dst.rglob("sessions-index.json"):
+        index.write_text(index.read_text().replace(str(src), str(dst)))
+
+
+@pytest.fixture(scope="module")
+def home(tmp_path_factory) -> Path:
+    home = tmp_path_factory.mktemp("home")
+    _load_script("generate-corpus.py").generate_corpus(
+        home / ".claude" / "projects", projects=3, sessions=4, messages=40, tool_result_size=200, seed=1,
+    )
+    return home
+
+
+@pytest.fixture(scope="module")
+def forked(home, tmp_path_factory) -> tuple[Path, Path, int]:
+    """세션 하나를 앞 절반만 복사해 이어 쓴 포크 기록과, 포크에서 새로 쓴 엔트리만 담은 기준 기록"""
+    base = tmp_path_factory.mktemp("forked")
+    dup, truth = base / "dup", base / "truth"
+    _relocate(home, dup)
+    _relocate(home, truth)
+
+    project = sorted((dup / ".claude" / "projects").iterdir())[0]
+    index = json.loads((project / "sessions-index.json").read_text())
+    parent = index["entries"][0]
+    lines = Path(parent["fullPath"]).read_text().splitlines(keepends=True)
+    prefix = lines[: len(lines) // 2]
+    last = json.loads(lines[-1])
+    fork_id = "00000000-0000-4000-8000-00000000f0c0"
+    extra = [
+        json.dumps({
+            "parentUuid": None, "sessionId": fork_id, "uuid": f"00000000-0000-4000-8000-{i:012d}",
+            "timestamp": last["timestamp"], "type": "user",
+            "message": {"role": "user", "content": "fix the docker compose bug?"},
+        }) + "\n"
+        for i in range(3)
+    ]
+
+    for tree, content in ((dup, prefix + extra), (truth, extra)):
+        project_dir = tree / ".claude" / "projects" / project.name
+        path = project_dir / f"{fork_id}.jsonl"
+        path.write_text("".join(line.replace(parent["sessionId"], fork_id) for line in content))
+        tree_index = json.loads((project_dir / "sessions-index.json").read_text())
+        tree_index["entries"].append({**parent, "sessionId": fork_id, "fullPath": str(path), "messageCount": len(extra)})
+        (project_dir / "sessions-index.json").write_text(json.dumps(tree_index))
+
+    replayed = sum(1 for line in prefix if "uuid" in json.loads(line))
+    return dup, truth, replayed
+
+
+def test_jobs_cache_and_store_match_serial(home, tmp_path):
+    expected = _profile(home)
+    assert expected["metrics"]["total_sessions"] == 12
+
+    assert _profile(home, "-j", "2") == expected
+    cache = tmp_path / "cache.json"
+    assert _profile(home, "--cache", str(cache)) == expected
+    assert cache.exists()
+    # 체크포인트에서 이어서 분석해도 같음 (직렬, 병렬)
+    assert _profile(home, "--cache", str(cache)) == expected
+    assert _profile(home, "--cache", str(cache), "-j", "2") == expected
+    store = tmp_path / "profile.sqlite"
+    assert _profile(home, "--store", str(store)) == expected
+    assert _profile(home, "--store", str(store), "--no-ingest") == expected
+
+
+def test_appended_lines_resume_from_checkpoint(home, tmp_path):
+    grown = tmp_path / "grown"
+    _relocate(home, grown)
+    cache, store = tmp_path / "cache.json", tmp_path / "profile.sqlite"
+    _profile(grown, "--cache", str(cache))
+    _profile(grown, "--store", str(store))
+
+    session = sorted((grown / ".claude" / "projects").glob("*/*.jsonl"))[0]
+    entry = json.loads(session.read_text().splitlines()[-1])
+    with open(session, "a") as f:
+        f.write(json.dumps({
+            "sessionId": entry["sessionId"], "uuid": "00000000-0000-4000-8000-0000000000ad",
+            "timestamp": entry["timestamp"], "type": "user",
+            "message": {"role": "user", "content": "kubernetes 배포 해줘?"},
+        }) + "\n")
+
+    expected = _profile(grown)
+    assert _profile(grown, "--cache", str(cache)) == expected
+    assert _profile(grown, "--store", str(store)) == expected
+
+
+def test_fork_replay_is_deduplicated(forked, tmp_path):
+    dup, truth, replayed = forked
+    expected = _profile(truth)
+    for args in ((), ("-j", "2"), ("--cache", str(tmp_path / "cache.json")), ("--store", str(tmp_path / "profile.sqlite"))):
+        assert _profile(dup, *args) == expected, args
+
+    result = _run(dup, "--json")
+    assert f"엔트리 {replayed}개를 건너뜀" in result.stderr
+    # --no-dedup이면 포크가 다시 기록한 앞부분도 셈
+    assert _profile(dup, "--no-dedup") != expected
+
+
+def _split(home: Path, tmp_path: Path, *args: str) -> list[Path]:
+    """프로젝트별로 나눠 분석한 부분 프로필 파일들"""
+    partials = []
+    for project in sorted((home / ".claude" / "projects").iterdir()):
+        root = tmp_path / "roots" / project.name
+        root.mkdir(parents=True, exist_ok=True)
+        if not (root / project.name).exists():
+            (root / project.name).symlink_to(project)
+        out = tmp_path / f"{project.name}{''.join(args)}.json"
+        result = _run(home, "--root", str(root), "--partial-out", str(out), "-o", str(tmp_path / "profile.md"), *args)
+        assert result.returncode == 0, result.stderr
+        partials.append(out)
+    return partials
+
+
+@pytest.mark.parametrize("options", [(), ("--sketch",), ("--usage",)])
+def test_merge_is_commutative(home, tmp_path, options):
+    partials = [str(p) for p in _split(home, tmp_path, *options)]
+    merged = _profile(home, "merge", *partials)
+    assert _profile(home, "merge", *reversed(partials)) == merged
+    assert _profile(home, "merge", partials[1], partials[2], partials[0]) == merged
+    # 나눠서 병합해도 한 번에 분석한 것과 같음
+    whole = _profile(home, *options)
+    if "--sketch" not in options:
+        assert merged == whole
+    else:
+        assert merged["metrics"] == whole["metrics"]
+
+
+def test_merge_rejects_mismatched_analyzers(home, tmp_path):
+    plain = _split(home, tmp_path)
+    sketched = _split(home, tmp_path, "--sketch")
+    for order in ((plain[0], sketched[1]), (sketched[1], plain[0])):
+        result = _run(home, "--json", "merge", *map(str, order))
+        assert result.returncode == 2
+        assert "선택적 분석기 설정이 다릅니다" in result.stderr